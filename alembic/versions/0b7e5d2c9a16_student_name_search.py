@@ -0,0 +1,51 @@
+"""Student name search: NOCASE name index and FTS5 trigram index with sync triggers
+
+Revision ID: 0b7e5d2c9a16
+Revises: f1a9c3d7b284
+Create Date: 2026-10-17 20:11:05.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e5d2c9a16'
+down_revision: Union[str, Sequence[str], None] = 'f1a9c3d7b284'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same statements as resultdashboard_reflex/search.py at this revision.
+CREATE = (
+    "CREATE INDEX IF NOT EXISTS ix_student_name_nocase ON student (name COLLATE NOCASE)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS student_name_fts "
+    "USING fts5(name, content='student', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS student_name_fts_ai AFTER INSERT ON student BEGIN "
+    "INSERT INTO student_name_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER IF NOT EXISTS student_name_fts_ad AFTER DELETE ON student BEGIN "
+    "INSERT INTO student_name_fts(student_name_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+    "CREATE TRIGGER IF NOT EXISTS student_name_fts_au AFTER UPDATE OF name ON student BEGIN "
+    "INSERT INTO student_name_fts(student_name_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+    "INSERT INTO student_name_fts(rowid, name) VALUES (new.id, new.name); END",
+    "INSERT INTO student_name_fts(student_name_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Both indexes are SQLite specific; other backends keep the ILIKE search.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in CREATE:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TRIGGER IF EXISTS student_name_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS student_name_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS student_name_fts_ai")
+    op.execute("DROP TABLE IF EXISTS student_name_fts")
+    op.execute("DROP INDEX IF EXISTS ix_student_name_nocase")
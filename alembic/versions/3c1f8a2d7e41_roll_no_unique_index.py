@@ -0,0 +1,29 @@
+"""unique index on student.roll_no
+
+Revision ID: 3c1f8a2d7e41
+Revises: b2e6f9000d6b
+Create Date: 2026-10-17 09:12:04.318220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f8a2d7e41'
+down_revision: Union[str, Sequence[str], None] = 'b2e6f9000d6b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fails if the table already contains duplicate roll numbers; remove
+    # the duplicates first.
+    op.create_index('ix_student_roll_no', 'student', ['roll_no'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_student_roll_no', table_name='student')
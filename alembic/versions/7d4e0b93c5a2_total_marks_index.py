@@ -0,0 +1,27 @@
+"""index on student.total_marks
+
+Revision ID: 7d4e0b93c5a2
+Revises: 3c1f8a2d7e41
+Create Date: 2026-10-17 10:02:41.551907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4e0b93c5a2'
+down_revision: Union[str, Sequence[str], None] = '3c1f8a2d7e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_student_total_marks', 'student', ['total_marks'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_student_total_marks', table_name='student')
@@ -0,0 +1,67 @@
+"""normalized subject and mark tables
+
+Revision ID: c4d2e7f91a06
+Revises: 9a5b6c1e2f83
+Create Date: 2026-10-17 13:05:52.771304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2e7f91a06'
+down_revision: Union[str, Sequence[str], None] = '9a5b6c1e2f83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SUBJECTS = (
+    (1, 'Bangla', 0, 'bangla_marks'),
+    (2, 'English', 1, 'english_marks'),
+    (3, 'Math', 2, 'math_marks'),
+    (4, 'Science', 3, 'science_marks'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    subject = op.create_table('subject',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('position', sa.Integer(), nullable=True),
+    sa.Column('legacy_column', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_subject_name', 'subject', ['name'], unique=True)
+    op.create_table('mark',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=True),
+    sa.Column('subject_id', sa.Integer(), nullable=True),
+    sa.Column('marks', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['student_id'], ['student.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['subject_id'], ['subject.id']),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_mark_student_subject', 'mark', ['student_id', 'subject_id'], unique=True)
+    op.create_index('ix_mark_subject_marks', 'mark', ['subject_id', 'marks'], unique=False)
+
+    op.bulk_insert(subject, [
+        {'id': sid, 'name': name, 'position': position, 'legacy_column': column}
+        for sid, name, position, column in SUBJECTS
+    ])
+    # Copy the existing per-column marks into the mark table.
+    for sid, _, _, column in SUBJECTS:
+        op.execute(
+            f"INSERT INTO mark (student_id, subject_id, marks) "
+            f"SELECT id, {sid}, {column} FROM student"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_mark_subject_marks', table_name='mark')
+    op.drop_index('ix_mark_student_subject', table_name='mark')
+    op.drop_table('mark')
+    op.drop_index('ix_subject_name', table_name='subject')
+    op.drop_table('subject')
@@ -0,0 +1,59 @@
+"""exam and examresult tables for multi-term history
+
+Revision ID: e8f03a4b5c17
+Revises: c4d2e7f91a06
+Create Date: 2026-10-17 14:21:08.640115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8f03a4b5c17'
+down_revision: Union[str, Sequence[str], None] = 'c4d2e7f91a06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('exam',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('term', sa.String(), nullable=True),
+    sa.Column('year', sa.Integer(), nullable=True),
+    sa.Column('closed_at', sa.String(), nullable=True),
+    sa.Column('student_count', sa.Integer(), nullable=True),
+    sa.Column('average_total', sa.Float(), nullable=True),
+    sa.Column('archived', sa.Boolean(), nullable=True),
+    sa.Column('archive_path', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_exam_year_term', 'exam', ['year', 'term'], unique=False)
+    op.create_table('examresult',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('exam_id', sa.Integer(), nullable=True),
+    sa.Column('roll_no', sa.Integer(), nullable=True),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('bangla_marks', sa.Integer(), nullable=True),
+    sa.Column('english_marks', sa.Integer(), nullable=True),
+    sa.Column('math_marks', sa.Integer(), nullable=True),
+    sa.Column('science_marks', sa.Integer(), nullable=True),
+    sa.Column('total_marks', sa.Integer(), nullable=True),
+    sa.Column('grade', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['exam_id'], ['exam.id']),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_examresult_exam_roll', 'examresult', ['exam_id', 'roll_no'], unique=True)
+    op.create_index('ix_examresult_exam_total', 'examresult', ['exam_id', 'total_marks'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_examresult_exam_total', table_name='examresult')
+    op.drop_index('ix_examresult_exam_roll', table_name='examresult')
+    op.drop_table('examresult')
+    op.drop_index('ix_exam_year_term', table_name='exam')
+    op.drop_table('exam')
@@ -0,0 +1,38 @@
+"""timelineevent table with date and type indexes
+
+Revision ID: f1a9c3d7b284
+Revises: e8f03a4b5c17
+Create Date: 2026-10-17 16:02:44.218530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a9c3d7b284'
+down_revision: Union[str, Sequence[str], None] = 'e8f03a4b5c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('timelineevent',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('event_date', sa.String(), nullable=True),
+    sa.Column('event_type', sa.String(), nullable=True),
+    sa.Column('created_at', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_timelineevent_date', 'timelineevent', ['event_date', 'id'], unique=False)
+    op.create_index('ix_timelineevent_type_date', 'timelineevent', ['event_type', 'event_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_timelineevent_type_date', table_name='timelineevent')
+    op.drop_index('ix_timelineevent_date', table_name='timelineevent')
+    op.drop_table('timelineevent')
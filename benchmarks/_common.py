@@ -0,0 +1,82 @@
+"""Shared helpers for the benchmark scripts.
+
+The benchmarks talk to SQLite through the standard library so they can run
+without the app's dependencies installed. ``STUDENT_DDL`` mirrors the
+``student`` table created by the Alembic migrations.
+"""
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+STUDENT_DDL = """
+CREATE TABLE student (
+    id INTEGER NOT NULL PRIMARY KEY,
+    roll_no INTEGER,
+    name VARCHAR,
+    bangla_marks INTEGER,
+    english_marks INTEGER,
+    math_marks INTEGER,
+    science_marks INTEGER,
+    total_marks INTEGER,
+    grade VARCHAR
+)
+"""
+
+ROLL_INDEX_DDL = "CREATE UNIQUE INDEX ix_student_roll_no ON student (roll_no)"
+TOTAL_INDEX_DDL = "CREATE INDEX ix_student_total_marks ON student (total_marks)"
+
+
+def grade_for(total: int) -> str:
+    if total >= 320:
+        return "A+"
+    elif total >= 280:
+        return "A"
+    elif total >= 240:
+        return "B"
+    elif total >= 200:
+        return "C"
+    return "Fail"
+
+
+def iter_rows(n: int, seed: int = 0):
+    """Yield ``n`` student tuples in insertion order."""
+    rnd = random.Random(seed)
+    for roll in range(1, n + 1):
+        marks = [rnd.randint(20, 100) for _ in range(4)]
+        total = sum(marks)
+        yield (roll, f"Student {roll}", *marks, total, grade_for(total))
+
+
+def build_db(n: int, indexes=(ROLL_INDEX_DDL,), path=None) -> str:
+    """Create a populated SQLite file and return its path."""
+    if path is None:
+        fd, path = tempfile.mkstemp(prefix=f"bench_{n}_", suffix=".db")
+        os.close(fd)
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute(STUDENT_DDL)
+        conn.executemany(
+            "INSERT INTO student (roll_no, name, bangla_marks, english_marks, "
+            "math_marks, science_marks, total_marks, grade) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            iter_rows(n),
+        )
+        for ddl in indexes:
+            conn.execute(ddl)
+        conn.commit()
+    finally:
+        conn.close()
+    return path
+
+
+def time_call(fn, repeat: int):
+    """Run ``fn`` ``repeat`` times; return (median, p95) in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[min(len(samples) - 1, int(len(samples) * 0.95))]
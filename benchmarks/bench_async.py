@@ -0,0 +1,123 @@
+"""Latency of 500 concurrent result lookups: blocking vs. async database calls.
+
+Both modes run ``--lookups`` roll-number lookups as concurrent asyncio tasks
+(like simultaneous event handlers) while a few slow full-table scans run
+alongside, as the old ``search_student_result`` did.
+
+* ``blocking`` calls sqlite3 directly on the event loop, as the synchronous
+  handlers did: every lookup queues behind whichever query is running.
+* ``async`` uses aiosqlite with a small connection pool, as the async
+  engine does: queries run off the loop, so a scan only occupies its own
+  connection.
+
+Latency is measured from task start to result. Requires aiosqlite.
+
+Usage: python -m benchmarks.bench_async [--rows 200000] [--lookups 500]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import time
+
+from benchmarks._common import build_db
+
+LOOKUP_SQL = "SELECT * FROM student WHERE roll_no = ? LIMIT 1"
+SCAN_SQL = "SELECT * FROM student"
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(len(samples) * q))] * 1000  # noqa: E731
+    return pick(0.5), pick(0.99), samples[-1] * 1000
+
+
+async def run_blocking(path, rows, lookups, scans):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    rnd = random.Random(1)
+
+    async def lookup():
+        start = time.perf_counter()
+        await asyncio.sleep(0)  # yield like an event dispatch would
+        conn.execute(LOOKUP_SQL, (rnd.randint(1, rows),)).fetchone()
+        return time.perf_counter() - start
+
+    async def scan():
+        await asyncio.sleep(0)
+        conn.execute(SCAN_SQL).fetchall()
+
+    tasks = [lookup() for _ in range(lookups)]
+    for i in range(scans):
+        tasks.insert(i * lookups // scans, scan())
+    started = time.perf_counter()
+    results = await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    conn.close()
+    return [r for r in results if r is not None], elapsed
+
+
+async def run_async(path, rows, lookups, scans, pool_size):
+    import aiosqlite
+
+    setup = sqlite3.connect(path)
+    setup.execute("PRAGMA journal_mode = WAL")
+    setup.close()
+    pool = asyncio.Queue()
+    for _ in range(pool_size):
+        pool.put_nowait(await aiosqlite.connect(path, timeout=5.0))
+    rnd = random.Random(1)
+
+    async def lookup():
+        start = time.perf_counter()
+        conn = await pool.get()
+        try:
+            async with conn.execute(LOOKUP_SQL, (rnd.randint(1, rows),)) as cursor:
+                await cursor.fetchone()
+        finally:
+            pool.put_nowait(conn)
+        return time.perf_counter() - start
+
+    async def scan():
+        conn = await pool.get()
+        try:
+            async with conn.execute(SCAN_SQL) as cursor:
+                await cursor.fetchall()
+        finally:
+            pool.put_nowait(conn)
+
+    tasks = [lookup() for _ in range(lookups)]
+    for i in range(scans):
+        tasks.insert(i * lookups // scans, scan())
+    started = time.perf_counter()
+    results = await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    while not pool.empty():
+        await pool.get_nowait().close()
+    return [r for r in results if r is not None], elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--scans", type=int, default=3, help="slow full-table scans mixed in")
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+
+    path = build_db(args.rows)
+    try:
+        print(f"{args.lookups} concurrent lookups + {args.scans} full scans, {args.rows} rows")
+        print(f"{'mode':<9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'wall s':>8}")
+        blocking, blocking_wall = asyncio.run(run_blocking(path, args.rows, args.lookups, args.scans))
+        print(f"{'blocking':<9} " + " ".join(f"{v:>9.2f}" for v in _percentiles(blocking)) + f" {blocking_wall:>8.3f}")
+        latencies, wall = asyncio.run(run_async(path, args.rows, args.lookups, args.scans, args.pool_size))
+        print(f"{'async':<9} " + " ".join(f"{v:>9.2f}" for v in _percentiles(latencies)) + f" {wall:>8.3f}")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
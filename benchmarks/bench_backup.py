@@ -0,0 +1,79 @@
+"""Online backup duration against database size.
+
+For each ``--rows`` size, builds a WAL-mode database (``_common.build_db``)
+and takes a snapshot with ``backup.create_snapshot`` while a writer thread
+commits a one-row update every few milliseconds. Reports the page copy
+time, the total (copy, check, gzip), the sizes, how often the writer's
+changes restarted the copy, and the writer's worst commit latency during
+the snapshot. A plain file copy of the idle database is shown for scale.
+
+Usage: python -m benchmarks.bench_backup [--rows 10000,100000,500000]
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+from benchmarks._common import ROLL_INDEX_DDL, TOTAL_INDEX_DDL, build_db
+
+
+def _writer(path: str, stop: threading.Event, latencies: list) -> None:
+    conn = sqlite3.connect(path, timeout=5)
+    try:
+        i = 0
+        while not stop.is_set():
+            start = time.perf_counter()
+            conn.execute("UPDATE student SET math_marks = ? WHERE roll_no = ?", (i % 100, i % 1000 + 1))
+            conn.commit()
+            latencies.append((time.perf_counter() - start) * 1000)
+            i += 1
+            time.sleep(0.005)
+    finally:
+        conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="10000,100000,500000", help="comma-separated database sizes")
+    args = parser.parse_args()
+
+    from resultdashboard_reflex import backup
+
+    workdir = tempfile.mkdtemp(prefix="resultdashboard_backup_")
+    print(f"{'rows':>8} {'MB':>7} {'gz MB':>7} {'file copy s':>11} {'copy s':>7} {'total s':>8} "
+          f"{'restarts':>8} {'writes':>6} {'max write ms':>12}")
+    try:
+        for rows in [int(value) for value in args.rows.split(",")]:
+            path = os.path.join(workdir, f"bench_{rows}.db")
+            build_db(rows, indexes=(ROLL_INDEX_DDL, TOTAL_INDEX_DDL), path=path)
+            conn = sqlite3.connect(path)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.close()
+
+            start = time.perf_counter()
+            shutil.copyfile(path, path + ".copy")
+            file_copy = time.perf_counter() - start
+            os.remove(path + ".copy")
+
+            stop = threading.Event()
+            latencies = []
+            writer = threading.Thread(target=_writer, args=(path, stop, latencies))
+            writer.start()
+            try:
+                report = backup.create_snapshot(os.path.join(workdir, "snapshots"), keep=1, url=f"sqlite:///{path}")
+            finally:
+                stop.set()
+                writer.join()
+            print(f"{rows:>8} {report['bytes'] / 1e6:>7.1f} {report['compressed_bytes'] / 1e6:>7.1f} {file_copy:>11.3f} "
+                  f"{report['copy_seconds']:>7.3f} {report['seconds']:>8.3f} {report['restarts']:>8} "
+                  f"{len(latencies):>6} {max(latencies, default=0):>12.1f}")
+            os.remove(path)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
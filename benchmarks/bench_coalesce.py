@@ -0,0 +1,88 @@
+"""Result-day burst: database queries with and without single-flight coalescing.
+
+``--lookups`` concurrent lookups over ``--distinct`` hot roll numbers (a class
+checking its results at once) go through an async loader backed by
+aiosqlite. Without coalescing every cold lookup runs its own query; with
+``SingleFlight`` concurrent lookups of one roll share a query. The second
+table replays the same burst through the per-client token bucket.
+
+Usage: python -m benchmarks.bench_coalesce [--lookups 500] [--distinct 20]
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from benchmarks._common import build_db
+from resultdashboard_reflex.throttle import SingleFlight, TokenBucketLimiter
+
+
+async def run(path, rolls, pool_size, coalesce):
+    import aiosqlite
+
+    pool = asyncio.Queue()
+    for _ in range(pool_size):
+        pool.put_nowait(await aiosqlite.connect(path))
+    flights = SingleFlight()
+    queries = 0
+
+    async def load(roll):
+        nonlocal queries
+        queries += 1
+        conn = await pool.get()
+        try:
+            async with conn.execute("SELECT * FROM student WHERE roll_no = ? LIMIT 1", (roll,)) as cursor:
+                return await cursor.fetchone()
+        finally:
+            pool.put_nowait(conn)
+
+    async def lookup(roll):
+        start = time.perf_counter()
+        if coalesce:
+            await flights.do(("roll", roll), lambda: load(roll))
+        else:
+            await load(roll)
+        return time.perf_counter() - start
+
+    latencies = sorted(await asyncio.gather(*(lookup(r) for r in rolls)))
+    while not pool.empty():
+        await pool.get_nowait().close()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    return queries, flights.merged, p99
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--distinct", type=int, default=20)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--clients", type=int, default=100)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    hot = [rnd.randint(1, args.rows) for _ in range(args.distinct)]
+    rolls = [rnd.choice(hot) for _ in range(args.lookups)]
+    path = build_db(args.rows)
+    try:
+        print(f"{args.lookups} concurrent lookups over {args.distinct} rolls")
+        print(f"{'mode':<10} {'db queries':>11} {'merged':>7} {'p99 ms':>8}")
+        for coalesce in (False, True):
+            queries, merged, p99 = asyncio.run(run(path, rolls, args.pool_size, coalesce))
+            label = "coalesced" if coalesce else "plain"
+            print(f"{label:<10} {queries:>11} {merged:>7} {p99:>8.2f}")
+    finally:
+        os.remove(path)
+
+    # Every client clicks "Check Result" repeatedly within one second.
+    limiter = TokenBucketLimiter(rate=1.0, burst=5.0)
+    for i in range(args.lookups * 4):
+        limiter.allow(i % args.clients)
+    stats = limiter.stats()
+    print(f"\ntoken bucket (rate 1/s, burst 5), {args.lookups * 4} clicks from {args.clients} clients:")
+    print(f"  served {stats['allowed']}, shed {stats['shed']} ({stats['shed_rate']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""N concurrent readers vs. one writer: default journal vs. WAL + busy_timeout.
+
+Readers run indexed roll lookups in a loop on their own connections while a
+single writer inserts and commits students. The "default" configuration is
+what a bare sqlite:/// engine gets (rollback journal, sqlite3's default 5 s
+lock timeout); "tuned" applies the pragmas from
+``resultdashboard_reflex/db.py``. Both wait up to 5 s for a lock, so only
+the journal mode and pragmas differ.
+
+Usage: python -m benchmarks.bench_concurrency [--readers 8] [--seconds 5]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from benchmarks._common import build_db, grade_for
+
+TUNED_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+def _connect(path, tuned):
+    conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, cached_statements=512)
+    if tuned:
+        for pragma in TUNED_PRAGMAS:
+            conn.execute(pragma)
+    return conn
+
+
+def run(path, readers, seconds, tuned, rows):
+    stop = threading.Event()
+    latencies = [[] for _ in range(readers)]
+    errors = [0] * (readers + 1)
+    writes = [0]
+
+    def reader(idx):
+        conn = _connect(path, tuned)
+        rnd = random.Random(idx)
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                conn.execute("SELECT * FROM student WHERE roll_no = ?", (rnd.randint(1, rows),)).fetchone()
+                latencies[idx].append(time.perf_counter() - start)
+            except sqlite3.OperationalError:
+                errors[idx] += 1
+        conn.close()
+
+    def writer():
+        conn = _connect(path, tuned)
+        roll = rows
+        rnd = random.Random(-1)
+        while not stop.is_set():
+            roll += 1
+            marks = [rnd.randint(20, 100) for _ in range(4)]
+            try:
+                conn.execute(
+                    "INSERT INTO student (roll_no, name, bangla_marks, english_marks, math_marks, "
+                    "science_marks, total_marks, grade) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (roll, f"Student {roll}", *marks, sum(marks), grade_for(sum(marks))),
+                )
+                conn.commit()
+                writes[0] += 1
+            except sqlite3.OperationalError:
+                conn.rollback()
+                errors[readers] += 1
+        conn.close()
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    samples = sorted(s for per_reader in latencies for s in per_reader)
+    p99 = samples[int(len(samples) * 0.99)] * 1000 if samples else float("nan")
+    return len(samples) / seconds, p99, writes[0] / seconds, sum(errors[:readers]), errors[readers]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'config':<8} {'reads/s':>10} {'read p99 ms':>12} {'writes/s':>9} {'read errs':>10} {'write errs':>11}")
+    for tuned in (False, True):
+        path = build_db(args.rows)
+        try:
+            reads, p99, writes, read_errs, write_errs = run(path, args.readers, args.seconds, tuned, args.rows)
+            label = "tuned" if tuned else "default"
+            print(f"{label:<8} {reads:>10.0f} {p99:>12.3f} {writes:>9.0f} {read_errs:>10} {write_errs:>11}")
+        finally:
+            for suffix in ("", "-wal", "-shm", "-journal"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
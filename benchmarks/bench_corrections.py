@@ -0,0 +1,99 @@
+"""Mark corrections and bulk deletes: per roll vs. batched statements.
+
+Fills a temporary database with ``--rows`` synthetic students, then:
+
+* corrects one mark for ``--changes`` random rolls the old way (look the
+  student up, delete it and its marks, insert it again; a commit each, as
+  the Delete and Add Student handlers did) and with one
+  ``corrections.upsert_students`` call;
+* deletes ``--changes`` rolls one query-then-delete at a time and as one
+  roll range with ``corrections.delete_students``.
+
+Like the suite, this imports the app's modules, so its requirements must be
+installed.
+
+Usage: python -m benchmarks.bench_corrections [--rows 100000] [--changes 2000]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+
+def _report(label: str, count: int, seconds: float) -> None:
+    print(f"{label:<32} {count:>7} rows {seconds:>8.3f}s {count / seconds:>10.0f} rows/sec")
+
+
+def run(args, db, corrections, queries, Student):
+    from sqlalchemy import select
+
+    from resultdashboard_reflex.subjects import delete_marks
+
+    rng = random.Random(0)
+    rolls = rng.sample(range(1, args.rows + 1), 2 * args.changes)
+    old_rolls, new_rolls = rolls[:args.changes], rolls[args.changes:]
+
+    with db.session() as session:
+        start = time.perf_counter()
+        for roll in old_rolls:
+            student = session.execute(select(Student).where(Student.roll_no == roll).limit(1)).scalars().first()
+            marks = {field: getattr(student, field) for field in corrections.MARK_FIELDS}
+            marks["math_marks"] = rng.randint(0, 100)
+            delete_marks(session, [student.id])
+            session.delete(student)
+            session.commit()
+            total = sum(marks.values())
+            queries.insert_student(session, roll, student.name, marks, total, "A" if total >= 240 else "B")
+            session.commit()
+        _report("delete + add, per roll", len(old_rolls), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        result = corrections.upsert_students(
+            session, [{"roll_no": roll, "math_marks": rng.randint(0, 100)} for roll in new_rolls]
+        )
+        _report("upsert_students, one batch", result["updated"], time.perf_counter() - start)
+
+        first = args.rows - 2 * args.changes
+        start = time.perf_counter()
+        for roll in range(first, first + args.changes):
+            student = session.execute(select(Student).where(Student.roll_no == roll).limit(1)).scalars().first()
+            if student is not None:
+                delete_marks(session, [student.id])
+                session.delete(student)
+                session.commit()
+        _report("query + delete, per roll", args.changes, time.perf_counter() - start)
+
+        first += args.changes
+        start = time.perf_counter()
+        removed = corrections.delete_students(session, [(first, first + args.changes - 1)])
+        _report("delete_students, one range", len(removed), time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--changes", type=int, default=2000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="resultdashboard_corrections_")
+    os.environ["RESULTDB_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    try:
+        # Import the models (and so reflex) before sqlmodel, as reflex patches it.
+        from resultdashboard_reflex import corrections, db, queries
+        from resultdashboard_reflex.models import Student
+        from resultdashboard_reflex.synthetic import generate
+        from sqlmodel import SQLModel
+
+        SQLModel.metadata.create_all(db.get_engine())
+        with db.session() as session:
+            report = generate(session, args.rows, seed=0)
+        print(f"Generated {report['inserted']} students in {report['seconds']}s\n")
+        run(args, db, corrections, queries, Student)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
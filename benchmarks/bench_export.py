@@ -0,0 +1,69 @@
+"""Peak memory of CSV export: whole file in a StringIO vs. chunked stream.
+
+The in-memory path mirrors the old ``export_results`` (every row written to
+one ``io.StringIO``); the streaming path mirrors ``export.stream_csv``,
+which holds one chunk at a time.
+
+Usage: python -m benchmarks.bench_export [--sizes 10000 100000]
+"""
+import argparse
+import csv
+import io
+import os
+import sqlite3
+import time
+import tracemalloc
+
+from benchmarks._common import build_db
+
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'in-memory MB':>13} {'stream MB':>10} {'in-memory s':>12} {'stream s':>9}")
+    for n in args.sizes:
+        path = build_db(n)
+        conn = sqlite3.connect(path)
+        try:
+            def in_memory():
+                out = io.StringIO()
+                csv.writer(out).writerows(conn.execute("SELECT * FROM student").fetchall())
+                sink.write(out.getvalue().encode("utf-8"))
+
+            def streaming():
+                cursor = conn.execute("SELECT * FROM student")
+                buf = io.StringIO()
+                writer = csv.writer(buf)
+                while True:
+                    rows = cursor.fetchmany(args.chunk_size)
+                    if not rows:
+                        break
+                    writer.writerows(rows)
+                    sink.write(buf.getvalue().encode("utf-8"))
+                    buf.seek(0)
+                    buf.truncate()
+
+            with open(os.devnull, "wb") as sink:
+                mem_s, mem_mb = _measure(in_memory)
+                stream_s, stream_mb = _measure(streaming)
+            print(f"{n:>8} {mem_mb:>13.1f} {stream_mb:>10.1f} {mem_s:>12.2f} {stream_s:>9.2f}")
+        finally:
+            conn.close()
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
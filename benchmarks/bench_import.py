@@ -0,0 +1,66 @@
+"""Insert throughput: one commit per row vs. batched executemany.
+
+The per-row path mirrors ``add_student`` (one INSERT and one commit per
+student); the batched path mirrors ``importer.import_records``.
+
+Usage: python -m benchmarks.bench_import [--rows 20000] [--batch-size 1000]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from benchmarks._common import ROLL_INDEX_DDL, STUDENT_DDL, iter_rows
+
+INSERT_SQL = (
+    "INSERT INTO student (roll_no, name, bangla_marks, english_marks, "
+    "math_marks, science_marks, total_marks, grade) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _fresh_db():
+    fd, path = tempfile.mkstemp(prefix="bench_import_", suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(path)
+    conn.execute(STUDENT_DDL)
+    conn.execute(ROLL_INDEX_DDL)
+    conn.commit()
+    return path, conn
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    rows = list(iter_rows(args.rows))
+
+    path, conn = _fresh_db()
+    try:
+        start = time.perf_counter()
+        for row in rows:
+            conn.execute(INSERT_SQL, row)
+            conn.commit()
+        per_row = time.perf_counter() - start
+    finally:
+        conn.close()
+        os.remove(path)
+
+    path, conn = _fresh_db()
+    try:
+        start = time.perf_counter()
+        for i in range(0, len(rows), args.batch_size):
+            conn.executemany(INSERT_SQL, rows[i:i + args.batch_size])
+            conn.commit()
+        batched = time.perf_counter() - start
+    finally:
+        conn.close()
+        os.remove(path)
+
+    print(f"per-row commit : {args.rows / per_row:>10.0f} rows/sec ({per_row:.2f}s)")
+    print(f"batched ({args.batch_size:>5}): {args.rows / batched:>10.0f} rows/sec ({batched:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Cold-start import time of the app and its lightweight entry points.
+
+Each target is imported ``--repeat`` times in a fresh interpreter under
+``python -X importtime``. The smallest total (minus the interpreter's own
+startup imports) is reported along with the packages that cost most (by
+self time). ``--record`` appends the run to ``importtime_history.jsonl`` so
+startup time can be followed from commit to commit; each run is compared
+with the last recorded one and exits 1 on a slowdown beyond ``--tolerance``.
+
+Usage: python -m benchmarks.bench_importtime [--repeat 5] [--record]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_PATH = os.path.join(os.path.dirname(__file__), "importtime_history.jsonl")
+
+# (name, statement): the app is imported the way Reflex loads it; the
+# others are what the CLI scripts and create_db.py need.
+TARGETS = (
+    ("models", "import resultdashboard_reflex.models"),
+    ("queries", "import resultdashboard_reflex.queries"),
+    ("importer_cli", "import resultdashboard_reflex.importer"),
+    ("app", "import resultdashboard_reflex.resultdashboard_reflex"),
+)
+
+
+def _parse(stderr: str) -> list:
+    """(indent, module, self us, cumulative us) for each line of ``-X importtime`` output."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        entries.append((len(name) - len(name.lstrip()), name.strip(), int(own), int(cumulative)))
+    return entries
+
+
+def import_profile(statement: str):
+    """Parsed ``-X importtime`` output of a fresh interpreter running ``statement``, or None if it fails."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        return None
+    return _parse(proc.stderr)
+
+
+def measure(statement: str, repeat: int, startup: set):
+    """Best of ``repeat`` runs: total import ms and the packages that cost most."""
+    best = None
+    for _ in range(repeat):
+        entries = import_profile(statement)
+        if entries is None:
+            return None
+        # Modules the bare interpreter imports at startup are not the app's cost.
+        entries = [entry for entry in entries if entry[1] not in startup]
+        level = min((indent for indent, _, _, _ in entries), default=0)
+        total = sum(cumulative for indent, _, _, cumulative in entries if indent == level)
+        if best is None or total < best[0]:
+            best = (total, entries)
+    total, entries = best
+    by_package = {}
+    for _, name, own, _ in entries:
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + own
+    heaviest = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:4]
+    return {
+        "ms": round(total / 1000, 1),
+        "heaviest": [f"{name} {us / 1000:.0f}ms" for name, us in heaviest],
+    }
+
+
+def _commit() -> str:
+    """Short HEAD hash, with "-dirty" if the app's code differs from it."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        changed = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no", "--", "resultdashboard_reflex"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return ""
+    return f"{commit}-dirty" if changed else commit
+
+
+def _last_record(path: str):
+    if not os.path.exists(path):
+        return None
+    last = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                last = json.loads(line)
+    return last
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown vs. the last record")
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--record", action="store_true", help="append this run to the history file")
+    parser.add_argument("--note", default="", help="label stored with --record")
+    args = parser.parse_args()
+
+    startup = {name for _, name, _, _ in import_profile("pass") or []}
+    last = _last_record(args.history)
+    previous = last["results"] if last else {}
+
+    results = {}
+    failures = []
+    print(f"{'target':<14} {'import ms':>10} {'vs last':>8}  heaviest")
+    for name, statement in TARGETS:
+        result = measure(statement, args.repeat, startup)
+        if result is None:
+            print(f"{name:<14} {'n/a':>10}")
+            continue
+        results[name] = result["ms"]
+        change = "-"
+        if previous.get(name):
+            ratio = result["ms"] / previous[name] - 1
+            change = f"{ratio:+.0%}"
+            if ratio > args.tolerance:
+                failures.append(f"{name}: {result['ms']} ms > last {previous[name]} ms")
+        print(f"{name:<14} {result['ms']:>10.1f} {change:>8}  {', '.join(result['heaviest'])}")
+
+    if args.record:
+        record = {
+            "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "note": args.note,
+            "results": results,
+        }
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"\nRecorded in {args.history}")
+    if failures:
+        print(f"\nSLOWER than the last record (tolerance {args.tolerance:.0%}):")
+        for message in failures:
+            print(f"  {message}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
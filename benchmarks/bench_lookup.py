@@ -0,0 +1,48 @@
+"""Roll-number lookup latency: full-table scan vs. indexed point lookup.
+
+The scan path reproduces the old ``search_student_result`` (load every row,
+then ``next(...)`` in Python). The indexed path is the single-row
+``WHERE roll_no = ?`` query backed by ``ix_student_roll_no``.
+
+Usage: python -m benchmarks.bench_lookup [--sizes 1000 10000 100000 1000000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+
+from benchmarks._common import build_db, time_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=200, help="indexed lookups per size")
+    parser.add_argument("--scan-repeat", type=int, default=5, help="full scans per size")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'scan med ms':>12} {'scan p95 ms':>12} {'index med ms':>13} {'index p95 ms':>13}")
+    for n in args.sizes:
+        path = build_db(n)
+        conn = sqlite3.connect(path)
+        rnd = random.Random(n)
+        try:
+            def scan():
+                roll = rnd.randint(1, n)
+                rows = conn.execute("SELECT * FROM student").fetchall()
+                next((r for r in rows if r[1] == roll), None)
+
+            def point():
+                roll = rnd.randint(1, n)
+                conn.execute("SELECT * FROM student WHERE roll_no = ? LIMIT 1", (roll,)).fetchone()
+
+            scan_med, scan_p95 = time_call(scan, args.scan_repeat)
+            idx_med, idx_p95 = time_call(point, args.repeat)
+            print(f"{n:>10} {scan_med:>12.2f} {scan_p95:>12.2f} {idx_med:>13.4f} {idx_p95:>13.4f}")
+        finally:
+            conn.close()
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Marksheet (report card) generation throughput at class scale.
+
+Fills a temporary database with ``--rows`` synthetic students and writes
+every marksheet as a zip of per-student PDFs and as one merged PDF, first
+rendered in-process and then on a process pool of ``--workers`` processes
+(default: one per CPU). Reports pages per second and output size.
+
+Like the suite, this imports the app's modules, so its requirements must be
+installed.
+
+Usage: python -m benchmarks.bench_marksheets [--rows 5000] [--workers 4]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="resultdashboard_marksheets_")
+    os.environ["RESULTDB_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    try:
+        # Import the models (and so reflex) before sqlmodel, as reflex patches it.
+        import resultdashboard_reflex.models  # noqa: F401
+        from resultdashboard_reflex import db
+        from resultdashboard_reflex.marksheets import write
+        from resultdashboard_reflex.synthetic import generate
+        from sqlmodel import SQLModel
+
+        SQLModel.metadata.create_all(db.get_engine())
+        with db.session() as session:
+            generate(session, args.rows, seed=0)
+
+        print(f"{args.rows} students, {os.cpu_count()} CPUs\n")
+        print(f"{'format':<7} {'workers':>7} {'seconds':>8} {'pages/s':>9} {'MB':>7}")
+        for workers in sorted({1, args.workers}):
+            for fmt in ("zip", "pdf"):
+                with db.read_session() as session:
+                    report = write(session, os.path.join(workdir, f"out.{fmt}"), fmt, workers=workers)
+                print(f"{fmt:<7} {workers:>7} {report['seconds']:>8.2f} {report['pages_per_sec']:>9.0f} "
+                      f"{report['bytes'] / 1e6:>7.1f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
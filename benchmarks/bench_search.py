@@ -0,0 +1,84 @@
+"""Student name search latency: LIKE scan vs. the FTS5 trigram index.
+
+Fills a temporary database with ``--rows`` synthetic students (so the
+index is built by its insert trigger, as for an import) and times a set of
+searches both ways: the old ``ilike('query%')`` filter (a scan, as it
+lowercases every name, and prefixes only), and ``search.search_names`` with
+prefix, surname, typo and short queries. The top match of each indexed
+search is printed as a sanity check.
+
+Like the suite, this imports the app's modules, so its requirements must be
+installed.
+
+Usage: python -m benchmarks.bench_search [--rows 100000] [--repeat 50]
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+QUERIES = ("rahman", "tasn", "hossain", "nusrat isl", "rahmna", "chowdhry", "ta")
+
+
+async def _time(fn, repeat: int):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[min(len(samples) - 1, int(len(samples) * 0.95))], result
+
+
+async def run(args, db, search, Student):
+    from sqlalchemy import select
+
+    print(f"{'query':<12} {'LIKE med ms':>12} {'hits':>6} {'FTS med ms':>11} {'FTS p95 ms':>11}  top match")
+    async with db.async_read_session() as session:
+        for query in QUERIES:
+            async def like():
+                result = await session.exec(
+                    select(Student.id, Student.name).where(Student.name.ilike(f"{query}%")).limit(args.limit + 1)
+                )
+                return result.all()
+
+            async def fts():
+                return await search.search_names(session, query, args.limit)
+
+            like_med, _, like_rows = await _time(like, args.repeat)
+            fts_med, fts_p95, rows = await _time(fts, args.repeat)
+            top = rows[0]["name"] if rows else "-"
+            print(f"{query:<12} {like_med:>12.2f} {len(like_rows):>6} {fts_med:>11.2f} {fts_p95:>11.2f}  {top}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=50, help="results per search (the page size)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="resultdashboard_search_")
+    os.environ["RESULTDB_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    try:
+        # Import the models (and so reflex) before sqlmodel, as reflex patches it.
+        from resultdashboard_reflex import db, search
+        from resultdashboard_reflex.models import Student
+        from resultdashboard_reflex.synthetic import generate
+        from sqlmodel import SQLModel
+
+        SQLModel.metadata.create_all(db.get_engine())
+        with db.session() as session:
+            report = generate(session, args.rows, seed=0)
+        print(f"Generated {report['inserted']} students with the index in {report['seconds']}s "
+              f"({report['rows_per_sec']} rows/sec)\n")
+        asyncio.run(run(args, db, search, Student))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
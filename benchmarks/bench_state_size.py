@@ -0,0 +1,55 @@
+"""Per-session state size of the teacher dashboard, before vs. after.
+
+"Before" is the state the dashboard used to hold: every Student (all
+columns) in ``students`` plus three full Students in ``top_performers``.
+"After" is one page of row views (``ROW_VIEW_FIELDS``) plus the top three
+and the backend-only paging bookkeeping. Sizes are the JSON encoding
+Reflex uses to send and store state.
+
+Usage: python -m benchmarks.bench_state_size [--sizes 1000 10000] [--sessions 500]
+"""
+import argparse
+import json
+
+from benchmarks._common import iter_rows
+
+COLUMNS = ("roll_no", "name", "bangla_marks", "english_marks", "math_marks",
+           "science_marks", "total_marks", "grade")
+ROW_VIEW_FIELDS = ("id", "roll_no", "name", "total_marks", "grade")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'before KB':>10} {'after KB':>9} {'before x sessions MB':>21} {'after x sessions MB':>20}")
+    for n in args.sizes:
+        full = [dict(id=i, **dict(zip(COLUMNS, row))) for i, row in enumerate(iter_rows(n), 1)]
+        top = sorted(full, key=lambda r: r["total_marks"], reverse=True)[:3]
+        before = {"students": full, "top_performers": top}
+
+        view = lambda r: {f: r[f] for f in ROW_VIEW_FIELDS}  # noqa: E731
+        page = [view(r) for r in full[:args.page_size]]
+        last = page[-1]
+        after = {
+            "students": page,
+            "top_performers": [view(r) for r in top],
+            "page_number": 1,
+            "has_next_page": True,
+            "_page_cursor": [last["roll_no"], last["id"]],
+            "_prev_cursors": [None],
+            "_loaded_page": [["page", "roll_no", False, "", None, args.page_size], 1],
+        }
+        before_kb = len(json.dumps(before)) / 1024
+        after_kb = len(json.dumps(after)) / 1024
+        print(
+            f"{n:>8} {before_kb:>10.1f} {after_kb:>9.1f} "
+            f"{before_kb * args.sessions / 1024:>21.1f} {after_kb * args.sessions / 1024:>20.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Top-N and rank: Python sort over all rows vs. SQL ORDER BY ... LIMIT.
+
+The Python path reproduces the old ``compute_leaderboard`` /
+``get_student_rank`` (load every row, ``sorted(..., key=total_marks)``).
+The SQL path uses ``ORDER BY total_marks DESC LIMIT n`` and
+``COUNT(*) WHERE total_marks > x`` over ``ix_student_total_marks``.
+
+Usage: python -m benchmarks.bench_topn [--sizes 100000 500000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+
+from benchmarks._common import ROLL_INDEX_DDL, TOTAL_INDEX_DDL, build_db, time_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 500_000])
+    parser.add_argument("--n", type=int, default=10, help="leaderboard size")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'query':<10} {'python ms':>10} {'sql ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        path = build_db(size, indexes=(ROLL_INDEX_DDL, TOTAL_INDEX_DDL))
+        conn = sqlite3.connect(path)
+        rnd = random.Random(size)
+        try:
+            def py_top():
+                rows = conn.execute("SELECT * FROM student").fetchall()
+                sorted(rows, key=lambda r: r[7], reverse=True)[:args.n]
+
+            def sql_top():
+                conn.execute(
+                    "SELECT * FROM student ORDER BY total_marks DESC LIMIT ?", (args.n,)
+                ).fetchall()
+
+            def py_rank():
+                roll = rnd.randint(1, size)
+                rows = sorted(conn.execute("SELECT * FROM student").fetchall(), key=lambda r: r[7], reverse=True)
+                next(i for i, r in enumerate(rows, 1) if r[1] == roll)
+
+            def sql_rank():
+                roll = rnd.randint(1, size)
+                (total,) = conn.execute("SELECT total_marks FROM student WHERE roll_no = ?", (roll,)).fetchone()
+                conn.execute("SELECT COUNT(*) FROM student WHERE total_marks > ?", (total,)).fetchone()
+
+            for label, py_fn, sql_fn in (("top-n", py_top, sql_top), ("rank", py_rank, sql_rank)):
+                py_ms, _ = time_call(py_fn, args.repeat)
+                sql_ms, _ = time_call(sql_fn, args.repeat * 20)
+                print(f"{size:>8} {label:<10} {py_ms:>10.2f} {sql_ms:>10.3f} {py_ms / sql_ms:>7.0f}x")
+        finally:
+            conn.close()
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
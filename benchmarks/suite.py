@@ -0,0 +1,281 @@
+"""Benchmark suite for the app's handlers and SQL layer, with a stored baseline.
+
+Builds a temporary database filled by ``resultdashboard_reflex.synthetic``,
+then times each case (``ResultState`` handlers called directly on a fresh
+state, the async loaders behind them in ``queries``, export, regrade and import) and
+measures its peak Python memory with tracemalloc. Results are compared with
+``benchmarks/baseline.json``: a case whose throughput drops, or whose peak
+memory grows, by more than ``--tolerance`` fails the run (exit status 1).
+
+Unlike the other scripts in this directory, the suite imports the app, so
+the app's requirements must be installed. Baselines are machine-specific;
+re-save one when the hardware changes, and run on a quiet machine (or pass
+a wider ``--tolerance`` on shared CI runners).
+
+Usage:
+    python -m benchmarks.suite [--rows 10000] [--only get_students export_csv]
+    python -m benchmarks.suite --save-baseline
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+# Memory peaks below this many KiB are noise and never fail the comparison.
+MEMORY_SLACK_KIB = 256
+
+CASES = []
+
+
+def case(name: str, unit: str = "ops"):
+    """Register a benchmark case. The function runs one operation and returns
+    how many ``unit`` it processed (None counts as 1)."""
+    def register(fn):
+        CASES.append((name, unit, fn))
+        return fn
+    return register
+
+
+def _handler(ctx, name):
+    return ctx["app"].ResultState.event_handlers[name].fn
+
+
+def _fresh_state(ctx):
+    return ctx["app"].ResultState(_reflex_internal_init=True)
+
+
+@case("load_student")
+async def bench_load_student(ctx):
+    await ctx["queries"].load_student(ctx["rnd"].randint(1, ctx["rows"]))
+
+
+@case("page_first_by_total")
+async def bench_page_first(ctx):
+    await ctx["queries"].load_student_page("total_marks", True, "", None, 50)
+
+
+@case("page_deep_by_name")
+async def bench_page_deep(ctx):
+    await ctx["queries"].load_student_page("name", False, "", ("Nabila Hossain", ctx["rows"] // 2), 50)
+
+
+@case("search_name_prefix")
+async def bench_search_prefix(ctx):
+    await ctx["queries"].load_student_page("roll_no", False, "Tas", None, 50)
+
+
+@case("top_students")
+async def bench_top_students(ctx):
+    await ctx["queries"].load_top_students(10)
+
+
+@case("class_stats_rebuild")
+async def bench_class_stats(ctx):
+    await ctx["queries"].ensure_class_stats(rebuild=True)
+
+
+@case("get_students")
+async def bench_get_students(ctx):
+    ctx["cache"].clear()
+    await _handler(ctx, "get_students")(_fresh_state(ctx))
+
+
+@case("compute_leaderboard")
+async def bench_leaderboard(ctx):
+    ctx["cache"].clear()
+    await _handler(ctx, "compute_leaderboard")(_fresh_state(ctx), 10)
+
+
+@case("search_student_result_cold")
+async def bench_search_cold(ctx):
+    ctx["cache"].clear()
+    state = _fresh_state(ctx)
+    state.student_roll_input = str(ctx["rnd"].randint(1, ctx["rows"]))
+    await _handler(ctx, "search_student_result")(state)
+
+
+@case("search_student_result_warm")
+async def bench_search_warm(ctx):
+    state = _fresh_state(ctx)
+    state.student_roll_input = str(ctx["rnd"].randint(1, 100))
+    await _handler(ctx, "search_student_result")(state)
+
+
+@case("export_csv", unit="rows")
+def bench_export_csv(ctx):
+    from resultdashboard_reflex.export import stream_csv
+
+    for _ in stream_csv():
+        pass
+    return ctx["rows"] + ctx["extra_rows"]
+
+
+@case("regrade", unit="rows")
+def bench_regrade(ctx):
+    from resultdashboard_reflex import db
+    from resultdashboard_reflex.grading import regrade_all
+
+    with db.session() as session:
+        return regrade_all(session)["updated"]
+
+
+@case("import_csv", unit="rows")
+def bench_import(ctx):
+    from resultdashboard_reflex import db
+    from resultdashboard_reflex.importer import import_records
+    from resultdashboard_reflex.synthetic import iter_students
+
+    first = ctx["rows"] + ctx["extra_rows"] + 1
+    records = ((i + 2, row) for i, row in enumerate(iter_students(1000, first, seed=first)))
+    with db.session() as session:
+        inserted = import_records(records, session)["inserted"]
+    ctx["extra_rows"] += inserted
+    return inserted
+
+
+def _run_once(loop, fn, ctx):
+    result = fn(ctx)
+    if inspect.isawaitable(result):
+        result = loop.run_until_complete(result)
+    return 1 if result is None else result
+
+
+def measure(loop, fn, ctx, min_repeat: int, budget: float) -> dict:
+    """Time ``fn`` until ``min_repeat`` runs and ``budget`` seconds are both reached."""
+    _run_once(loop, fn, ctx)  # warm-up
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < min_repeat or (time.perf_counter() - started < budget and len(samples) < 10_000):
+        start = time.perf_counter()
+        units = _run_once(loop, fn, ctx)
+        samples.append((time.perf_counter() - start, units))
+    # Throughput comes from the fastest run (as timeit does): it is the
+    # least disturbed by other load on the machine, so it compares best.
+    best_seconds, units = min(samples)
+    median = statistics.median(seconds for seconds, _ in samples)
+
+    tracemalloc.start()
+    try:
+        _run_once(loop, fn, ctx)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "throughput": round(units / best_seconds, 2) if best_seconds > 0 else float("inf"),
+        "median_ms": round(median * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+        "runs": len(samples),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return the failure messages for results that regressed past ``tolerance``."""
+    failures = []
+    for name, result in results.items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None:
+            continue
+        if result["throughput"] < base["throughput"] * (1 - tolerance):
+            failures.append(f"{name}: throughput {result['throughput']} < baseline {base['throughput']}")
+        if result["peak_kib"] > max(base["peak_kib"] * (1 + tolerance), base["peak_kib"] + MEMORY_SLACK_KIB):
+            failures.append(f"{name}: peak memory {result['peak_kib']} KiB > baseline {base['peak_kib']} KiB")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000, help="synthetic class size")
+    parser.add_argument("--only", nargs="+", help="run only these cases")
+    parser.add_argument("--repeat", type=int, default=5, help="minimum timed runs per case")
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds of timed runs per case")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown / memory growth")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="resultdashboard_bench_")
+    # The app reads these at import time, so set them before importing it.
+    os.environ["RESULTDB_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["RESULT_PUBLISH_DIR"] = os.path.join(workdir, "published")
+    os.environ["RESULT_LOOKUP_RATE"] = os.environ["RESULT_LOOKUP_BURST"] = "1e12"
+    try:
+        # Import the app (and so reflex) before sqlmodel, as reflex patches it.
+        import resultdashboard_reflex.resultdashboard_reflex as app
+        from resultdashboard_reflex import db, queries
+        from resultdashboard_reflex.cache import result_cache
+        from resultdashboard_reflex.synthetic import generate
+        from sqlmodel import SQLModel
+
+        SQLModel.metadata.create_all(db.get_engine())
+        with db.session() as session:
+            report = generate(session, args.rows, seed=0)
+        print(f"Generated {report['inserted']} students in {report['seconds']}s "
+              f"({report['rows_per_sec']} rows/sec)\n")
+
+        ctx = {"app": app, "queries": queries, "cache": result_cache, "rows": args.rows, "extra_rows": 0, "rnd": random.Random(0)}
+        loop = asyncio.new_event_loop()
+        baseline = {}
+        if not args.save_baseline and os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+            if baseline.get("rows") != args.rows:
+                print(f"Baseline was recorded with --rows {baseline.get('rows')}; not comparing.\n")
+                baseline = {}
+
+        results = {}
+        print(f"{'case':<28} {'throughput':>14} {'median ms':>10} {'peak KiB':>10} {'vs base':>8}")
+        for name, unit, fn in CASES:
+            if args.only and name not in args.only:
+                continue
+            result = measure(loop, fn, ctx, args.repeat, args.budget)
+            result["unit"] = unit
+            results[name] = result
+            base = baseline.get("cases", {}).get(name)
+            change = f"{result['throughput'] / base['throughput'] - 1:+.0%}" if base else "-"
+            print(f"{name:<28} {result['throughput']:>10.1f} {unit + '/s':<3} {result['median_ms']:>10.3f} "
+                  f"{result['peak_kib']:>10.1f} {change:>8}")
+        loop.close()
+
+        document = {
+            "rows": args.rows,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "cases": results,
+        }
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(document, f, indent=2)
+        if args.save_baseline:
+            with open(args.baseline, "w", encoding="utf-8") as f:
+                json.dump(document, f, indent=2)
+                f.write("\n")
+            print(f"\nBaseline saved to {args.baseline}")
+            return 0
+
+        failures = compare(results, baseline, args.tolerance)
+        if failures:
+            print("\nREGRESSIONS (tolerance {:.0%}):".format(args.tolerance))
+            for message in failures:
+                print(f"  {message}")
+            return 1
+        if baseline:
+            print(f"\nNo regressions against the baseline (tolerance {args.tolerance:.0%}).")
+        return 0
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,28 +5,31 @@ Run this in the project root with the same Python environment used to run the ap
 import sys
 from pathlib import Path
 
+# Import the tables from resultdashboard_reflex.models, which does not load
+# the app's state and pages. If this script is run from a different working
+# directory, add the project root to sys.path.
+# The models come first: Reflex has to set up sqlmodel before anything else
+# imports it.
 try:
-    from sqlmodel import SQLModel, create_engine
-except Exception:
-    print("Missing dependency: sqlmodel is required to run this script. Install with 'pip install sqlmodel'.")
-    raise
-
-# Attempt to import the Student model from the app. If this script is run
-# from a different working directory, add the project root to sys.path.
-try:
-    from resultdashboard_reflex.resultdashboard_reflex import Student
+    from resultdashboard_reflex.models import Student
 except Exception:
     # Add project root (parent of this file) to sys.path and retry.
     project_root = Path(__file__).resolve().parent
     if str(project_root) not in sys.path:
         sys.path.insert(0, str(project_root))
     try:
-        from resultdashboard_reflex.resultdashboard_reflex import Student
+        from resultdashboard_reflex.models import Student
     except Exception:
-        print("Failed to import the Student model from the app. Make sure you're running this script from the project root and that the package is accessible.")
+        print("Failed to import the Student model from resultdashboard_reflex.models. Make sure you're running this script from the project root and that the package is accessible.")
         raise
 
-DB_URL = "sqlite:///resultdashboard.db"
+try:
+    from sqlmodel import SQLModel, create_engine
+except Exception:
+    print("Missing dependency: sqlmodel is required to run this script. Install with 'pip install sqlmodel'.")
+    raise
+
+from resultdashboard_reflex.db import DB_URL
 
 def main() -> None:
     engine = create_engine(DB_URL, echo=True)
@@ -36,6 +39,24 @@ def main() -> None:
     SQLModel.metadata.create_all(engine)
     print(f"Created tables in {DB_URL}")
 
+    # New tables get the name search index with them; add it to a student
+    # table created before it existed.
+    if engine.dialect.name == "sqlite":
+        from resultdashboard_reflex.search import ensure_index
+
+        with engine.begin() as connection:
+            if ensure_index(connection):
+                print("Built the student name search index")
+
+    # Seed the subject table and copy any existing per-column marks into
+    # the normalized mark table.
+    from sqlmodel import Session
+    from resultdashboard_reflex.subjects import backfill_marks
+
+    with Session(engine) as session:
+        added = backfill_marks(session)
+    print(f"Backfilled {added} mark rows")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,203 @@
+"""Class analytics: distribution statistics over every student's marks.
+
+A :class:`ClassAnalytics` snapshot holds the whole class column by column:
+one contiguous float64 NumPy array per subject and one for the totals
+(NumPy is in requirements.txt). It is loaded once per data version (the app
+caches it under ``("analytics", result_cache.version)``) and gives:
+
+* per-subject (and total) mean, median, population standard deviation and
+  percentiles, interpolated linearly like ``numpy.percentile``;
+* per-subject mark histograms in bins of ten marks (the last bin, 90-100,
+  includes 100);
+* the subject-by-subject Pearson correlation matrix;
+* percentile ranks: the share of the class scoring at or below a mark, for
+  every student at once or for one result.
+
+Each statistic is computed on first use and kept with the snapshot. If NumPy
+cannot be imported, the same numbers come from plain Python over sorted
+columns, so the app still runs, only slower. Missing
+marks count as 0, as on the class statistics cards.
+"""
+import bisect
+import functools
+import itertools
+import math
+
+from resultdashboard_reflex.stats import SUBJECTS
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except Exception:
+    np = None
+    NUMPY_AVAILABLE = False
+
+PERCENTILES = (25, 75, 90)
+BIN_WIDTH = 10
+BINS = 10
+# Statistic columns: the subjects, then the total.
+COLUMNS = tuple(label for label, _ in SUBJECTS) + ("Total",)
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+    """``numpy.percentile`` (linear) of an ascending list."""
+    position = (len(sorted_values) - 1) * q / 100
+    low = math.floor(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+class ClassAnalytics:
+    """Marks of the whole class and the statistics derived from them.
+
+    ``columns`` holds one contiguous array (NumPy) or list per entry of
+    ``COLUMNS``: the subject marks, then the totals, student by student in
+    ``rolls`` order.
+    """
+
+    def __init__(self, rolls, columns):
+        self.count = len(rolls)
+        if NUMPY_AVAILABLE:
+            self.rolls = np.asarray(rolls, dtype=np.int64)
+            self.columns = np.ascontiguousarray(columns, dtype=np.float64).reshape(len(COLUMNS), self.count)
+        else:
+            self.rolls = list(rolls)
+            self.columns = [[float(value) for value in column] for column in columns]
+
+    @classmethod
+    def from_rows(cls, rows, count: int = None) -> "ClassAnalytics":
+        """Build from ``(roll_no, <subject marks...>, total_marks)`` rows with no NULLs."""
+        rows = rows if count is not None else list(rows)
+        count = len(rows) if count is None else count
+        if NUMPY_AVAILABLE:
+            flat = np.fromiter(itertools.chain.from_iterable(rows), dtype=np.float64, count=count * (len(COLUMNS) + 1))
+            table = flat.reshape(count, len(COLUMNS) + 1).T
+            return cls(table[0], table[1:])
+        columns = list(zip(*rows)) or [()] * (len(COLUMNS) + 1)
+        return cls(columns[0], columns[1:])
+
+    def compute(self) -> "ClassAnalytics":
+        """Compute the dashboard statistics now (e.g. on a worker thread); return self."""
+        for name in ("summary", "histograms", "correlation"):
+            getattr(self, name)
+        return self
+
+    @property
+    def marks(self):
+        """The subject columns (without the totals)."""
+        return self.columns[:len(SUBJECTS)]
+
+    @functools.cached_property
+    def _sorted(self):
+        """Each of ``columns``, ascending."""
+        if NUMPY_AVAILABLE:
+            return np.sort(self.columns, axis=1)
+        return [sorted(column) for column in self.columns]
+
+    @functools.cached_property
+    def summary(self) -> list:
+        """One dict per column: mean, median, std and the ``PERCENTILES``."""
+        if not self.count:
+            return []
+        if NUMPY_AVAILABLE:
+            means, stds = self.columns.mean(axis=1).tolist(), self.columns.std(axis=1).tolist()
+        else:
+            means = [sum(column) / self.count for column in self.columns]
+            stds = [math.sqrt(sum((value - mean) ** 2 for value in column) / self.count)
+                    for column, mean in zip(self.columns, means)]
+        rows = []
+        for label, column, mean, std in zip(COLUMNS, self._sorted, means, stds):
+            row = {"subject": label, "mean": mean, "median": float(_percentile(column, 50)), "std": std}
+            row.update({f"p{q}": float(_percentile(column, q)) for q in PERCENTILES})
+            rows.append(row)
+        return rows
+
+    @functools.cached_property
+    def histograms(self) -> dict:
+        """Subject -> students per ten-mark bin (0-9, 10-19, ..., 90-100)."""
+        labels = [label for label, _ in SUBJECTS]
+        if NUMPY_AVAILABLE:
+            bins = np.minimum(self.marks // BIN_WIDTH, BINS - 1).astype(np.int64)
+            return {label: np.bincount(bins[i], minlength=BINS)[:BINS].tolist() for i, label in enumerate(labels)}
+        counts = {}
+        for label, column in zip(labels, self.marks):
+            counts[label] = [0] * BINS
+            for mark in column:
+                counts[label][min(int(mark // BIN_WIDTH), BINS - 1)] += 1
+        return counts
+
+    @functools.cached_property
+    def correlation(self) -> list:
+        """Pearson correlation between subjects as a nested list; None where a subject has no spread."""
+        subjects = len(SUBJECTS)
+        if self.count < 2:
+            return [[None] * subjects for _ in range(subjects)]
+        if NUMPY_AVAILABLE:
+            centered = self.marks - self.marks.mean(axis=1, keepdims=True)
+            covariance = (centered @ centered.T / self.count).tolist()
+        else:
+            centered = []
+            for column in self.marks:
+                mean = sum(column) / self.count
+                centered.append([value - mean for value in column])
+            covariance = [[sum(a * b for a, b in zip(x, y)) / self.count for y in centered] for x in centered]
+        spread = [math.sqrt(covariance[i][i]) for i in range(subjects)]
+        return [
+            [None if spread[i] == 0 or spread[j] == 0 else covariance[i][j] / (spread[i] * spread[j]) for j in range(subjects)]
+            for i in range(subjects)
+        ]
+
+    def rank(self, values) -> list:
+        """Percentile rank (0-100) of one mark per column, in ``COLUMNS`` order."""
+        if not self.count:
+            return [None] * len(COLUMNS)
+        if NUMPY_AVAILABLE:
+            at_or_below = [np.searchsorted(column, value, side="right") for column, value in zip(self._sorted, values)]
+        else:
+            at_or_below = [bisect.bisect_right(column, value) for column, value in zip(self._sorted, values)]
+        return [100.0 * int(below) / self.count for below in at_or_below]
+
+    @functools.cached_property
+    def percentile_ranks(self):
+        """Percentile rank of every student, one row per entry of ``COLUMNS``, in ``rolls`` order."""
+        if NUMPY_AVAILABLE:
+            below = np.stack([np.searchsorted(s, c, side="right") for s, c in zip(self._sorted, self.columns)])
+            return below * (100.0 / max(self.count, 1))
+        return [[100.0 * bisect.bisect_right(s, value) / self.count for value in c] for s, c in zip(self._sorted, self.columns)]
+
+    def student_ranks(self, result: dict) -> list:
+        """``(column, percentile rank)`` pairs for a ``queries.result_data`` dict."""
+        values = []
+        for key in ("bangla", "english", "math", "science", "total"):
+            try:
+                values.append(float(result.get(key) or 0))
+            except (TypeError, ValueError):
+                values.append(0.0)
+        return list(zip(COLUMNS, self.rank(values)))
+
+
+def summary_rows(analytics: ClassAnalytics) -> list:
+    """Dashboard table rows: subject, mean, median, std and percentiles as text."""
+    return [
+        [row["subject"]] + [f"{row[key]:.1f}" for key in ("mean", "median", "std")] + [f"{row[f'p{q}']:.0f}" for q in PERCENTILES]
+        for row in analytics.summary
+    ]
+
+
+def histogram_rows(analytics: ClassAnalytics) -> list:
+    """Dashboard table rows: mark range, then students in that range per subject."""
+    histograms = analytics.histograms
+    rows = []
+    for i in range(BINS):
+        low = i * BIN_WIDTH
+        high = low + BIN_WIDTH - 1 if i < BINS - 1 else 100
+        rows.append([f"{low}-{high}"] + [str(histograms[label][i]) for label, _ in SUBJECTS])
+    return rows
+
+
+def correlation_rows(analytics: ClassAnalytics) -> list:
+    """Dashboard table rows: subject, then its correlation with each subject."""
+    return [
+        [label] + ["-" if value is None else f"{value:.2f}" for value in row]
+        for (label, _), row in zip(SUBJECTS, analytics.correlation)
+    ]
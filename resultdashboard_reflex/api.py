@@ -0,0 +1,71 @@
+"""Plain HTTP routes served next to the Reflex app (via ``api_transformer``)."""
+import os
+import secrets
+
+from starlette.applications import Starlette
+from starlette.responses import FileResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+
+from resultdashboard_reflex.publish import PUBLISH_DIR
+
+
+async def export_results(request):
+    """Stream the results table as a download in the requested format."""
+    from resultdashboard_reflex.export import FORMATS, consume_token, stream_export
+
+    if not consume_token(request.query_params.get("token")):
+        return PlainTextResponse("Export link expired or invalid.", status_code=403)
+    fmt = request.query_params.get("format", "csv")
+    if fmt not in FORMATS:
+        return PlainTextResponse(f"Unknown export format {fmt!r}.", status_code=400)
+    try:
+        body = stream_export(fmt)
+    except ValueError as e:
+        return PlainTextResponse(str(e), status_code=400)
+    media_type, extension = FORMATS[fmt]
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="student_results.{extension}"'},
+    )
+
+
+async def marksheets(request):
+    """Download the report card build the token was issued for (see marksheets.py)."""
+    from resultdashboard_reflex.export import consume_token
+    from resultdashboard_reflex.marksheets import FORMATS
+
+    path = consume_token(request.query_params.get("token"))
+    if not isinstance(path, str):
+        return PlainTextResponse("Download link expired or invalid.", status_code=403)
+    if not os.path.exists(path):
+        return PlainTextResponse("These marksheets have been replaced; please generate them again.", status_code=404)
+    extension = os.path.splitext(path)[1].lstrip(".")
+    return FileResponse(path, media_type=FORMATS[extension], filename=f"marksheets.{extension}")
+
+
+async def metrics(request):
+    """Prometheus text exposition of the handler, database and cache metrics.
+
+    When RESULT_METRICS_TOKEN is set, scrapers must send it as a bearer
+    token (or ``?token=``).
+    """
+    from resultdashboard_reflex.metrics import render_prometheus
+
+    expected = os.environ.get("RESULT_METRICS_TOKEN")
+    if expected:
+        header = request.headers.get("authorization", "")
+        given = header[7:] if header.lower().startswith("bearer ") else request.query_params.get("token", "")
+        if not secrets.compare_digest(given.encode(), expected.encode()):
+            return PlainTextResponse("Forbidden.", status_code=403)
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+api = Starlette(routes=[
+    Route("/api/export", export_results),
+    Route("/api/marksheets", marksheets),
+    Route("/metrics", metrics),
+    # Published result snapshot (see publish.py); plain files, no database.
+    Mount("/results", StaticFiles(directory=PUBLISH_DIR, html=True, check_dir=False)),
+])
@@ -0,0 +1,430 @@
+"""Online backups of the SQLite database, with retention and verified restore.
+
+A snapshot is taken with SQLite's online backup API while the app keeps
+running: ``PAGES_PER_STEP`` pages are copied per step, and between steps the
+source is not locked at all. In WAL mode (see db.py) a step does not block
+writers or readers either; it only pins the pages it reads. A write made
+during the copy makes SQLite restart it. After ``MAX_RESTARTS`` restarts
+the rest is copied in one step, which is still consistent and, with WAL,
+still does not block writers.
+
+The copy is checked with ``PRAGMA quick_check``, gzipped into
+``BACKUP_DIR/<db name>-<UTC timestamp>.db.gz`` and the oldest snapshots
+beyond ``KEEP`` are deleted. When the app runs, :func:`scheduler` (a
+lifespan task) takes a snapshot whenever the newest one is older than
+``INTERVAL``; a lock file in the snapshot directory keeps several app
+processes from taking the same snapshot twice.
+
+:func:`restore` unpacks a snapshot, runs a full ``PRAGMA integrity_check``
+on it and only then copies it over the live database, again through the
+backup API, so open connections see the restored data instead of a
+replaced file. A snapshot of the current database is taken first. The
+restore is usually run from the command line, so it also rewrites a marker
+file next to the database; :func:`restore_watcher` (another lifespan task)
+sees it change and drops the running app's caches, class statistics and
+published snapshot, and tells open dashboards to reload.
+
+Environment variables:
+
+    RESULT_BACKUP_DIR       where snapshots are kept (default backups)
+    RESULT_BACKUP_INTERVAL  seconds between scheduled snapshots (default 86400, 0 disables)
+    RESULT_BACKUP_KEEP      snapshots kept (default 14)
+    RESULT_RESTORE_POLL     seconds between checks for a restore (default 2)
+
+Run from the project root:
+
+    python -m resultdashboard_reflex.backup create
+    python -m resultdashboard_reflex.backup list
+    python -m resultdashboard_reflex.backup verify backups/resultdashboard-20261017T020000Z.db.gz
+    python -m resultdashboard_reflex.backup restore backups/resultdashboard-20261017T020000Z.db.gz
+"""
+import argparse
+import asyncio
+import contextlib
+import datetime
+import gzip
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+from sqlalchemy.engine import make_url
+
+from resultdashboard_reflex.db import BUSY_TIMEOUT_MS, DB_URL
+
+BACKUP_DIR = os.environ.get("RESULT_BACKUP_DIR", "backups")
+INTERVAL = float(os.environ.get("RESULT_BACKUP_INTERVAL", "86400"))
+KEEP = int(os.environ.get("RESULT_BACKUP_KEEP", "14"))
+RESTORE_POLL = float(os.environ.get("RESULT_RESTORE_POLL", "2"))
+
+# 1024 pages of 4 KiB: 4 MiB per step.
+PAGES_PER_STEP = 1024
+STEP_SLEEP = 0.005
+MAX_RESTARTS = 3
+# gzip level 1: on a 30 MB database, 2.5x faster than level 6 for 9% more bytes.
+COMPRESS_LEVEL = 1
+SUFFIX = ".db.gz"
+LOCK_FILE = ".backup.lock"
+
+# One snapshot at a time per process.
+_lock = threading.Lock()
+
+
+class _Restarted(Exception):
+    pass
+
+
+def database_path(url: str = DB_URL) -> str:
+    """File of the SQLite database at ``url``; raise ValueError for other databases."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or not parsed.database or parsed.database == ":memory:":
+        raise ValueError(f"Backups need a SQLite database file, not {url!r}.")
+    return os.path.abspath(parsed.database)
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    return sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000)
+
+
+def restore_marker(url: str = DB_URL) -> str:
+    """File rewritten after every restore of the database at ``url``."""
+    return database_path(url) + "-restored"
+
+
+def _read_marker(path: str) -> str:
+    try:
+        with open(path) as f:
+            return f.read()
+    except FileNotFoundError:
+        return ""
+
+
+def _write_marker(path: str) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(str(time.time_ns()))
+    os.replace(tmp_path, path)
+
+
+def copy_database(source: sqlite3.Connection, target: sqlite3.Connection, progress=None) -> dict:
+    """Copy ``source`` into ``target`` with the online backup API.
+
+    ``progress(remaining, total)`` is called after each step. Returns the
+    page count and how often a concurrent write restarted the copy.
+    """
+    state = {"remaining": None, "restarts": 0, "pages": 0}
+
+    def step(status, remaining, total):
+        if state["remaining"] is not None and remaining > state["remaining"]:
+            state["restarts"] += 1
+            if state["restarts"] > MAX_RESTARTS:
+                raise _Restarted()
+        state["remaining"] = remaining
+        state["pages"] = total
+        if progress is not None:
+            progress(remaining, total)
+
+    try:
+        source.backup(target, pages=PAGES_PER_STEP, progress=step, sleep=STEP_SLEEP)
+    except _Restarted:
+        source.backup(target, pages=-1)
+    return state
+
+
+def _check(connection: sqlite3.Connection, pragma: str = "integrity_check") -> list:
+    """Problems reported by ``PRAGMA integrity_check`` (or ``quick_check``); empty if none."""
+    rows = [row[0] for row in connection.execute(f"PRAGMA {pragma}")]
+    return [] if rows == ["ok"] else rows
+
+
+def _snapshot_name(stem: str, label: str = "") -> str:
+    timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    return f"{stem}-{timestamp}{'-' + label if label else ''}{SUFFIX}"
+
+
+def list_snapshots(directory: str = BACKUP_DIR, url: str = DB_URL) -> list:
+    """Snapshots of the database at ``url``, oldest first."""
+    stem = Path(database_path(url)).stem
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    return sorted(str(path) for path in directory.glob(f"{stem}-*{SUFFIX}"))
+
+
+def prune(directory: str = BACKUP_DIR, keep: int = KEEP, url: str = DB_URL) -> list:
+    """Delete all but the newest ``keep`` snapshots; return the deleted paths."""
+    snapshots = list_snapshots(directory, url)
+    removed = snapshots[:-keep] if keep > 0 else []
+    for path in removed:
+        os.remove(path)
+    return removed
+
+
+def create_snapshot(directory: str = BACKUP_DIR, keep: int = KEEP, url: str = DB_URL, label: str = "", progress=None) -> dict:
+    """Take a compressed snapshot of the live database; return a report.
+
+    Afterwards only the newest ``keep`` snapshots are kept (all of them if
+    ``keep`` is 0).
+    """
+    path = database_path(url)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No database at {path}.")
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    snapshot = os.path.join(directory, _snapshot_name(Path(path).stem, label))
+    tmp_path = snapshot[:-len(".gz")] + ".tmp"
+
+    with _lock:
+        start = time.perf_counter()
+        try:
+            source = _connect(path)
+            target = sqlite3.connect(tmp_path)
+            try:
+                copied = copy_database(source, target, progress)
+                problems = _check(target, "quick_check")
+            finally:
+                target.close()
+                source.close()
+            if problems:
+                raise RuntimeError(f"Snapshot failed its check: {'; '.join(problems[:5])}")
+            copy_seconds = time.perf_counter() - start
+            with open(tmp_path, "rb") as src, gzip.open(snapshot + ".part", "wb", compresslevel=COMPRESS_LEVEL) as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+            os.replace(snapshot + ".part", snapshot)
+            size = os.path.getsize(tmp_path)
+        finally:
+            for leftover in (tmp_path, snapshot + ".part"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+        removed = prune(directory, keep, url)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "path": snapshot,
+        "pages": copied["pages"],
+        "restarts": copied["restarts"],
+        "bytes": size,
+        "compressed_bytes": os.path.getsize(snapshot),
+        "copy_seconds": round(copy_seconds, 3),
+        "seconds": round(elapsed, 3),
+        "pruned": removed,
+    }
+
+
+def _unpack(snapshot: str, directory: str) -> str:
+    """Decompress ``snapshot`` into a temporary file in ``directory``; return its path."""
+    fd, tmp_path = tempfile.mkstemp(suffix=".db", prefix=".restore-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as dst, gzip.open(snapshot, "rb") as src:
+            shutil.copyfileobj(src, dst, 1 << 20)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    return tmp_path
+
+
+def verify(snapshot: str) -> list:
+    """Run ``PRAGMA integrity_check`` on a snapshot; return the problems (empty if sound)."""
+    tmp_path = _unpack(snapshot, os.path.dirname(os.path.abspath(snapshot)))
+    try:
+        connection = sqlite3.connect(tmp_path)
+        try:
+            return _check(connection)
+        except sqlite3.DatabaseError as e:
+            return [str(e)]
+        finally:
+            connection.close()
+    finally:
+        os.remove(tmp_path)
+
+
+def restore(snapshot: str, url: str = DB_URL, directory: str = BACKUP_DIR) -> dict:
+    """Replace the live database with ``snapshot`` after checking its integrity.
+
+    The current database is snapshotted first (labelled ``pre-restore``).
+    Raises ValueError, leaving the database untouched, if the check fails.
+    """
+    path = database_path(url)
+    start = time.perf_counter()
+    tmp_path = _unpack(snapshot, os.path.dirname(path))
+    try:
+        source = sqlite3.connect(tmp_path)
+        try:
+            try:
+                problems = _check(source)
+            except sqlite3.DatabaseError as e:
+                problems = [str(e)]
+            if problems:
+                raise ValueError(f"{snapshot} failed the integrity check: {'; '.join(problems[:5])}")
+            safety = create_snapshot(directory, keep=0, url=url, label="pre-restore")["path"] if os.path.exists(path) else None
+            target = _connect(path)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+        finally:
+            source.close()
+    finally:
+        os.remove(tmp_path)
+    _write_marker(restore_marker(url))
+    _restored()
+    return {"path": path, "snapshot": snapshot, "pre_restore": safety, "seconds": round(time.perf_counter() - start, 3)}
+
+
+def _restored() -> None:
+    """Drop everything this process derived from the old data.
+
+    Other processes (the app, when the restore ran from the command line)
+    do the same from :func:`restore_watcher`.
+    """
+    from resultdashboard_reflex.cache import result_cache
+    from resultdashboard_reflex.changefeed import feed
+    from resultdashboard_reflex.publish import retract
+    from resultdashboard_reflex.stats import class_stats
+
+    result_cache.clear()
+    class_stats.reset()
+    retract()
+    feed.publish("reset")
+
+
+def _newest_age(directory: str) -> float:
+    snapshots = list_snapshots(directory)
+    if not snapshots:
+        return float("inf")
+    return time.time() - os.path.getmtime(snapshots[-1])
+
+
+@contextlib.contextmanager
+def _directory_lock(directory: str):
+    """Hold an exclusive lock on ``directory``'s lock file; yield False if another process has it."""
+    if fcntl is None:
+        yield True
+        return
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    with open(os.path.join(directory, LOCK_FILE), "a") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _scheduled_snapshot(interval: float, directory: str) -> float:
+    """Take a snapshot if the newest is ``interval`` old; return seconds until the next check."""
+    with _directory_lock(directory) as locked:
+        if not locked:
+            # Another process is taking it; look again once it should be done.
+            return min(interval, 60)
+        wait = interval - _newest_age(directory)
+        if wait <= 0:
+            create_snapshot(directory)
+            wait = interval
+        return wait
+
+
+async def scheduler(interval: float = INTERVAL, directory: str = BACKUP_DIR):
+    """Lifespan task: snapshot the database whenever the newest snapshot is ``interval`` old.
+
+    Going by the snapshot files rather than a timer means a restart does
+    not pile up extra snapshots, and the age check and snapshot run under
+    the directory's lock file, so several workers take one snapshot
+    between them.
+    """
+    from resultdashboard_reflex.metrics import record_error
+
+    if interval <= 0:
+        return
+    try:
+        database_path()
+    except ValueError:
+        return
+    while True:
+        try:
+            wait = await asyncio.to_thread(_scheduled_snapshot, interval, directory)
+        except Exception as e:
+            record_error(e)
+            wait = min(interval, 600)
+        await asyncio.sleep(wait)
+
+
+async def restore_watcher(poll: float = RESTORE_POLL):
+    """Lifespan task: call :func:`_restored` when another process restores the database."""
+    from resultdashboard_reflex.metrics import record_error
+
+    if poll <= 0:
+        return
+    try:
+        marker = restore_marker()
+    except ValueError:
+        return
+    seen = _read_marker(marker)
+    while True:
+        await asyncio.sleep(poll)
+        try:
+            current = _read_marker(marker)
+            if current != seen:
+                seen = current
+                _restored()
+        except Exception as e:
+            record_error(e)
+
+
+def format_report(report: dict) -> str:
+    return (
+        f"Backed up {report['bytes'] / 1e6:.1f} MB ({report['pages']} pages, {report['restarts']} restart(s)) "
+        f"to {report['path']} ({report['compressed_bytes'] / 1e6:.1f} MB) in {report['seconds']}s "
+        f"(copy {report['copy_seconds']}s), pruned {len(report['pruned'])}."
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Back up, list, verify and restore the SQLite database.")
+    parser.add_argument("--dir", default=BACKUP_DIR, help="snapshot directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    create_parser = sub.add_parser("create", help="take a snapshot now")
+    create_parser.add_argument("--keep", type=int, default=KEEP, help="snapshots to keep")
+    sub.add_parser("list", help="list snapshots, oldest first")
+    verify_parser = sub.add_parser("verify", help="check a snapshot's integrity")
+    verify_parser.add_argument("snapshot")
+    restore_parser = sub.add_parser("restore", help="verify a snapshot and restore it over the database")
+    restore_parser.add_argument("snapshot")
+    args = parser.parse_args(argv)
+
+    if args.command == "create":
+        print(format_report(create_snapshot(args.dir, args.keep)))
+    elif args.command == "list":
+        for path in list_snapshots(args.dir):
+            print(f"{path}  {os.path.getsize(path) / 1e6:.1f} MB")
+    elif args.command == "verify":
+        problems = verify(args.snapshot)
+        for problem in problems:
+            print(problem)
+        print("FAILED" if problems else "ok")
+        return 1 if problems else 0
+    elif args.command == "restore":
+        try:
+            report = restore(args.snapshot, directory=args.dir)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+        print(f"Restored {report['snapshot']} to {report['path']} in {report['seconds']}s.")
+        if report["pre_restore"]:
+            print(f"The previous database was saved as {report['pre_restore']}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Process-local read-through cache for published results.
+
+Results rarely change once published, so lookups are served from a bounded
+LRU map with a TTL and only fall through to SQLite on a miss. Keys are
+tuples whose first element is the query kind:
+
+    ("roll", roll_no)  -> a single Student (or None when not found)
+    ("page", ...)      -> one page of the teacher's results table (row dicts)
+    ("top", n)         -> the top ``n`` students by total marks (row dicts)
+    ("subject_top", subject, n) -> the top ``n`` students in one subject
+    ("exam_roll", exam_id, roll_no) -> one student's result in a closed exam
+    ("exams",)         -> the closed exams, newest first
+    ("timeline", start, end, type, after, n) -> one page of timeline events
+
+Writers call :func:`invalidate_student` so only the entries a change can
+affect are dropped. ``version`` increases on every write, so sessions can
+tell whether the rows they already hold are still current.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from resultdashboard_reflex.throttle import SingleFlight
+
+_MISSING = object()
+
+
+class ResultCache:
+    """A thread-safe LRU cache with per-entry expiry and hit/miss counters."""
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[tuple, tuple[float, object]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.version = 0
+        self._flights = SingleFlight()
+
+    def get(self, key: tuple, default=None):
+        """Return the cached value for ``key`` or ``default``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key: tuple, loader):
+        """Return the cached value for ``key``, calling ``loader()`` on a miss.
+
+        ``None`` results are cached too, so repeated lookups of an unknown
+        roll number do not reach the database. Exceptions from ``loader``
+        propagate and nothing is stored.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = loader()
+        self.put(key, value)
+        return value
+
+    async def aget_or_load(self, key: tuple, loader):
+        """Async :meth:`get_or_load`: ``loader`` is a coroutine function.
+
+        Concurrent misses for the same key share one ``loader()`` call. The
+        result is only stored if no write bumped the version meanwhile.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        return await self._flights.do(key, lambda: self._aload(key, loader))
+
+    async def _aload(self, key: tuple, loader):
+        version = self.version
+        value = await loader()
+        if self.version == version:
+            self.put(key, value)
+        return value
+
+    def invalidate(self, key: tuple) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def entries_of_kind(self, kind: str) -> list:
+        """Return ``(key, value)`` pairs whose key starts with ``kind``."""
+        with self._lock:
+            return [(k, v) for k, (_, v) in self._entries.items() if k[0] == kind]
+
+    def invalidate_kind(self, kind: str) -> None:
+        """Drop every entry whose key starts with ``kind``."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == kind]:
+                del self._entries[key]
+                self.invalidations += 1
+
+    def bump_version(self) -> None:
+        with self._lock:
+            self.version += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "version": self.version,
+                "coalesced": self._flights.merged,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+result_cache = ResultCache(
+    max_entries=int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", "4096")),
+    ttl=float(os.environ.get("RESULT_CACHE_TTL", "300")),
+)
+
+
+def invalidate_student(roll_no, total_marks, cache: ResultCache = result_cache) -> None:
+    """Drop the entries affected by inserting or deleting one student.
+
+    A top-N list only changes if it already holds the roll, is not yet full,
+    or the student's total would reach its last place.
+    """
+    cache.bump_version()
+    cache.invalidate(("roll", roll_no))
+    cache.invalidate_kind("page")
+    cache.invalidate_kind("subject_top")
+    total = total_marks or 0
+    for key, rows in cache.entries_of_kind("top"):
+        n = key[1]
+        if (
+            len(rows) < n
+            or any(row["roll_no"] == roll_no for row in rows)
+            or total >= (rows[-1]["total_marks"] or 0)
+        ):
+            cache.invalidate(key)
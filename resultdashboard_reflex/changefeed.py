@@ -0,0 +1,182 @@
+"""Row-level change feed that pushes result updates to open dashboards.
+
+Writers publish a change after they commit; each change gets the next
+sequence number::
+
+    {"seq": 12, "op": "upsert", "row": {"id": ..., "roll_no": ..., "name": ..., "total_marks": ..., "grade": ...}}
+    {"seq": 13, "op": "delete", "row": {...}}
+    {"seq": 14, "op": "reset"}    # too many rows changed (regrade, big import)
+
+Every open dashboard runs ``ResultState.watch_changes``, a background task
+that waits here for changes after the last sequence number it applied and
+patches its own leaderboard, results page and averages with
+:func:`apply_to_top` / :func:`apply_to_page`, instead of reloading them.
+Only on a ``reset``, or when a watcher has fallen more than ``MAX_CHANGES``
+behind, does it reload, and then through the shared result cache.
+
+Like the result cache, the feed is per process: with several workers each
+one only sees the writes made through it.
+"""
+import asyncio
+import os
+import threading
+from collections import deque
+
+MAX_CHANGES = int(os.environ.get("RESULT_FEED_SIZE", "1000"))
+# Batches larger than this are published as a single "reset".
+MAX_BATCH_ROWS = 200
+
+
+class ChangeFeed:
+    """Bounded, sequence-numbered log of changes with async waiters.
+
+    ``publish`` may be called from any thread (imports run on a worker
+    thread); waiters are woken on their own event loop.
+    """
+
+    def __init__(self, max_changes: int = MAX_CHANGES):
+        self._lock = threading.Lock()
+        self._changes = deque(maxlen=max_changes)
+        self._waiters = set()
+        self.seq = 0
+        self.published = 0
+        self.resets = 0
+
+    def _append(self, changes: list) -> int:
+        with self._lock:
+            for op, row in changes:
+                self.seq += 1
+                change = {"seq": self.seq, "op": op}
+                if row is not None:
+                    change["row"] = dict(row)
+                self._changes.append(change)
+                self.published += 1
+                if op == "reset":
+                    self.resets += 1
+            seq = self.seq
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The waiter's loop has closed.
+                pass
+        return seq
+
+    def publish(self, op: str, row: dict = None) -> int:
+        """Record one change and wake the waiters; return its sequence number."""
+        return self._append([(op, row)])
+
+    def publish_many(self, op: str, rows) -> int:
+        """Record ``op`` for each row, or one "reset" if there are too many."""
+        rows = list(rows)
+        if not rows:
+            return self.seq
+        if len(rows) > MAX_BATCH_ROWS:
+            return self.publish("reset")
+        return self._append([(op, row) for row in rows])
+
+    def since(self, seq: int):
+        """Changes after ``seq``, oldest first; None if some were already dropped."""
+        with self._lock:
+            if seq >= self.seq:
+                return []
+            if not self._changes or self._changes[0]["seq"] > seq + 1:
+                return None
+            return [change for change in self._changes if change["seq"] > seq]
+
+    async def wait(self, seq: int, timeout: float):
+        """Wait up to ``timeout`` seconds for a change after ``seq``; return ``since(seq)``."""
+        event = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), event)
+        with self._lock:
+            ready = self.seq > seq
+            if not ready:
+                self._waiters.add(waiter)
+        if not ready:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._lock:
+                    self._waiters.discard(waiter)
+        return self.since(seq)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "seq": self.seq,
+                "published": self.published,
+                "resets": self.resets,
+                "watchers": len(self._waiters),
+            }
+
+
+def apply_to_top(rows: list, change: dict, n: int):
+    """Apply ``change`` to a top-``n`` list ordered by total marks.
+
+    Returns ``(rows, complete)``. ``complete`` is False when a row left a
+    full list and the one that should replace it is not known, in which
+    case the caller reloads the list.
+    """
+    row = change["row"]
+    kept = [r for r in rows if r["roll_no"] != row["roll_no"]]
+    removed = len(kept) < len(rows)
+    full = len(rows) >= n
+    if change["op"] == "delete":
+        return kept, not (removed and full)
+    if not removed and full and (row["total_marks"] or 0) <= (rows[-1]["total_marks"] or 0):
+        return rows, True
+    kept.append(row)
+    kept.sort(key=lambda r: r["total_marks"] or 0, reverse=True)
+    # An updated row that sank to the bottom of a full list may now rank
+    # below a student the list never held.
+    if removed and full and kept.index(row) >= n - 1:
+        return kept[:n], False
+    return kept[:n], True
+
+
+def apply_to_page(rows: list, change: dict, sort_by: str, descending: bool, after, limit: int, has_next: bool):
+    """Apply ``change`` to one keyset page of the results table.
+
+    ``after`` is the page's cursor and ``has_next`` whether a page follows.
+    Returns ``(rows, has_next)``, or None when the page has to be reloaded
+    (a row left a page that has successors, or the row cannot be placed).
+    """
+    row = change["row"]
+    if "id" not in row:
+        return None
+    kept = [r for r in rows if r["id"] != row["id"]]
+    removed = len(kept) < len(rows)
+    if change["op"] == "delete":
+        if removed and has_next:
+            return None
+        return kept, has_next
+
+    def key(r):
+        return (r[sort_by], r["id"])
+
+    def precedes(a, b):
+        return a > b if descending else a < b
+
+    try:
+        new = key(row)
+        on_page = (after is None or precedes(tuple(after), new)) and (
+            not has_next or not rows or not precedes(key(rows[-1]), new)
+        )
+        if not on_page:
+            if removed and has_next:
+                return None
+            return kept, has_next
+        kept.append(row)
+        kept.sort(key=key, reverse=descending)
+    except TypeError:
+        # NULLs in the sort column do not compare in Python.
+        return None
+    if len(kept) > limit:
+        return kept[:limit], True
+    return kept, has_next
+
+
+feed = ChangeFeed()
@@ -0,0 +1,40 @@
+"""Optional chart figures, built with plotly only when it is installed.
+
+Nothing here imports plotly or pandas at module import time: ``available``
+only checks that plotly can be found, and the figure builders import it on
+first use. Without plotly the dashboard keeps its text and progress-bar
+views of the same numbers.
+"""
+import functools
+import importlib.util
+
+
+@functools.lru_cache(maxsize=None)
+def available(module: str = "plotly") -> bool:
+    """Whether ``module`` is installed (without importing it)."""
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def grade_distribution_figure(histogram: dict):
+    """A bar chart of the grade histogram, or None without plotly."""
+    if not available():
+        return None
+    import plotly.graph_objects as go
+
+    figure = go.Figure(go.Bar(x=list(histogram.keys()), y=list(histogram.values())))
+    figure.update_layout(title="Grade distribution", xaxis_title="Grade", yaxis_title="Students")
+    return figure
+
+
+def subject_average_figure(summary) -> object:
+    """A bar chart of ``(subject, average, min, max)`` rows, or None without plotly."""
+    if not available():
+        return None
+    import plotly.graph_objects as go
+
+    figure = go.Figure(go.Bar(x=[row[0] for row in summary], y=[row[1] for row in summary]))
+    figure.update_layout(title="Subject averages", yaxis_title="Marks", yaxis_range=[0, 100])
+    return figure
@@ -0,0 +1,345 @@
+"""Corrections to stored results: upsert by roll number and bulk delete.
+
+:func:`upsert_students` writes a batch of rows keyed on ``roll_no`` in one
+transaction, as ``INSERT ... ON CONFLICT (roll_no) DO UPDATE`` statements
+(``ON DUPLICATE KEY UPDATE`` on MySQL) of up to ``ROWS_PER_STATEMENT`` rows: rolls on record are updated, new ones
+inserted. A row only has to carry the fields being corrected; the others are
+taken from the stored row, and ``total_marks`` and ``grade`` are recomputed
+for the whole batch with one ``Grader.grade_many`` call. The changed marks
+are upserted into the mark table (subjects.py) the same way, on
+``(student_id, subject_id)``. ``name`` is only in the update list of rows
+whose name changes, so the name index (search.py) is not rewritten for
+rows that only had their marks fixed.
+
+:func:`delete_students` removes a selection of rolls and roll ranges with
+one DELETE per table, reading the removed rows back with ``RETURNING``.
+
+Both commit, then bring the class statistics, the result cache and open
+dashboards (change feed) up to date, like the other writers.
+
+Run from the project root:
+
+    python -m resultdashboard_reflex.corrections fixes.csv
+    python -m resultdashboard_reflex.corrections --delete 5,7,10-20
+"""
+import argparse
+import sys
+import time
+
+from sqlalchemy import delete, or_, select
+
+from resultdashboard_reflex.cache import invalidate_student, result_cache
+from resultdashboard_reflex.changefeed import feed
+from resultdashboard_reflex.grading import get_active_grader
+from resultdashboard_reflex.importer import MAX_REPORTED_ERRORS, iter_records, parse_mark
+from resultdashboard_reflex.models import Mark, Student
+from resultdashboard_reflex.publish import retract
+from resultdashboard_reflex.queries import row_view
+from resultdashboard_reflex.stats import SUBJECTS, class_stats
+from resultdashboard_reflex.subjects import subject_ids
+
+# Rows per upsert statement and per ``roll_no IN (...)`` lookup.
+ROWS_PER_STATEMENT = 500
+
+MARK_FIELDS = tuple(field for _, field in SUBJECTS)
+# Fields a correction can set; totals and grades are always recomputed.
+FIELDS = ("name",) + MARK_FIELDS
+_COLUMNS = ("id", "roll_no") + FIELDS + ("total_marks", "grade")
+
+
+def parse_roll(value) -> int:
+    try:
+        roll = int(str(value).strip())
+    except ValueError:
+        raise ValueError(f"invalid roll number {value!r}")
+    if roll <= 0:
+        raise ValueError(f"invalid roll number {roll}")
+    return roll
+
+
+def parse_selection(text: str) -> list:
+    """Parse ``"5, 7, 10-20"`` into ``(first, last)`` roll ranges, merged and sorted."""
+    ranges = []
+    for part in str(text or "").replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, sep, last = part.partition("-")
+        first = parse_roll(first)
+        last = parse_roll(last) if sep else first
+        if last < first:
+            raise ValueError(f"invalid roll range {part!r}")
+        ranges.append((first, last))
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def validate_correction(record: dict) -> dict:
+    """Return the fields ``record`` sets (always ``roll_no``) or raise ValueError.
+
+    Blank cells leave the stored value unchanged.
+    """
+    row = {"roll_no": parse_roll(record.get("roll_no", ""))}
+    name = str(record.get("name") or "").strip()
+    if name:
+        row["name"] = name
+    for label, field in SUBJECTS:
+        raw = record.get(field)
+        if raw is None or str(raw).strip() == "":
+            continue
+        row[field] = parse_mark(raw, label)
+    return row
+
+
+def _chunks(rows, size: int = ROWS_PER_STATEMENT):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _dialect_insert(session):
+    name = session.get_bind().dialect.name
+    if name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif name in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert
+    else:
+        raise ValueError(f"Corrections need a SQLite, PostgreSQL or MySQL database, not {name}.")
+    return insert
+
+
+def _upsert(insert, table, keys, fields):
+    """INSERT into ``table`` that updates ``fields`` when the unique ``keys`` already exist."""
+    stmt = insert(table)
+    if hasattr(stmt, "on_duplicate_key_update"):
+        # MySQL: the conflict target is whichever unique index matched.
+        return stmt.on_duplicate_key_update({field: stmt.inserted[field] for field in fields})
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c[key] for key in keys], set_={field: stmt.excluded[field] for field in fields}
+    )
+
+
+def _upsert_students(session, stmt, batch) -> dict:
+    """Run the student upsert over ``batch``; return ``{roll_no: id}``."""
+    table = Student.__table__
+    ids = {}
+    returning = session.get_bind().dialect.insert_returning
+    if returning:
+        stmt = stmt.returning(table.c.id, table.c.roll_no)
+    for chunk in _chunks(batch):
+        if returning:
+            ids.update({roll: student_id for student_id, roll in session.execute(stmt, chunk)})
+        else:
+            session.execute(stmt, chunk)
+            rolls = [row["roll_no"] for row in chunk]
+            ids.update({roll: student_id for student_id, roll in session.execute(
+                select(table.c.id, table.c.roll_no).where(table.c.roll_no.in_(rolls))
+            )})
+    return ids
+
+
+def _stored_rows(session, rolls) -> dict:
+    table = Student.__table__
+    columns = [table.c[column] for column in _COLUMNS]
+    stored = {}
+    for chunk in _chunks(rolls):
+        for row in session.execute(select(*columns).where(table.c.roll_no.in_(chunk))).mappings():
+            stored[row["roll_no"]] = dict(row)
+    return stored
+
+
+def upsert_students(session, rows, grader=None) -> dict:
+    """Insert or update ``rows`` by roll number in one transaction.
+
+    Each row is a dict with ``roll_no`` and any of ``FIELDS``; later rows for
+    the same roll override earlier ones. A roll not on record needs a name
+    and every mark, otherwise it is skipped. Returns ``{"inserted",
+    "updated", "skipped": [rolls], "rows": [row views]}``.
+    """
+    grader = grader or get_active_grader()
+    changes = {}
+    for row in rows:
+        changes.setdefault(row["roll_no"], {}).update(
+            {field: row[field] for field in FIELDS if row.get(field) is not None}
+        )
+    stored = _stored_rows(session, list(changes))
+
+    written, skipped = [], []
+    for roll, change in changes.items():
+        old = stored.get(roll)
+        if old is None and any(field not in change for field in FIELDS):
+            skipped.append(roll)
+            continue
+        row = {"roll_no": roll, **{field: old[field] for field in FIELDS}} if old else {"roll_no": roll}
+        row.update(change)
+        written.append(row)
+    graded = grader.grade_many([[row[field] for field in grader.fields] for row in written])
+    for row, (total, grade) in zip(written, graded):
+        row["total_marks"] = total
+        row["grade"] = grade
+
+    insert = _dialect_insert(session)
+    renamed, kept = [], []
+    for row in written:
+        old = stored.get(row["roll_no"])
+        (kept if old is not None and old["name"] == row["name"] else renamed).append(row)
+    ids = {}
+    try:
+        table = Student.__table__
+        for batch, fields in ((renamed, FIELDS), (kept, MARK_FIELDS)):
+            stmt = _upsert(insert, table, ("roll_no",), fields + ("total_marks", "grade"))
+            ids.update(_upsert_students(session, stmt, batch))
+        subjects = subject_ids(session)
+        marks = [
+            {"student_id": ids[row["roll_no"]], "subject_id": subjects[field], "marks": row[field]}
+            for row in written
+            for field in MARK_FIELDS
+            if row["roll_no"] not in stored or field in changes[row["roll_no"]]
+        ]
+        mark_upsert = _upsert(insert, Mark.__table__, ("student_id", "subject_id"), ("marks",))
+        for chunk in _chunks(marks, ROWS_PER_STATEMENT * len(MARK_FIELDS)):
+            session.execute(mark_upsert, chunk)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    views = []
+    for row in written:
+        row["id"] = ids[row["roll_no"]]
+        old = stored.get(row["roll_no"])
+        if old is not None:
+            class_stats.remove(old)
+        class_stats.add(row)
+        views.append(row_view(row))
+    _changed(views, "upsert")
+    return {
+        "inserted": sum(1 for row in written if row["roll_no"] not in stored),
+        "updated": sum(1 for row in written if row["roll_no"] in stored),
+        "skipped": skipped,
+        "rows": views,
+    }
+
+
+def delete_students(session, ranges) -> list:
+    """Delete every student whose roll falls in one of the ``(first, last)`` ranges.
+
+    One DELETE for their mark rows and one for the students; returns the
+    removed students as row dicts.
+    """
+    if not ranges:
+        return []
+    table = Student.__table__
+    condition = or_(*[
+        table.c.roll_no == first if first == last else table.c.roll_no.between(first, last)
+        for first, last in ranges
+    ])
+    columns = [table.c[column] for column in _COLUMNS]
+    try:
+        session.execute(delete(Mark.__table__).where(Mark.__table__.c.student_id.in_(select(table.c.id).where(condition))))
+        if session.get_bind().dialect.delete_returning:
+            removed = session.execute(delete(table).where(condition).returning(*columns)).mappings().all()
+        else:
+            removed = session.execute(select(*columns).where(condition)).mappings().all()
+            session.execute(delete(table).where(condition))
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    removed = [dict(row) for row in removed]
+    for row in removed:
+        class_stats.remove(row)
+    _changed([row_view(row) for row in removed], "delete")
+    return removed
+
+
+def _changed(views: list, op: str) -> None:
+    """Invalidate cached reads and notify open dashboards after a commit."""
+    if not views:
+        return
+    if len(views) == 1:
+        invalidate_student(views[0]["roll_no"], views[0]["total_marks"])
+    else:
+        result_cache.clear()
+    retract()
+    feed.publish_many(op, views)
+
+
+def correct_records(records, session) -> dict:
+    """Validate ``records`` (``(line_no, raw_record)`` pairs) and upsert them in one transaction.
+
+    Returns a report like ``importer.import_records``.
+    """
+    start = time.perf_counter()
+    errors = []
+    rows = []
+    lines = {}
+    processed = 0
+    for line_no, record in records:
+        processed += 1
+        try:
+            row = validate_correction(record)
+        except ValueError as e:
+            errors.append((line_no, str(e)))
+            continue
+        rows.append(row)
+        lines[row["roll_no"]] = line_no
+    result = upsert_students(session, rows)
+    for roll in result["skipped"]:
+        errors.append((lines[roll], f"roll number {roll} is new; name and all marks are required"))
+    errors.sort()
+
+    elapsed = time.perf_counter() - start
+    written = result["inserted"] + result["updated"]
+    return {
+        "processed": processed,
+        "inserted": result["inserted"],
+        "updated": result["updated"],
+        "errors": errors[:MAX_REPORTED_ERRORS],
+        "error_count": len(errors),
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(written / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def format_report(report: dict) -> str:
+    return (
+        f"Updated {report['updated']} and added {report['inserted']} of {report['processed']} rows in "
+        f"{report['seconds']}s ({report['rows_per_sec']} rows/sec), "
+        f"{report['error_count']} error(s)."
+    )
+
+
+def main(argv=None) -> int:
+    from resultdashboard_reflex import db
+
+    parser = argparse.ArgumentParser(description="Correct or delete student results by roll number.")
+    parser.add_argument("path", nargs="?", help="CSV or XLSX file with a roll column and the columns to correct")
+    parser.add_argument("--delete", metavar="ROLLS", help="rolls and ranges to delete, e.g. 5,7,10-20")
+    args = parser.parse_args(argv)
+    if not args.path and not args.delete:
+        parser.error("give a file to apply and/or --delete")
+
+    status = 0
+    with db.session() as session:
+        if args.delete:
+            removed = delete_students(session, parse_selection(args.delete))
+            print(f"Deleted {len(removed)} student(s).")
+        if args.path:
+            report = correct_records(iter_records(args.path, required=("roll_no",)), session)
+            for line_no, message in report["errors"]:
+                print(f"line {line_no}: {message}")
+            print(format_report(report))
+            status = 1 if report["error_count"] else 0
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""Configured database engines and sessions.
+
+Every data access in the app goes through :func:`session` (reads and writes
+against the primary database) or :func:`read_session` (read-only traffic,
+which can be pointed at a replica). Event handlers use the async
+counterparts, :func:`async_session` and :func:`async_read_session`, which
+run on async SQLAlchemy (aiosqlite for SQLite) so a slow query never blocks
+the event loop. For SQLite each new connection gets:
+
+* ``journal_mode=WAL`` so readers are not blocked by a writer,
+* ``busy_timeout`` so a writer waits for the lock instead of failing,
+* ``synchronous=NORMAL`` (durable with WAL, far fewer fsyncs),
+* ``foreign_keys=ON``,
+* a larger sqlite3 prepared-statement cache (``cached_statements``).
+
+SQLAlchemy's compiled-statement cache is sized with ``query_cache_size``.
+
+Environment variables:
+
+    RESULTDB_URL            primary database (default sqlite:///resultdashboard.db)
+    RESULTDB_READ_URL       optional read replica: a SQLite file URL or a Postgres URL
+    RESULTDB_POOL_SIZE      connections kept per engine (default 10)
+    RESULTDB_MAX_OVERFLOW   extra connections allowed under load (default 20)
+    RESULTDB_BUSY_TIMEOUT   milliseconds a SQLite writer waits for the lock (default 5000)
+
+A replica is read asynchronously from the primary, so reads may briefly lag
+a write; the result cache TTL bounds how long a stale entry can live.
+"""
+import os
+import threading
+from typing import TYPE_CHECKING
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+# Take sqlmodel from Reflex, which patches pydantic while sqlmodel loads;
+# importing sqlmodel directly first would make rx.Model unimportable.
+from reflex.utils.compat import sqlmodel
+
+Session = sqlmodel.Session
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+DEFAULT_DB_URL = "sqlite:///resultdashboard.db"
+DB_URL = os.environ.get("RESULTDB_URL", DEFAULT_DB_URL)
+READ_URL = os.environ.get("RESULTDB_READ_URL") or None
+POOL_SIZE = int(os.environ.get("RESULTDB_POOL_SIZE", "10"))
+MAX_OVERFLOW = int(os.environ.get("RESULTDB_MAX_OVERFLOW", "20"))
+BUSY_TIMEOUT_MS = int(os.environ.get("RESULTDB_BUSY_TIMEOUT", "5000"))
+QUERY_CACHE_SIZE = 1200
+SQLITE_STATEMENT_CACHE = 512
+
+# Sync driver -> async driver used by the async engines.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+_engines: dict = {}
+_engines_lock = threading.Lock()
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _configure_sqlite(engine: Engine, read_only: bool) -> None:
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            if read_only:
+                cursor.execute("PRAGMA query_only = ON")
+            else:
+                cursor.execute("PRAGMA journal_mode = WAL")
+                cursor.execute("PRAGMA synchronous = NORMAL")
+            cursor.execute("PRAGMA foreign_keys = ON")
+        finally:
+            cursor.close()
+
+
+def build_engine(url: str, read_only: bool = False) -> Engine:
+    """Create an engine for ``url`` with the pool and pragmas described above."""
+    if _is_sqlite(url):
+        engine = create_engine(
+            url,
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_pre_ping=False,
+            query_cache_size=QUERY_CACHE_SIZE,
+            connect_args={
+                "check_same_thread": False,
+                "timeout": BUSY_TIMEOUT_MS / 1000,
+                "cached_statements": SQLITE_STATEMENT_CACHE,
+            },
+        )
+        _configure_sqlite(engine, read_only)
+        return engine
+    return create_engine(
+        url,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_pre_ping=True,
+        query_cache_size=QUERY_CACHE_SIZE,
+    )
+
+
+def get_engine() -> Engine:
+    """Return the primary engine, creating it on first use."""
+    with _engines_lock:
+        if "primary" not in _engines:
+            _engines["primary"] = build_engine(DB_URL)
+        return _engines["primary"]
+
+
+def get_read_engine() -> Engine:
+    """Return the read-replica engine, or the primary when none is configured."""
+    if READ_URL is None:
+        return get_engine()
+    with _engines_lock:
+        if "read" not in _engines:
+            _engines["read"] = build_engine(READ_URL, read_only=True)
+        return _engines["read"]
+
+
+def session() -> Session:
+    """Open a session on the primary database (use as a context manager)."""
+    return Session(get_engine())
+
+
+def read_session() -> Session:
+    """Open a session for read-only queries (replica if configured)."""
+    return Session(get_read_engine())
+
+
+def async_url(url: str) -> str:
+    """Return ``url`` with its driver swapped for the async one."""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme.split('+', 1)[0], scheme)}{sep}{rest}"
+
+
+def build_async_engine(url: str, read_only: bool = False) -> "AsyncEngine":
+    """Async counterpart of :func:`build_engine` (same pool and pragmas)."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = async_url(url)
+    if _is_sqlite(url):
+        engine = create_async_engine(
+            url,
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            query_cache_size=QUERY_CACHE_SIZE,
+            connect_args={
+                "timeout": BUSY_TIMEOUT_MS / 1000,
+                "cached_statements": SQLITE_STATEMENT_CACHE,
+            },
+        )
+        _configure_sqlite(engine.sync_engine, read_only)
+        return engine
+    return create_async_engine(
+        url,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_pre_ping=True,
+        query_cache_size=QUERY_CACHE_SIZE,
+    )
+
+
+def get_async_engine() -> "AsyncEngine":
+    with _engines_lock:
+        if "async_primary" not in _engines:
+            _engines["async_primary"] = build_async_engine(DB_URL)
+        return _engines["async_primary"]
+
+
+def get_async_read_engine() -> "AsyncEngine":
+    if READ_URL is None:
+        return get_async_engine()
+    with _engines_lock:
+        if "async_read" not in _engines:
+            _engines["async_read"] = build_async_engine(READ_URL, read_only=True)
+        return _engines["async_read"]
+
+
+def async_session() -> "AsyncSession":
+    """Open an async session on the primary database (``async with``).
+
+    Objects stay usable after commit (``expire_on_commit=False``), since an
+    async session cannot lazily reload expired attributes.
+    """
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    return AsyncSession(get_async_engine(), expire_on_commit=False)
+
+
+def async_read_session() -> "AsyncSession":
+    """Open an async session for read-only queries (replica if configured)."""
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    return AsyncSession(get_async_read_engine(), expire_on_commit=False)
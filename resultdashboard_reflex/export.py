@@ -0,0 +1,176 @@
+"""Streaming export of student results.
+
+Rows are read from the database in chunks (``yield_per``) and encoded chunk
+by chunk, so memory stays flat regardless of class size and every download
+gets its own response body instead of a shared file under ``.web/static``.
+
+Formats: ``csv``, ``csv.gz`` (gzip, streamed through ``zlib``), and, when
+pyarrow is installed, ``parquet`` and ``arrow`` (Arrow IPC stream).
+"""
+import csv
+import io
+import secrets
+import threading
+import time
+import zlib
+
+from sqlalchemy import select
+
+from resultdashboard_reflex import db
+from resultdashboard_reflex.models import Student
+
+# (CSV header, Student column)
+EXPORT_COLUMNS = (
+    ("Roll No", "roll_no"),
+    ("Name", "name"),
+    ("Bangla", "bangla_marks"),
+    ("English", "english_marks"),
+    ("Math", "math_marks"),
+    ("Science", "science_marks"),
+    ("Total", "total_marks"),
+    ("Grade", "grade"),
+)
+
+# format -> (media type, file extension)
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "csv.gz": ("application/gzip", "csv.gz"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+CHUNK_SIZE = 2000
+TOKEN_TTL = 120.0
+
+_tokens: dict = {}
+_tokens_lock = threading.Lock()
+
+
+def issue_token(value=True) -> str:
+    """Return a single-use token authorizing one download.
+
+    ``value`` is handed back by :func:`consume_token`, so a token can be
+    bound to the file it is for.
+    """
+    token = secrets.token_urlsafe(16)
+    now = time.monotonic()
+    with _tokens_lock:
+        for key in [k for k, (expires, _) in _tokens.items() if expires < now]:
+            del _tokens[key]
+        _tokens[token] = (now + TOKEN_TTL, value)
+    return token
+
+
+def consume_token(token):
+    """Return the value ``token`` was issued with, or None if it is unknown or expired."""
+    with _tokens_lock:
+        expires, value = _tokens.pop(token or "", (None, None))
+    return value if expires is not None and expires >= time.monotonic() else None
+
+
+def iter_row_chunks(chunk_size: int = CHUNK_SIZE):
+    """Yield lists of result tuples, ``chunk_size`` rows at a time."""
+    columns = [getattr(Student, field) for _, field in EXPORT_COLUMNS]
+    stmt = select(*columns).order_by(Student.roll_no).execution_options(yield_per=chunk_size)
+    with db.read_session() as session:
+        for partition in session.execute(stmt).partitions():
+            yield partition
+
+
+def stream_csv(chunk_size: int = CHUNK_SIZE):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    for rows in iter_row_chunks(chunk_size):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def stream_gzip(chunks):
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the caller."""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _arrow_schema(pa):
+    types = {"name": pa.string(), "grade": pa.string()}
+    return pa.schema([(header, types.get(field, pa.int64())) for header, field in EXPORT_COLUMNS])
+
+
+def _stream_arrow_format(open_writer, chunk_size: int):
+    import pyarrow as pa
+
+    schema = _arrow_schema(pa)
+    sink = _ChunkSink()
+    writer = open_writer(pa, sink, schema)
+    for rows in iter_row_chunks(chunk_size):
+        table = pa.Table.from_arrays(
+            [pa.array(col, type=schema.field(i).type) for i, col in enumerate(zip(*rows))],
+            schema=schema,
+        )
+        writer.write_table(table)
+        data = sink.drain()
+        if data:
+            yield data
+    writer.close()
+    yield sink.drain()
+
+
+def stream_parquet(chunk_size: int = CHUNK_SIZE):
+    def open_writer(pa, sink, schema):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(sink, schema, compression="zstd")
+
+    return _stream_arrow_format(open_writer, chunk_size)
+
+
+def stream_arrow(chunk_size: int = CHUNK_SIZE):
+    return _stream_arrow_format(lambda pa, sink, schema: pa.ipc.new_stream(sink, schema), chunk_size)
+
+
+def stream_export(fmt: str):
+    """Return a byte-chunk iterator for ``fmt``; raise ValueError if unknown."""
+    if fmt == "csv":
+        return stream_csv()
+    if fmt == "csv.gz":
+        return stream_gzip(stream_csv())
+    if fmt in ("parquet", "arrow"):
+        try:
+            import pyarrow  # noqa: F401
+        except Exception:
+            raise ValueError(f"{fmt} export requires pyarrow. Install with 'pip install pyarrow'.")
+        return stream_parquet() if fmt == "parquet" else stream_arrow()
+    raise ValueError(f"Unknown export format {fmt!r}")
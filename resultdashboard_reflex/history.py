@@ -0,0 +1,211 @@
+"""Multi-term result history.
+
+The ``student`` table always holds the exam currently being marked. Closing
+an exam copies it into ``examresult`` under a new ``exam_id`` (one
+INSERT ... SELECT) and stores the class size and average total on the
+``exam`` row, so cross-term averages read one small row per exam. Every
+``examresult`` index leads with ``exam_id``, so a lookup in one exam stays
+a single index probe as history grows.
+
+Old exams can be archived: their rows move to a compact, read-only SQLite
+file (one per exam, keyed by roll number) and are deleted from
+``examresult``. Lookups in archived exams read that file directly.
+
+Run from the project root:
+
+    python -m resultdashboard_reflex.history close --name Midterm --term T1 --year 2026
+    python -m resultdashboard_reflex.history list
+    python -m resultdashboard_reflex.history lookup EXAM_ID ROLL
+    python -m resultdashboard_reflex.history archive --before-year 2024 [--dir archive]
+"""
+import argparse
+import datetime
+import os
+import sqlite3
+import stat
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+from sqlalchemy import delete, func, literal, select
+
+from resultdashboard_reflex.cache import result_cache
+from resultdashboard_reflex.models import Exam, ExamResult, Student
+
+RESULT_COLUMNS = (
+    "roll_no", "name", "bangla_marks", "english_marks",
+    "math_marks", "science_marks", "total_marks", "grade",
+)
+
+ARCHIVE_DDL = """
+CREATE TABLE result (
+    roll_no INTEGER PRIMARY KEY,
+    name TEXT,
+    bangla_marks INTEGER,
+    english_marks INTEGER,
+    math_marks INTEGER,
+    science_marks INTEGER,
+    total_marks INTEGER,
+    grade TEXT
+) WITHOUT ROWID
+"""
+
+DEFAULT_ARCHIVE_DIR = "archive"
+
+
+def close_exam(session, name: str, term: str, year: int) -> Exam:
+    """Snapshot the current results as a closed exam and return it."""
+    exam = Exam()
+    exam.name = name
+    exam.term = term
+    exam.year = year
+    exam.closed_at = datetime.datetime.now().isoformat(timespec="seconds")
+    exam.archived = False
+    session.add(exam)
+    session.flush()
+
+    student = Student.__table__
+    history = ExamResult.__table__
+    session.execute(
+        history.insert().from_select(
+            ["exam_id", *RESULT_COLUMNS],
+            select(literal(exam.id), *[student.c[col] for col in RESULT_COLUMNS]),
+        )
+    )
+    count, average = session.execute(
+        select(func.count(), func.avg(history.c.total_marks)).where(history.c.exam_id == exam.id)
+    ).one()
+    exam.student_count = count
+    exam.average_total = round(float(average or 0), 2)
+    session.commit()
+    result_cache.invalidate(("exams",))
+    return exam
+
+
+def list_exams(session) -> list:
+    """Return closed exams (newest first) as dicts, including their averages."""
+    exams = session.query(Exam).order_by(Exam.year.desc(), Exam.term.desc(), Exam.id.desc()).all()
+    return [
+        {
+            "id": exam.id,
+            "name": exam.name,
+            "term": exam.term,
+            "year": exam.year,
+            "student_count": exam.student_count or 0,
+            "average_total": exam.average_total or 0.0,
+            "archived": bool(exam.archived),
+        }
+        for exam in exams
+    ]
+
+
+def _read_archive(path: str, roll: int):
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        row = conn.execute(
+            f"SELECT {', '.join(RESULT_COLUMNS)} FROM result WHERE roll_no = ?", (roll,)
+        ).fetchone()
+    finally:
+        conn.close()
+    return SimpleNamespace(**dict(zip(RESULT_COLUMNS, row))) if row else None
+
+
+def exam_result_for_roll(session, exam_id: int, roll: int):
+    """Return one roll's result in a closed exam, or None."""
+    exam = session.get(Exam, exam_id)
+    if exam is None:
+        return None
+    if exam.archived and exam.archive_path:
+        return _read_archive(exam.archive_path, roll)
+    return session.query(ExamResult).filter_by(exam_id=exam_id, roll_no=roll).first()
+
+
+def archive_exam(session, exam_id: int, directory: str = DEFAULT_ARCHIVE_DIR, chunk_size: int = 5000) -> str:
+    """Move one exam's rows into a read-only SQLite file; return its path."""
+    exam = session.get(Exam, exam_id)
+    if exam is None:
+        raise ValueError(f"No exam with id {exam_id}")
+    if exam.archived:
+        return exam.archive_path
+
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    path = os.path.abspath(os.path.join(directory, f"exam_{exam_id}.db"))
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    history = ExamResult.__table__
+    stmt = (
+        select(*[history.c[col] for col in RESULT_COLUMNS])
+        .where(history.c.exam_id == exam_id)
+        .execution_options(yield_per=chunk_size)
+    )
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute(ARCHIVE_DDL)
+        placeholders = ", ".join("?" for _ in RESULT_COLUMNS)
+        for rows in session.execute(stmt).partitions():
+            conn.executemany(f"INSERT INTO result VALUES ({placeholders})", [tuple(r) for r in rows])
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    os.chmod(path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+
+    session.execute(delete(history).where(history.c.exam_id == exam_id))
+    exam.archived = True
+    exam.archive_path = path
+    session.commit()
+    result_cache.invalidate(("exams",))
+    return path
+
+
+def archive_before(session, year: int, directory: str = DEFAULT_ARCHIVE_DIR) -> list:
+    """Archive every closed exam from before ``year``; return the new files."""
+    exams = session.query(Exam).filter(Exam.year < year).all()
+    return [archive_exam(session, exam.id, directory) for exam in exams if not exam.archived]
+
+
+def main(argv=None) -> int:
+    from resultdashboard_reflex import db
+
+    parser = argparse.ArgumentParser(description="Close, list, look up and archive exams.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    close_parser = sub.add_parser("close", help="snapshot the current results as a closed exam")
+    close_parser.add_argument("--name", required=True)
+    close_parser.add_argument("--term", required=True)
+    close_parser.add_argument("--year", type=int, required=True)
+    sub.add_parser("list", help="list closed exams with their class averages")
+    lookup_parser = sub.add_parser("lookup", help="show one roll's result in a closed exam")
+    lookup_parser.add_argument("exam_id", type=int)
+    lookup_parser.add_argument("roll", type=int)
+    archive_parser = sub.add_parser("archive", help="move old exams into read-only archive files")
+    archive_parser.add_argument("--before-year", type=int, required=True)
+    archive_parser.add_argument("--dir", default=DEFAULT_ARCHIVE_DIR)
+    args = parser.parse_args(argv)
+
+    with db.session() as session:
+        if args.command == "close":
+            exam = close_exam(session, args.name, args.term, args.year)
+            print(f"Closed exam {exam.id} ({exam.name} {exam.term} {exam.year}): "
+                  f"{exam.student_count} students, average total {exam.average_total}")
+        elif args.command == "list":
+            for exam in list_exams(session):
+                flag = " [archived]" if exam["archived"] else ""
+                print(f"{exam['id']:>4}  {exam['year']} {exam['term']:<6} {exam['name']:<20} "
+                      f"{exam['student_count']:>6} students  avg {exam['average_total']}{flag}")
+        elif args.command == "lookup":
+            row = exam_result_for_roll(session, args.exam_id, args.roll)
+            if row is None:
+                print("Not found.")
+                return 1
+            print(", ".join(f"{col}={getattr(row, col)}" for col in RESULT_COLUMNS))
+        else:
+            for path in archive_before(session, args.before_year, args.dir):
+                print(f"Archived to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""Bulk import of student marks from CSV or Excel (.xlsx) files.
+
+Rows are streamed from the file, validated, graded with the active grading
+policy and written in batches with multi-row INSERTs (see
+``queries.insert_students``) and one commit per batch.
+Invalid rows are skipped and reported with their line number.
+
+Run from the project root:
+
+    python -m resultdashboard_reflex.importer marks.csv [--batch-size 1000]
+"""
+import argparse
+import csv
+import io
+import sys
+import time
+from pathlib import Path
+
+from resultdashboard_reflex.cache import result_cache
+from resultdashboard_reflex.changefeed import feed
+from resultdashboard_reflex.grading import get_active_grader
+from resultdashboard_reflex.publish import retract
+from resultdashboard_reflex.models import Student
+from resultdashboard_reflex.queries import insert_students
+from resultdashboard_reflex.stats import SUBJECTS, class_stats
+from resultdashboard_reflex.subjects import write_marks_for_rolls
+
+# Accepted spellings of each column header (compared case-insensitively,
+# with spaces/dots/underscores ignored).
+HEADER_ALIASES = {
+    "roll_no": ("roll", "rollno", "rollnumber"),
+    "name": ("name", "studentname"),
+    "bangla_marks": ("bangla", "banglamarks"),
+    "english_marks": ("english", "englishmarks"),
+    "math_marks": ("math", "maths", "mathmarks"),
+    "science_marks": ("science", "sciencemarks"),
+}
+
+MAX_MARK = 100
+MAX_REPORTED_ERRORS = 1000
+
+
+def _normalize_header(header) -> str:
+    text = str(header or "").strip().lower()
+    for ch in " ._-":
+        text = text.replace(ch, "")
+    return text
+
+
+def _map_headers(headers, required=None) -> dict:
+    """Map column positions to Student fields; raise if a ``required`` column is missing.
+
+    Every column is required by default.
+    """
+    lookup = {alias: field for field, aliases in HEADER_ALIASES.items() for alias in aliases}
+    mapping = {}
+    for idx, header in enumerate(headers):
+        field = lookup.get(_normalize_header(header))
+        if field and field not in mapping.values():
+            mapping[idx] = field
+    missing = [field for field in (required or HEADER_ALIASES) if field not in mapping.values()]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    return mapping
+
+
+def _iter_csv(stream, required=None):
+    reader = csv.reader(stream)
+    try:
+        headers = next(reader)
+    except StopIteration:
+        return
+    mapping = _map_headers(headers, required)
+    for line_no, values in enumerate(reader, start=2):
+        if not any(v.strip() for v in values):
+            continue
+        yield line_no, {field: (values[idx] if idx < len(values) else "") for idx, field in mapping.items()}
+
+
+def _iter_xlsx(path, required=None):
+    try:
+        from openpyxl import load_workbook
+    except Exception:
+        raise RuntimeError("Reading .xlsx files requires openpyxl. Install with 'pip install openpyxl'.")
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = next(rows, None)
+        if headers is None:
+            return
+        mapping = _map_headers(headers, required)
+        for line_no, values in enumerate(rows, start=2):
+            if not any(v not in (None, "") for v in values):
+                continue
+            yield line_no, {field: (values[idx] if idx < len(values) else None) for idx, field in mapping.items()}
+    finally:
+        workbook.close()
+
+
+def iter_records(path, required=None):
+    """Yield ``(line_no, raw_record)`` pairs from a .csv or .xlsx file.
+
+    ``required`` lists the fields whose columns must be present (default all).
+    """
+    path = Path(path)
+    if path.suffix.lower() in (".xlsx", ".xlsm"):
+        yield from _iter_xlsx(path, required)
+    else:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            yield from _iter_csv(f, required)
+
+
+def iter_csv_text(text: str, required=None):
+    """Yield ``(line_no, raw_record)`` pairs from CSV text."""
+    yield from _iter_csv(io.StringIO(text, newline=""), required)
+
+
+def parse_mark(raw, label: str) -> int:
+    """Parse one subject mark: a whole number from 0 to MAX_MARK ("85" or "85.0").
+
+    Raises ValueError for anything else, including fractions (never
+    truncated) and values too large for an int such as "1e400" or "inf".
+    """
+    try:
+        value = float(str(raw).strip())
+        mark = int(value)
+    except (ValueError, OverflowError):
+        raise ValueError(f"invalid {label} marks {raw!r}")
+    if mark != value:
+        raise ValueError(f"{label} marks {raw!r} is not a whole number")
+    if not 0 <= mark <= MAX_MARK:
+        raise ValueError(f"{label} marks {mark} out of range 0-{MAX_MARK}")
+    return mark
+
+
+def validate_record(record: dict) -> dict:
+    """Return a Student row dict for ``record`` or raise ValueError."""
+    try:
+        roll = int(str(record.get("roll_no", "")).strip())
+    except ValueError:
+        raise ValueError(f"invalid roll number {record.get('roll_no')!r}")
+    if roll <= 0:
+        raise ValueError(f"invalid roll number {roll}")
+    name = str(record.get("name") or "").strip()
+    if not name:
+        raise ValueError("name is empty")
+
+    row = {"roll_no": roll, "name": name}
+    for label, field in SUBJECTS:
+        row[field] = parse_mark(record.get(field), label)
+    grader = get_active_grader()
+    row["total_marks"] = grader.total(row)
+    row["grade"] = grader.grade(row["total_marks"], row)
+    return row
+
+
+def _write_batch(session, batch, errors) -> int:
+    """Insert ``batch`` (list of (line_no, row)); return rows written."""
+    rolls = [row["roll_no"] for _, row in batch]
+    existing = {
+        roll for (roll,) in session.query(Student.roll_no).filter(Student.roll_no.in_(rolls)).all()
+    }
+    rows = []
+    for line_no, row in batch:
+        if row["roll_no"] in existing:
+            errors.append((line_no, f"roll number {row['roll_no']} already exists"))
+        else:
+            rows.append(row)
+    if rows:
+        insert_students(session, rows)
+        write_marks_for_rolls(session, [row["roll_no"] for row in rows])
+        session.commit()
+        for row in rows:
+            class_stats.add(row)
+        # Row views for open dashboards; ids are not known after a bulk insert,
+        # so results pages reload while leaderboards are patched in place.
+        feed.publish_many("upsert", (
+            {"roll_no": row["roll_no"], "name": row["name"], "total_marks": row["total_marks"], "grade": row["grade"]}
+            for row in rows
+        ))
+    return len(rows)
+
+
+def import_records(records, session, batch_size: int = 1000, progress=None) -> dict:
+    """Validate and insert ``records`` in batches.
+
+    ``records`` yields ``(line_no, raw_record)`` pairs. Returns a report with
+    the number of rows inserted, the per-row errors and the throughput.
+    """
+    start = time.perf_counter()
+    errors = []
+    seen = set()
+    batch = []
+    inserted = 0
+    processed = 0
+    try:
+        for line_no, record in records:
+            processed += 1
+            try:
+                row = validate_record(record)
+            except ValueError as e:
+                errors.append((line_no, str(e)))
+                continue
+            if row["roll_no"] in seen:
+                errors.append((line_no, f"duplicate roll number {row['roll_no']} in file"))
+                continue
+            seen.add(row["roll_no"])
+            batch.append((line_no, row))
+            if len(batch) >= batch_size:
+                inserted += _write_batch(session, batch, errors)
+                batch = []
+                if progress is not None:
+                    progress(processed, inserted)
+        if batch:
+            inserted += _write_batch(session, batch, errors)
+    finally:
+        if inserted:
+            result_cache.clear()
+            retract()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "processed": processed,
+        "inserted": inserted,
+        "errors": errors[:MAX_REPORTED_ERRORS],
+        "error_count": len(errors),
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(inserted / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def format_report(report: dict) -> str:
+    return (
+        f"Imported {report['inserted']} of {report['processed']} rows in "
+        f"{report['seconds']}s ({report['rows_per_sec']} rows/sec), "
+        f"{report['error_count']} error(s)."
+    )
+
+
+def main(argv=None) -> int:
+    from resultdashboard_reflex import db
+
+    parser = argparse.ArgumentParser(description="Bulk import student marks from a CSV or XLSX file.")
+    parser.add_argument("path", help="CSV or XLSX file with roll, name, bangla, english, math and science columns")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    def progress(processed, inserted):
+        print(f"  {processed} rows read, {inserted} inserted", file=sys.stderr)
+
+    with db.session() as session:
+        report = import_records(iter_records(args.path), session, args.batch_size, progress)
+    for line_no, message in report["errors"]:
+        print(f"line {line_no}: {message}")
+    print(format_report(report))
+    return 1 if report["error_count"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
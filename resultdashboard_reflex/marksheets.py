@@ -0,0 +1,373 @@
+"""Printable report cards (marksheets) for the whole class.
+
+Each student gets a one-page A4 PDF with their name, roll, the four subject
+marks, total, grade and class rank. Pages are rendered on a process pool in
+batches, in roll order, and streamed into either
+
+* a zip with one ``marksheet_<roll>.pdf`` per student, or
+* a single merged PDF with one page per student,
+
+so memory stays flat whatever the class size. The PDFs are written by the
+small writer below (Helvetica text and ruled lines, Flate-compressed
+content), so no PDF library is needed.
+
+Run from the project root:
+
+    python -m resultdashboard_reflex.marksheets [--out marksheets.zip] [--format zip|pdf] [--workers 4]
+
+Teachers can build the same file from the dashboard; it is written to
+``RESULT_MARKSHEET_DIR`` and downloaded through ``/api/marksheets``.
+"""
+import argparse
+import datetime
+import multiprocessing
+import os
+import sys
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from resultdashboard_reflex.stats import SUBJECTS
+
+MARKSHEET_DIR = os.environ.get("RESULT_MARKSHEET_DIR", "marksheets")
+DEFAULT_TITLE = os.environ.get("RESULT_MARKSHEET_TITLE", "Student Result Report Card")
+FORMATS = {"zip": "application/zip", "pdf": "application/pdf"}
+# Students rendered per pool task: large enough to amortize pickling,
+# small enough that progress moves and memory stays flat.
+BATCH_SIZE = 250
+KEEP_BUILDS = 2
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 in points
+LEFT, RIGHT = 56, 539
+
+
+def _text(value) -> bytes:
+    """A PDF literal string; characters outside Latin-1 become '?'."""
+    raw = str(value).encode("latin-1", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _show(font: bytes, size: int, x: float, y: float, value) -> bytes:
+    return b"BT /%s %d Tf %d %d Td %s Tj ET\n" % (font, size, x, y, _text(value))
+
+
+def _rule(y: float, width: float = 0.5) -> bytes:
+    return b"%.1f w %d %d m %d %d l S\n" % (width, LEFT, y, RIGHT, y)
+
+
+def render_page(row: tuple, class_size: int, title: str, generated: str) -> bytes:
+    """Flate-compressed content stream of one student's marksheet.
+
+    ``row`` is ``(roll_no, name, <subject marks...>, total_marks, grade, rank)``
+    with the subjects in ``stats.SUBJECTS`` order.
+    """
+    roll, name = row[0], row[1]
+    marks = row[2:2 + len(SUBJECTS)]
+    total, grade, rank = row[2 + len(SUBJECTS):]
+    parts = [
+        _show(b"F2", 20, LEFT, 780, title),
+        _rule(768, 1.5),
+        _show(b"F1", 12, LEFT, 736, "Name:"),
+        _show(b"F2", 12, 140, 736, name or ""),
+        _show(b"F1", 12, LEFT, 716, "Roll No:"),
+        _show(b"F2", 12, 140, 716, roll),
+        _show(b"F1", 12, LEFT, 696, "Class rank:"),
+        _show(b"F2", 12, 140, 696, f"{rank} of {class_size}" if rank else "-"),
+        _show(b"F2", 12, LEFT, 652, "Subject"),
+        _show(b"F2", 12, 420, 652, "Marks (of 100)"),
+        _rule(644, 1),
+    ]
+    y = 620
+    for (label, _), mark in zip(SUBJECTS, marks):
+        parts.append(_show(b"F1", 12, LEFT, y, label))
+        parts.append(_show(b"F1", 12, 420, y, "" if mark is None else mark))
+        parts.append(_rule(y - 8))
+        y -= 26
+    parts += [
+        _show(b"F2", 12, LEFT, y, "Total"),
+        _show(b"F2", 12, 420, y, f"{total if total is not None else '-'} / {100 * len(SUBJECTS)}"),
+        _rule(y - 8, 1),
+        _show(b"F2", 14, LEFT, y - 34, "Grade:"),
+        _show(b"F2", 14, 140, y - 34, grade or "-"),
+        _show(b"F1", 9, LEFT, 60, f"Generated {generated}"),
+    ]
+    return zlib.compress(b"".join(parts), 6)
+
+
+def _render_batch(rows: list, class_size: int, title: str, generated: str) -> list:
+    """Pool task: render a batch of marksheets."""
+    return [render_page(row, class_size, title, generated) for row in rows]
+
+
+class PdfWriter:
+    """Streaming writer for a PDF of pre-rendered pages.
+
+    ``begin``, ``page`` and ``end`` each return the bytes to append, so a
+    document of any length is produced without holding it in memory. Only
+    the two standard Helvetica fonts are used, so nothing is embedded.
+    """
+
+    def __init__(self):
+        self._offsets = {}
+        self._position = 0
+        self._next = 1
+        self._kids = []
+
+    def _number(self) -> int:
+        number = self._next
+        self._next += 1
+        return number
+
+    def _object(self, number: int, body: bytes) -> bytes:
+        self._offsets[number] = self._position
+        data = b"%d 0 obj\n%s\nendobj\n" % (number, body)
+        self._position += len(data)
+        return data
+
+    def begin(self) -> bytes:
+        header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+        self._position = len(header)
+        self._regular, self._bold, self._pages = self._number(), self._number(), self._number()
+        font = b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>"
+        return (
+            header
+            + self._object(self._regular, font % b"Helvetica")
+            + self._object(self._bold, font % b"Helvetica-Bold")
+        )
+
+    def page(self, content: bytes) -> bytes:
+        """Append one page; ``content`` is a Flate-compressed content stream."""
+        stream, page = self._number(), self._number()
+        self._kids.append(page)
+        return self._object(
+            stream, b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(content), content)
+        ) + self._object(
+            page,
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> /Contents %d 0 R >>"
+            % (self._pages, PAGE_WIDTH, PAGE_HEIGHT, self._regular, self._bold, stream),
+        )
+
+    def end(self) -> bytes:
+        kids = b" ".join(b"%d 0 R" % kid for kid in self._kids)
+        data = self._object(self._pages, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._kids)))
+        catalog = self._number()
+        data += self._object(catalog, b"<< /Type /Catalog /Pages %d 0 R >>" % self._pages)
+        xref = [b"xref\n0 %d\n0000000000 65535 f \n" % self._next]
+        xref += [b"%010d 00000 n \n" % self._offsets[number] for number in range(1, self._next)]
+        xref.append(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (self._next, catalog, self._position))
+        return data + b"".join(xref)
+
+
+def single_page_pdf(content: bytes) -> bytes:
+    writer = PdfWriter()
+    return writer.begin() + writer.page(content) + writer.end()
+
+
+def class_ranks(session):
+    """Return ``({total_marks: rank}, class_size)``; equal totals share a rank."""
+    from sqlalchemy import func, select
+
+    from resultdashboard_reflex.models import Student
+
+    ranks = {}
+    position = 1
+    rows = session.execute(
+        select(Student.total_marks, func.count())
+        .where(Student.total_marks.is_not(None))
+        .group_by(Student.total_marks)
+        .order_by(Student.total_marks.desc())
+    ).all()
+    for total, count in rows:
+        ranks[total] = position
+        position += count
+    class_size = session.execute(select(func.count(Student.id))).scalar() or 0
+    return ranks, class_size
+
+
+def iter_student_batches(session, batch_size: int = BATCH_SIZE):
+    """Yield lists of marksheet row tuples (without rank) in roll order."""
+    from sqlalchemy import select
+
+    from resultdashboard_reflex.models import Student
+
+    columns = [Student.roll_no, Student.name] + [getattr(Student, field) for _, field in SUBJECTS]
+    columns += [Student.total_marks, Student.grade]
+    stmt = select(*columns).order_by(Student.roll_no).execution_options(yield_per=batch_size)
+    for partition in session.execute(stmt).partitions():
+        yield [tuple(row) for row in partition]
+
+
+def iter_pages(session, workers: int = None, batch_size: int = BATCH_SIZE, title: str = DEFAULT_TITLE, progress=None):
+    """Yield ``(roll_no, content)`` for every student, in roll order.
+
+    Batches are rendered on ``workers`` processes (default: one per CPU)
+    with at most two batches per worker in flight. With one worker, or a
+    class that fits in one batch, pages are rendered in this process, since
+    starting the pool would cost more than it saves. ``progress(done,
+    total)`` is called after each batch.
+    """
+    ranks, class_size = class_ranks(session)
+    generated = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+    workers = workers or os.cpu_count() or 1
+    done = 0
+
+    def ranked(batch):
+        return [row + (ranks.get(row[-2]),) for row in batch]
+
+    if workers == 1 or class_size <= batch_size:
+        for batch in iter_student_batches(session, batch_size):
+            batch = ranked(batch)
+            for row, content in zip(batch, _render_batch(batch, class_size, title, generated)):
+                yield row[0], content
+            done += len(batch)
+            if progress is not None:
+                progress(done, class_size)
+        return
+
+    # spawn, not fork: the app server is multi-threaded.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending = deque()
+
+        def drain():
+            nonlocal done
+            batch, future = pending.popleft()
+            for row, content in zip(batch, future.result()):
+                yield row[0], content
+            done += len(batch)
+            if progress is not None:
+                progress(done, class_size)
+
+        for batch in iter_student_batches(session, batch_size):
+            batch = ranked(batch)
+            pending.append((batch, pool.submit(_render_batch, batch, class_size, title, generated)))
+            if len(pending) >= 2 * workers:
+                yield from drain()
+        while pending:
+            yield from drain()
+
+
+def stream_pdf(pages):
+    """One merged PDF, one page per student."""
+    writer = PdfWriter()
+    yield writer.begin()
+    for _, content in pages:
+        yield writer.page(content)
+    yield writer.end()
+
+
+def stream_zip(pages):
+    """A zip of per-student PDFs (stored: the page streams are already compressed)."""
+    from resultdashboard_reflex.export import _ChunkSink
+
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        for roll, content in pages:
+            archive.writestr(f"marksheet_{roll}.pdf", single_page_pdf(content))
+            data = sink.drain()
+            if data:
+                yield data
+    yield sink.drain()
+
+
+def write(session, path: str, fmt: str = "zip", workers: int = None, title: str = DEFAULT_TITLE,
+          batch_size: int = BATCH_SIZE, progress=None) -> dict:
+    """Write the class's marksheets to ``path`` (atomically); return a report."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown marksheet format {fmt!r}; use zip or pdf.")
+    start = time.perf_counter()
+    count = 0
+
+    def counted():
+        nonlocal count
+        for page in iter_pages(session, workers, batch_size, title, progress):
+            count += 1
+            yield page
+
+    stream = stream_zip if fmt == "zip" else stream_pdf
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as out:
+            for chunk in stream(counted()):
+                out.write(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    elapsed = time.perf_counter() - start
+    return {
+        "path": path,
+        "format": fmt,
+        "count": count,
+        "bytes": os.path.getsize(path),
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(count / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def _builds(directory: str) -> list:
+    """Names of the finished builds in ``directory``, oldest first.
+
+    In-progress ``.tmp`` files (another build being written) are left out.
+    """
+    return sorted(
+        entry for entry in os.listdir(directory)
+        if entry.startswith("marksheets-") and entry.rpartition(".")[2] in FORMATS
+    )
+
+
+def build(session, fmt: str = "zip", directory: str = MARKSHEET_DIR, **options) -> dict:
+    """Write a new timestamped build into ``directory`` and prune old ones."""
+    os.makedirs(directory, exist_ok=True)
+    name = f"marksheets-{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 1_000_000:06d}.{fmt}"
+    report = write(session, os.path.join(directory, name), fmt, **options)
+    for old in _builds(directory)[:-KEEP_BUILDS]:
+        try:
+            os.remove(os.path.join(directory, old))
+        except FileNotFoundError:
+            pass
+    return report
+
+
+def latest(directory: str = MARKSHEET_DIR):
+    """Path of the newest finished build in ``directory``, or None."""
+    try:
+        builds = _builds(directory)
+    except FileNotFoundError:
+        return None
+    return os.path.join(directory, builds[-1]) if builds else None
+
+
+def format_report(report: dict) -> str:
+    return (
+        f"Generated {report['count']} marksheets ({report['format']}, {report['bytes'] / 1e6:.1f} MB) "
+        f"in {report['seconds']}s ({report['pages_per_sec']} per sec)."
+    )
+
+
+def main(argv=None) -> int:
+    from resultdashboard_reflex import db
+
+    parser = argparse.ArgumentParser(description="Generate report-card PDFs for every student.")
+    parser.add_argument("--out", default="marksheets.zip")
+    parser.add_argument("--format", choices=sorted(FORMATS), help="default: from the --out extension")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--title", default=DEFAULT_TITLE)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("pdf" if args.out.lower().endswith(".pdf") else "zip")
+
+    def progress(done, total):
+        print(f"  {done}/{total}", file=sys.stderr)
+
+    with db.read_session() as session:
+        report = write(session, args.out, fmt, args.workers, args.title, args.batch_size, progress)
+    print(f"{format_report(report)} -> {report['path']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""Per-handler latency, database and state-delta instrumentation.
+
+Wrap an event handler with :func:`instrumented` (below ``@rx.event``)::
+
+    @rx.event
+    @instrumented
+    async def search_student_result(self): ...
+
+Each call records its latency in a histogram, the number and total time of
+SQL statements it ran, the JSON size of the state delta it produced and
+whether it raised. Statements are attributed to the running handler through
+a context variable, so queries issued from async sessions and from worker
+threads started with ``asyncio.to_thread`` are counted too. Handlers that
+catch an error and show an alert call :func:`record_error` so the error is
+still counted.
+
+:func:`render_prometheus` formats everything in the Prometheus text format
+for the ``/metrics`` route; :func:`handler_summary` feeds the teacher's
+diagnostics page. Metrics are kept per process.
+"""
+import bisect
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds (seconds) of the latency histogram buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Measuring the delta serializes it once more; set to 0 to skip.
+MEASURE_DELTA = os.environ.get("RESULT_METRICS_DELTA", "1") != "0"
+MAX_RECENT_ERRORS = 50
+
+_current = contextvars.ContextVar("resultdashboard_handler_call", default=None)
+
+
+class _HandlerStats:
+    __slots__ = ("calls", "errors", "buckets", "latency_sum", "queries", "query_seconds", "delta_bytes", "delta_max")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.delta_bytes = 0
+        self.delta_max = 0
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile: the upper bound of the bucket holding it."""
+        if not self.calls:
+            return 0.0
+        rank = q * self.calls
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), self.buckets):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """Thread-safe store of per-handler statistics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers: dict = {}
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.recent_errors = deque(maxlen=MAX_RECENT_ERRORS)
+
+    def _stats(self, name: str) -> _HandlerStats:
+        stats = self._handlers.get(name)
+        if stats is None:
+            stats = self._handlers[name] = _HandlerStats()
+        return stats
+
+    def record_call(self, name: str, seconds: float, call: dict, delta_bytes, failed: bool) -> None:
+        with self._lock:
+            stats = self._stats(name)
+            stats.calls += 1
+            stats.latency_sum += seconds
+            stats.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            stats.queries += call["queries"]
+            stats.query_seconds += call["query_seconds"]
+            if failed:
+                stats.errors += 1
+            if delta_bytes is not None:
+                stats.delta_bytes += delta_bytes
+                stats.delta_max = max(stats.delta_max, delta_bytes)
+
+    def record_query(self, seconds: float) -> None:
+        with self._lock:
+            self.queries += 1
+            self.query_seconds += seconds
+
+    def record_error(self, name: str, error: BaseException, count: bool = True) -> None:
+        with self._lock:
+            if count:
+                self._stats(name).errors += 1
+            self.recent_errors.appendleft(
+                (time.strftime("%Y-%m-%d %H:%M:%S"), name, f"{type(error).__name__}: {str(error).splitlines()[0] if str(error) else ''}")
+            )
+
+    def snapshot(self) -> dict:
+        """Return a copy of the per-handler stats, keyed by handler name."""
+        with self._lock:
+            copies = {}
+            for name, stats in self._handlers.items():
+                copy = _HandlerStats()
+                for slot in _HandlerStats.__slots__:
+                    value = getattr(stats, slot)
+                    setattr(copy, slot, list(value) if isinstance(value, list) else value)
+                copies[name] = copy
+            return copies
+
+    def reset(self) -> None:
+        with self._lock:
+            self._handlers.clear()
+            self.queries = 0
+            self.query_seconds = 0.0
+            self.recent_errors.clear()
+
+
+registry = MetricsRegistry()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_metrics_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("_metrics_start")
+    if not starts:
+        return
+    seconds = time.perf_counter() - starts.pop()
+    registry.record_query(seconds)
+    call = _current.get()
+    if call is not None:
+        call["queries"] += 1
+        call["query_seconds"] += seconds
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    starts = context.connection.info.get("_metrics_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def _delta_size(state):
+    """JSON size of the pending state delta, or None if it cannot be read."""
+    if not MEASURE_DELTA:
+        return None
+    try:
+        return len(json.dumps(state.get_delta(), default=str))
+    except Exception:
+        # Background tasks hold a state proxy outside ``async with self``.
+        return None
+
+
+def _finish(name: str, state, start: float, call: dict, failed: bool) -> None:
+    registry.record_call(name, time.perf_counter() - start, call, None if failed else _delta_size(state), failed)
+
+
+def instrumented(fn):
+    """Record latency, queries and delta size for an event handler."""
+    name = fn.__name__
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            call = {"name": name, "queries": 0, "query_seconds": 0.0}
+            token = _current.set(call)
+            start = time.perf_counter()
+            failed = False
+            try:
+                return await fn(self, *args, **kwargs)
+            except Exception as e:
+                failed = True
+                registry.record_error(name, e, count=False)
+                raise
+            finally:
+                _current.reset(token)
+                _finish(name, self, start, call, failed)
+        return wrapper
+
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        call = {"name": name, "queries": 0, "query_seconds": 0.0}
+        token = _current.set(call)
+        start = time.perf_counter()
+        failed = False
+        try:
+            return fn(self, *args, **kwargs)
+        except Exception as e:
+            failed = True
+            registry.record_error(name, e, count=False)
+            raise
+        finally:
+            _current.reset(token)
+            _finish(name, self, start, call, failed)
+    return wrapper
+
+
+def record_error(error: BaseException) -> None:
+    """Count an error a handler caught (e.g. before showing an alert)."""
+    call = _current.get()
+    registry.record_error(call["name"] if call else "-", error)
+
+
+def handler_summary() -> list:
+    """Rows for the diagnostics page, slowest (p95) first."""
+    rows = []
+    for name, stats in registry.snapshot().items():
+        calls = stats.calls or 1
+        rows.append({
+            "handler": name,
+            "calls": str(stats.calls),
+            "errors": str(stats.errors),
+            "avg_ms": f"{stats.latency_sum / calls * 1000:.1f}",
+            "p95_ms": f"<= {stats.quantile(0.95) * 1000:g}",
+            "queries": f"{stats.queries / calls:.1f}",
+            "query_ms": f"{stats.query_seconds / calls * 1000:.1f}",
+            "delta_bytes": f"{stats.delta_bytes // calls} (max {stats.delta_max})",
+            "_p95": stats.quantile(0.95),
+        })
+    rows.sort(key=lambda row: row.pop("_p95"), reverse=True)
+    return rows
+
+
+def recent_errors() -> list:
+    return [f"{when} {name}: {message}" for when, name, message in list(registry.recent_errors)]
+
+
+def _labels(**labels) -> str:
+    # Label values are handler names and bucket bounds: nothing to escape.
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+def render_prometheus() -> str:
+    """Return all metrics in the Prometheus text exposition format."""
+    from resultdashboard_reflex.cache import result_cache
+    from resultdashboard_reflex.changefeed import feed
+    from resultdashboard_reflex.throttle import lookup_limiter
+
+    snapshot = registry.snapshot()
+    lines = [
+        "# HELP resultdashboard_handler_latency_seconds Event handler latency.",
+        "# TYPE resultdashboard_handler_latency_seconds histogram",
+    ]
+    for name, stats in sorted(snapshot.items()):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), stats.buckets):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            lines.append(f"resultdashboard_handler_latency_seconds_bucket{_labels(handler=name, le=le)} {cumulative}")
+        lines.append(f"resultdashboard_handler_latency_seconds_sum{_labels(handler=name)} {stats.latency_sum:.6f}")
+        lines.append(f"resultdashboard_handler_latency_seconds_count{_labels(handler=name)} {stats.calls}")
+
+    per_handler = (
+        ("handler_errors_total", "counter", "Errors raised or caught in event handlers.", "errors"),
+        ("handler_db_queries_total", "counter", "SQL statements run by event handlers.", "queries"),
+        ("handler_db_seconds_total", "counter", "Time spent in SQL statements by event handlers.", "query_seconds"),
+        ("handler_delta_bytes_total", "counter", "JSON bytes of state deltas produced by event handlers.", "delta_bytes"),
+    )
+    for metric, kind, help_text, attr in per_handler:
+        lines.append(f"# HELP resultdashboard_{metric} {help_text}")
+        lines.append(f"# TYPE resultdashboard_{metric} {kind}")
+        for name, stats in sorted(snapshot.items()):
+            lines.append(f"resultdashboard_{metric}{_labels(handler=name)} {getattr(stats, attr):g}")
+
+    cache = result_cache.stats()
+    limits = lookup_limiter.stats()
+    changes = feed.stats()
+    totals = (
+        ("db_queries_total", "SQL statements run by this process.", registry.queries),
+        ("db_seconds_total", "Time spent in SQL statements by this process.", round(registry.query_seconds, 6)),
+        ("cache_hits_total", "Result cache hits.", cache["hits"]),
+        ("cache_misses_total", "Result cache misses.", cache["misses"]),
+        ("cache_coalesced_total", "Cache misses merged into an in-flight load.", cache["coalesced"]),
+        ("lookups_shed_total", "Result lookups rejected by the rate limiter.", limits["shed"]),
+        ("feed_changes_total", "Row changes published to live dashboards.", changes["published"]),
+        ("feed_resets_total", "Changes that made live dashboards reload.", changes["resets"]),
+    )
+    for metric, help_text, value in totals:
+        lines.append(f"# HELP resultdashboard_{metric} {help_text}")
+        lines.append(f"# TYPE resultdashboard_{metric} counter")
+        lines.append(f"resultdashboard_{metric} {value}")
+    lines.append("# HELP resultdashboard_cache_entries Entries in the result cache.")
+    lines.append("# TYPE resultdashboard_cache_entries gauge")
+    lines.append(f"resultdashboard_cache_entries {cache['entries']}")
+    lines.append("# HELP resultdashboard_feed_watchers Live dashboards waiting on the change feed.")
+    lines.append("# TYPE resultdashboard_feed_watchers gauge")
+    lines.append(f"resultdashboard_feed_watchers {changes['watchers']}")
+    return "\n".join(lines) + "\n"
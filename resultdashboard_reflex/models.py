@@ -0,0 +1,136 @@
+"""Database tables of the result dashboard.
+
+Kept apart from the app module so scripts that only need the schema
+(create_db.py, the import/export/publish CLIs, Alembic) can import the tables
+without building the app's state and pages. The classes still derive from
+``rx.Model``; importing this module loads Reflex's model layer and SQLModel,
+but not its state, components or server.
+"""
+from typing import Optional
+
+import reflex as rx
+from sqlalchemy import ForeignKeyConstraint, Index
+
+from resultdashboard_reflex import search
+
+
+# --- Database Model (SQLite) ---
+class Student(rx.Model, table=True):
+    """Represents a student's academic record."""
+    # Use Optional[...] annotations with None defaults so SQLModel
+    # (and SQLAlchemy) can infer column types at runtime. This avoids
+    # constructing Field() instances that the SQLModel type inference
+    # in this environment had trouble matching.
+    roll_no: Optional[int] = None
+    name: Optional[str] = None
+    bangla_marks: Optional[int] = None
+    english_marks: Optional[int] = None
+    math_marks: Optional[int] = None
+    science_marks: Optional[int] = None
+    total_marks: Optional[int] = None
+    grade: Optional[str] = None
+
+    # Declared here rather than via Field(index=True) for the same reason
+    # as above. The unique roll index backs the single-row result lookup;
+    # the total_marks index serves top-N and rank queries.
+    __table_args__ = (
+        Index("ix_student_roll_no", "roll_no", unique=True),
+        Index("ix_student_total_marks", "total_marks"),
+    )
+
+
+# The FTS5 name index and its sync triggers (see search.py) are created
+# with the table on SQLite.
+search.install(Student.__table__)
+
+
+class Subject(rx.Model, table=True):
+    """A subject on the marksheet. `legacy_column` names the matching
+    Student column for the four original subjects."""
+    name: Optional[str] = None
+    position: Optional[int] = None
+    legacy_column: Optional[str] = None
+
+    __table_args__ = (
+        Index("ix_subject_name", "name", unique=True),
+    )
+
+
+class Mark(rx.Model, table=True):
+    """One student's marks in one subject."""
+    student_id: Optional[int] = None
+    subject_id: Optional[int] = None
+    marks: Optional[int] = None
+
+    # (subject_id, marks) serves per-subject GROUP BY and topper queries.
+    __table_args__ = (
+        ForeignKeyConstraint(["student_id"], ["student.id"], ondelete="CASCADE"),
+        ForeignKeyConstraint(["subject_id"], ["subject.id"]),
+        Index("ix_mark_student_subject", "student_id", "subject_id", unique=True),
+        Index("ix_mark_subject_marks", "subject_id", "marks"),
+    )
+
+
+class Exam(rx.Model, table=True):
+    """A closed exam/term whose results were copied into `ExamResult`.
+
+    `student_count` and `average_total` are computed when the exam is
+    closed so cross-term averages never scan result rows. Archived exams
+    have their rows moved to the read-only SQLite file at `archive_path`.
+    """
+    name: Optional[str] = None
+    term: Optional[str] = None
+    year: Optional[int] = None
+    closed_at: Optional[str] = None
+    student_count: Optional[int] = None
+    average_total: Optional[float] = None
+    archived: Optional[bool] = None
+    archive_path: Optional[str] = None
+
+    __table_args__ = (
+        Index("ix_exam_year_term", "year", "term"),
+    )
+
+
+class ExamResult(rx.Model, table=True):
+    """A student's result in a closed exam (history partitioned by exam_id)."""
+    exam_id: Optional[int] = None
+    roll_no: Optional[int] = None
+    name: Optional[str] = None
+    bangla_marks: Optional[int] = None
+    english_marks: Optional[int] = None
+    math_marks: Optional[int] = None
+    science_marks: Optional[int] = None
+    total_marks: Optional[int] = None
+    grade: Optional[str] = None
+
+    # exam_id leads every index so each exam's rows form one contiguous
+    # index range however many years of history accumulate.
+    __table_args__ = (
+        ForeignKeyConstraint(["exam_id"], ["exam.id"]),
+        Index("ix_examresult_exam_roll", "exam_id", "roll_no", unique=True),
+        Index("ix_examresult_exam_total", "exam_id", "total_marks"),
+    )
+
+
+class TimelineEvent(rx.Model, table=True):
+    """An exam or homework notice on the shared timeline (see timeline.py)."""
+    title: Optional[str] = None
+    # ISO "YYYY-MM-DD", so string order is date order.
+    event_date: Optional[str] = None
+    event_type: Optional[str] = None
+    created_at: Optional[str] = None
+
+    # (event_date, id) is the keyset for upcoming/ranged pages; the type
+    # index serves pages filtered to one kind of event.
+    __table_args__ = (
+        Index("ix_timelineevent_date", "event_date", "id"),
+        Index("ix_timelineevent_type_date", "event_type", "event_date"),
+    )
+
+
+class GradingPolicy(rx.Model, table=True):
+    """A grading scale; `config` holds the policy JSON (see grading.py)."""
+    name: Optional[str] = None
+    active: Optional[bool] = None
+    config: Optional[str] = None
@@ -0,0 +1,313 @@
+"""Published result snapshots for results day.
+
+Publishing writes every current result into plain static files:
+
+    <dir>/manifest.json        {"build", "published_at", "count", "shard_size"}
+    <dir>/<build>/<shard>.json {"<roll>": {name, roll, bangla, ..., grade, grade_point}}
+    <dir>/index.html           a self-contained lookup page
+
+A roll lives in shard ``roll // shard_size``, so a lookup reads one small
+file. Each publish writes a new ``<build>`` directory and then swaps the
+manifest atomically, so shard URLs never change content and can be cached
+forever; only ``manifest.json`` must be revalidated. The directory is mounted
+at ``/results`` by the API app, and can equally be served by any static file
+server or CDN on results day without the app running at all.
+
+While a snapshot is live, ``search_student_result`` answers current-result
+lookups from it with no database query. Any write to the results (add,
+delete, import, regrade) calls :func:`retract`, which removes the manifest,
+so lookups fall back to the database until the results are published again.
+``retract`` also rewrites ``<dir>/generation``; a publish notes it before
+reading the results and discards its build if it changed by the time the
+manifest would be swapped, so a write made during a publish can never be
+hidden behind a snapshot read before it.
+
+Run from the project root:
+
+    python -m resultdashboard_reflex.publish [--dir published] [--shard-size 1000]
+    python -m resultdashboard_reflex.publish --retract
+"""
+import argparse
+import datetime
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+PUBLISH_DIR = os.environ.get("RESULT_PUBLISH_DIR", "published")
+SHARD_SIZE = 1000
+MANIFEST = "manifest.json"
+GENERATION = "generation"
+# Builds kept on disk: the live one and the one before it, for clients
+# that fetched the old manifest just before a republish.
+KEEP_BUILDS = 2
+
+LOOKUP_PAGE = """<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Student Results</title>
+<style>
+body { font-family: Arial, sans-serif; background: #0a0f1f; color: #e7eaf4; max-width: 640px; margin: 40px auto; padding: 0 16px; }
+input, button { font-size: 16px; padding: 8px 12px; border-radius: 8px; border: 1px solid #445; }
+button { background: #7c5cff; color: white; border: none; cursor: pointer; }
+table { margin-top: 24px; border-collapse: collapse; width: 100%; }
+td { padding: 8px; border-bottom: 1px solid rgba(255,255,255,0.1); }
+</style>
+</head>
+<body>
+<h1>Student Results</h1>
+<form id="lookup">
+  <input id="roll" inputmode="numeric" placeholder="Roll number" required>
+  <button type="submit">Show result</button>
+</form>
+<div id="out"></div>
+<script>
+const FIELDS = [["Name", "name"], ["Roll", "roll"], ["Bangla", "bangla"], ["English", "english"],
+                ["Math", "math"], ["Science", "science"], ["Total Marks", "total"], ["Grade", "grade"],
+                ["Grade Point", "grade_point"]];
+const out = document.getElementById("out");
+document.getElementById("lookup").addEventListener("submit", async (event) => {
+  event.preventDefault();
+  out.textContent = "";
+  const roll = parseInt(document.getElementById("roll").value, 10);
+  if (isNaN(roll)) { out.textContent = "Please enter a valid roll number."; return; }
+  let manifest;
+  try {
+    manifest = await (await fetch("manifest.json", {cache: "no-cache"})).json();
+  } catch (err) {
+    out.textContent = "Results are not published yet.";
+    return;
+  }
+  const response = await fetch(manifest.build + "/" + Math.floor(roll / manifest.shard_size) + ".json");
+  const shard = response.ok ? await response.json() : {};
+  const result = shard[String(roll)];
+  if (!result) { out.textContent = "Roll number not found."; return; }
+  const table = document.createElement("table");
+  for (const [label, key] of FIELDS) {
+    const row = table.insertRow();
+    row.insertCell().textContent = label;
+    row.insertCell().textContent = result[key] ?? "";
+  }
+  out.appendChild(table);
+});
+</script>
+</body>
+</html>
+"""
+
+
+# Serializes the generation check and manifest swap in publish with
+# retract (other processes are caught by re-checking after the swap).
+_swap_lock = threading.Lock()
+
+
+class PublishAborted(RuntimeError):
+    """The results changed while a snapshot was being written."""
+
+
+def _generation(directory: str) -> str:
+    try:
+        with open(os.path.join(directory, GENERATION), encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return ""
+
+
+def _bump_generation(directory: str) -> None:
+    if not os.path.isdir(directory):
+        # Never published here, so no publish can be in progress either.
+        return
+    tmp_path = os.path.join(directory, f"{GENERATION}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(f"{time.time_ns()}-{os.getpid()}-{threading.get_ident()}")
+    os.replace(tmp_path, os.path.join(directory, GENERATION))
+
+
+def _write_json(path: str, data) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+
+
+def _cleanup_builds(directory: str, keep: str) -> None:
+    builds = sorted(
+        (name for name in os.listdir(directory) if name.startswith("b") and os.path.isdir(os.path.join(directory, name))),
+        reverse=True,
+    )
+    for name in [b for b in builds if b != keep][KEEP_BUILDS - 1:]:
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+def publish(session, directory: str = PUBLISH_DIR, shard_size: int = SHARD_SIZE, chunk_size: int = 5000) -> dict:
+    """Write the current results as a new snapshot build and make it live.
+
+    Raises PublishAborted, leaving the previous state, if :func:`retract`
+    ran (a write) while the results were being read.
+    """
+    from sqlalchemy import select
+
+    from resultdashboard_reflex.grading import get_active_grader
+    from resultdashboard_reflex.models import Student
+    from resultdashboard_reflex.queries import result_data
+
+    os.makedirs(directory, exist_ok=True)
+    generation = _generation(directory)
+    grader = get_active_grader()
+    build = f"b{time.time_ns()}"
+    build_dir = os.path.join(directory, build)
+    os.makedirs(build_dir)
+
+    stmt = select(Student).order_by(Student.roll_no).execution_options(yield_per=chunk_size)
+    count = 0
+    shards = 0
+    current, rows = None, {}
+    for student in session.execute(stmt).scalars():
+        if student.roll_no is None:
+            continue
+        shard = student.roll_no // shard_size
+        if shard != current and rows:
+            _write_json(os.path.join(build_dir, f"{current}.json"), rows)
+            shards += 1
+            rows = {}
+        current = shard
+        rows[str(student.roll_no)] = result_data(student, grader)
+        count += 1
+    if rows:
+        _write_json(os.path.join(build_dir, f"{current}.json"), rows)
+        shards += 1
+
+    with open(os.path.join(directory, "index.html"), "w", encoding="utf-8") as f:
+        f.write(LOOKUP_PAGE)
+    manifest = {
+        "build": build,
+        "published_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "count": count,
+        "shard_size": shard_size,
+        "shards": shards,
+    }
+    tmp_path = os.path.join(directory, MANIFEST + ".tmp")
+    _write_json(tmp_path, manifest)
+    with _swap_lock:
+        changed = _generation(directory) != generation
+        if not changed:
+            os.replace(tmp_path, os.path.join(directory, MANIFEST))
+            # A retract from another process between the check and the swap.
+            changed = _generation(directory) != generation
+            if changed:
+                _remove_manifest(directory)
+    if changed:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise PublishAborted("The results changed while publishing; publish again.")
+    _cleanup_builds(directory, build)
+    return manifest
+
+
+def _remove_manifest(directory: str) -> bool:
+    try:
+        os.remove(os.path.join(directory, MANIFEST))
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def retract(directory: str = PUBLISH_DIR) -> bool:
+    """Take the live snapshot offline; return True if one was live.
+
+    Also bumps the generation, so a publish in progress is discarded.
+    """
+    with _swap_lock:
+        _bump_generation(directory)
+        return _remove_manifest(directory)
+
+
+class PublishedResults:
+    """Reads the live snapshot, keeping recently used shards in memory.
+
+    The manifest is re-checked with one ``stat`` per lookup, so a publish or
+    retract from another process is picked up immediately.
+    """
+
+    def __init__(self, directory: str = PUBLISH_DIR, max_shards: int = 64):
+        self.directory = directory
+        self.max_shards = max_shards
+        self._lock = threading.Lock()
+        self._manifest = None
+        self._manifest_mtime = None
+        self._shards: "OrderedDict[tuple, dict]" = OrderedDict()
+
+    def manifest(self):
+        """Return the live manifest, or None when nothing is published."""
+        path = os.path.join(self.directory, MANIFEST)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            with self._lock:
+                self._manifest = None
+                self._manifest_mtime = None
+            return None
+        with self._lock:
+            if mtime != self._manifest_mtime:
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        self._manifest = json.load(f)
+                except (OSError, ValueError):
+                    return None
+                self._manifest_mtime = mtime
+            return self._manifest
+
+    def is_live(self) -> bool:
+        return self.manifest() is not None
+
+    def lookup(self, roll: int):
+        """Return the published result dict for ``roll``, or None."""
+        manifest = self.manifest()
+        if manifest is None:
+            return None
+        key = (manifest["build"], roll // manifest["shard_size"])
+        with self._lock:
+            shard = self._shards.get(key)
+            if shard is not None:
+                self._shards.move_to_end(key)
+        if shard is None:
+            try:
+                with open(os.path.join(self.directory, key[0], f"{key[1]}.json"), encoding="utf-8") as f:
+                    shard = json.load(f)
+            except FileNotFoundError:
+                shard = {}
+            with self._lock:
+                self._shards[key] = shard
+                while len(self._shards) > self.max_shards:
+                    self._shards.popitem(last=False)
+        return shard.get(str(roll))
+
+
+published_results = PublishedResults()
+
+
+def main(argv=None) -> int:
+    from resultdashboard_reflex import db
+
+    parser = argparse.ArgumentParser(description="Publish the current results as a static snapshot.")
+    parser.add_argument("--dir", default=PUBLISH_DIR)
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    parser.add_argument("--retract", action="store_true", help="take the live snapshot offline")
+    args = parser.parse_args(argv)
+
+    if args.retract:
+        print("Snapshot retracted." if retract(args.dir) else "Nothing was published.")
+        return 0
+    with db.read_session() as session:
+        manifest = publish(session, args.dir, args.shard_size)
+    print(f"Published {manifest['count']} results in {manifest['shards']} shards "
+          f"to {os.path.join(args.dir, manifest['build'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""Data access behind the app's event handlers.
+
+Async loaders for the result cache, the row views kept in session state and
+the inserts used by ``add_student`` and the bulk writers. They depend on the tables and the
+database layer only, so the benchmark suite and scripts can call them
+without importing the app's state and pages.
+"""
+import asyncio
+import functools
+
+from sqlalchemy import and_, func, insert, or_, select
+
+from resultdashboard_reflex import db
+from resultdashboard_reflex.models import Student
+from resultdashboard_reflex.stats import SUBJECTS, class_stats
+
+# Columns the results table can be sorted by.
+SORTABLE_COLUMNS = ("roll_no", "name", "total_marks", "grade")
+
+# Fields of a results-table row kept in session state. Full Student objects
+# stay on the server; sessions hold only these small dicts.
+ROW_VIEW_FIELDS = ("id", "roll_no", "name", "total_marks", "grade")
+
+# Search terms that filter by grade rather than by name.
+GRADE_SEARCHES = ("A+", "A", "B", "C", "FAIL")
+
+# Whether the read database has the name index (search.py); checked once.
+_name_index = None
+
+# Rows per INSERT statement in insert_students (8 parameters each, well
+# under SQLite's 32766 bound-parameter limit).
+INSERT_ROWS_PER_STATEMENT = 500
+
+
+# Loaders are coroutines on the async engine so a slow query never blocks
+# other events. Helpers that take a sync Session (history, subjects) run
+# through AsyncSession.run_sync.
+async def load_student(roll: int):
+    """Fetch one student by roll number (cache loader)."""
+    async with db.async_read_session() as session:
+        result = await session.execute(select(Student).where(Student.roll_no == roll).limit(1))
+        return result.scalars().first()
+
+
+async def load_student_page(sort_by: str, descending: bool, search: str, after, limit: int):
+    """Fetch one page of students using keyset pagination (cache loader).
+
+    ``after`` is the ``(sort value, id)`` of the last row on the previous
+    page, or None for the first page. One extra row is fetched so callers
+    can tell whether another page follows.
+
+    A ``search`` that is not a roll number or a grade is a name search: it
+    returns the best ``limit`` matches in rank order (see search.py), as a
+    single page.
+    """
+    if search and not search.isdigit() and search.upper() not in GRADE_SEARCHES:
+        return await search_students(search, limit)
+    column = getattr(Student, sort_by)
+    query = select(*[getattr(Student, field) for field in ROW_VIEW_FIELDS])
+    if search:
+        if search.isdigit():
+            query = query.where(Student.roll_no == int(search))
+        else:
+            query = query.where(func.upper(Student.grade) == search.upper())
+    # NULLs sort lowest on every database (SQLite's own order, so its
+    # indexes still serve the ORDER BY): first ascending, last descending.
+    if after is not None:
+        value, last_id = after
+        if value is None:
+            after_nulls = and_(column.is_(None), Student.id < last_id if descending else Student.id > last_id)
+            query = query.where(after_nulls if descending else or_(column.is_not(None), after_nulls))
+        elif descending:
+            query = query.where(or_(column < value, and_(column == value, Student.id < last_id), column.is_(None)))
+        else:
+            query = query.where(or_(column > value, and_(column == value, Student.id > last_id)))
+    if descending:
+        query = query.order_by(column.desc().nulls_last(), Student.id.desc())
+    else:
+        query = query.order_by(column.asc().nulls_first(), Student.id.asc())
+    async with db.async_read_session() as session:
+        result = await session.execute(query.limit(limit + 1))
+        return [dict(row._mapping) for row in result]
+
+
+async def search_students(query: str, limit: int):
+    """Fetch the ``limit`` students whose names best match ``query`` (cache loader)."""
+    global _name_index
+    from resultdashboard_reflex.search import index_available, search_names
+
+    async with db.async_read_session() as session:
+        if _name_index is None:
+            _name_index = await index_available(session)
+        return await search_names(session, query, limit, indexed=_name_index)
+
+
+async def ensure_class_stats(rebuild: bool = False):
+    """Load the class aggregates from the database on first use."""
+    if rebuild or not class_stats.loaded:
+        from resultdashboard_reflex.subjects import mark_frequencies
+
+        async with db.async_read_session() as session:
+            grades = (await session.execute(select(Student.grade, func.count()).group_by(Student.grade))).all()
+            frequencies = await session.run_sync(mark_frequencies)
+        class_stats.rebuild(frequencies, grades)
+    return class_stats
+
+
+async def load_class_analytics():
+    """Fetch every student's marks as a ClassAnalytics snapshot (cache loader).
+
+    Rows come back in table order (the statistics do not depend on it), and
+    the arrays and dashboard statistics are built on a worker thread so a
+    large class does not stall the event loop.
+    """
+    from resultdashboard_reflex.analytics import ClassAnalytics
+
+    marks = [func.coalesce(getattr(Student, field), 0) for _, field in SUBJECTS]
+    query = select(func.coalesce(Student.roll_no, 0), *marks, func.coalesce(Student.total_marks, 0))
+    async with db.async_read_session() as session:
+        rows = (await session.execute(query)).all()
+
+    def build():
+        return ClassAnalytics.from_rows(rows, len(rows)).compute()
+
+    return await asyncio.to_thread(build)
+
+
+def row_view(row) -> dict:
+    """The ROW_VIEW_FIELDS of a Student or row dict, as published on the change feed."""
+    if isinstance(row, dict):
+        return {field: row.get(field) for field in ROW_VIEW_FIELDS}
+    return {field: getattr(row, field, None) for field in ROW_VIEW_FIELDS}
+
+
+def result_data(row, grader=None) -> dict:
+    """Build the `student_result_data` dict from a Student or ExamResult row.
+
+    ``grade_point`` is looked up on ``grader``, the policy the row was graded
+    with; it is left blank without one (closed exams, graded under whatever
+    policy was active then) or when the grade is not on its scale.
+    """
+    grade = getattr(row, "grade", "")
+    point = grader.grade_point(grade) if grader is not None else None
+    return {
+        "name": getattr(row, "name", ""),
+        "roll": getattr(row, "roll_no", ""),
+        "bangla": getattr(row, "bangla_marks", ""),
+        "english": getattr(row, "english_marks", ""),
+        "math": getattr(row, "math_marks", ""),
+        "science": getattr(row, "science_marks", ""),
+        "total": getattr(row, "total_marks", ""),
+        "grade": grade,
+        "grade_point": "" if point is None else point,
+    }
+
+
+async def load_exam_result(exam_id: int, roll: int):
+    """Fetch one student's result in a closed exam (cache loader)."""
+    from resultdashboard_reflex.history import exam_result_for_roll
+
+    async with db.async_read_session() as session:
+        return await session.run_sync(exam_result_for_roll, exam_id, roll)
+
+
+async def load_exams():
+    """Fetch closed exams, newest first (cache loader)."""
+    from resultdashboard_reflex.history import list_exams
+
+    async with db.async_read_session() as session:
+        return await session.run_sync(list_exams)
+
+
+async def load_subject_toppers(subject: str, n: int):
+    """Fetch the top ``n`` students in one subject (cache loader)."""
+    from resultdashboard_reflex.subjects import subject_toppers
+
+    async with db.async_read_session() as session:
+        return await session.run_sync(subject_toppers, subject, n)
+
+
+async def load_top_students(n: int):
+    """Fetch the top ``n`` students by total marks as row views (cache loader).
+
+    Equal totals are ordered by id, as on the first page of the results
+    table sorted by total, so a cache refill never reshuffles ties.
+    """
+    query = select(*[getattr(Student, field) for field in ROW_VIEW_FIELDS]).order_by(
+        Student.total_marks.desc().nulls_last(), Student.id.desc()
+    )
+    async with db.async_read_session() as session:
+        result = await session.execute(query.limit(n))
+        return [dict(row._mapping) for row in result]
+
+
+async def load_timeline(start, end, event_type, after, limit: int):
+    """Fetch one page of timeline events in ``[start, end]`` (cache loader)."""
+    from resultdashboard_reflex.timeline import list_events
+
+    async with db.async_read_session() as session:
+        return await session.run_sync(list_events, start, end, event_type, after, limit)
+
+
+def insert_student(session, roll: int, name: str, marks: dict, total_marks: int, grade: str) -> int:
+    """Insert one student and their mark rows (sync Session, via run_sync); return the id."""
+    from resultdashboard_reflex.subjects import write_marks
+
+    # Create instance and set attributes to avoid constructor
+    # kwarg signature checks in static analysis.
+    new_student = Student()
+    setattr(new_student, "roll_no", roll)
+    setattr(new_student, "name", name)
+    for field, value in marks.items():
+        setattr(new_student, field, value)
+    setattr(new_student, "total_marks", total_marks)
+    setattr(new_student, "grade", grade)
+    session.add(new_student)
+    session.flush()
+    write_marks(session, new_student.id, marks)
+    return new_student.id
+
+
+def insert_students(session, rows: list) -> None:
+    """Bulk insert student row dicts (same keys in every row), not committed.
+
+    Rows go in as multi-row INSERT statements rather than one executemany:
+    the name index (search.py) is flushed at the end of each statement, so
+    per-row statements would make it write a segment per student. The SQL is
+    passed to the driver as is, since compiling a statement with thousands
+    of parameters costs more than running it.
+    """
+    if not rows:
+        return
+    connection = session.connection()
+    if connection.dialect.name != "sqlite":
+        session.execute(insert(Student.__table__), rows)
+        return
+    columns = list(rows[0])
+    for start in range(0, len(rows), INSERT_ROWS_PER_STATEMENT):
+        chunk = rows[start:start + INSERT_ROWS_PER_STATEMENT]
+        connection.exec_driver_sql(
+            _multi_row_insert(tuple(columns), len(chunk)),
+            tuple(row[column] for row in chunk for column in columns),
+        )
+
+
+@functools.lru_cache(maxsize=16)
+def _multi_row_insert(columns: tuple, count: int) -> str:
+    values = "(" + ", ".join("?" * len(columns)) + ")"
+    return f"INSERT INTO student ({', '.join(columns)}) VALUES " + ", ".join([values] * count)
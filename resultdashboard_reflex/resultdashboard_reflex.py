@@ -2,37 +2,152 @@
 import reflex as rx
 from typing import Optional
 try:
-    from sqlmodel import SQLModel, create_engine
+    from sqlmodel import SQLModel
 except Exception:
     # Defer import errors to runtime; SQLModel may not be installed in the editor.
     SQLModel = None
-    create_engine = None
-from sqlalchemy.exc import OperationalError
+import asyncio
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError, OperationalError
+from resultdashboard_reflex import charts, db, queries
+from resultdashboard_reflex.cache import invalidate_student, result_cache
+from resultdashboard_reflex.changefeed import apply_to_page, apply_to_top, feed
+from resultdashboard_reflex.grading import get_active_grader
+from resultdashboard_reflex.metrics import instrumented, record_error
+# The tables live in models.py; they are re-exported here for older imports
+# of ``resultdashboard_reflex.resultdashboard_reflex.Student`` and friends.
+from resultdashboard_reflex.models import (  # noqa: F401
+    Exam,
+    ExamResult,
+    GradingPolicy,
+    Mark,
+    Student,
+    Subject,
+    TimelineEvent,
+)
+from resultdashboard_reflex.publish import published_results, retract
+from resultdashboard_reflex.stats import SUBJECTS, class_stats
+from resultdashboard_reflex.throttle import lookup_limiter
 # decimal removed — not used in this module
 
-# In this editor environment we avoid importing heavy optional
-# dependencies (plotly, pandas). The UI will show placeholders when
-# those libraries are not available at runtime.
-go = None
-# Avoid importing optional heavy libraries at module import time to keep the editor environment clean.
-CHARTS_AVAILABLE = False
-PANDAS_AVAILABLE = False
-
-# --- Database Model (SQLite) ---
-class Student(rx.Model, table=True):
-    """Represents a student's academic record."""
-    # Use Optional[...] annotations with None defaults so SQLModel
-    # (and SQLAlchemy) can infer column types at runtime. This avoids
-    # constructing Field() instances that the SQLModel type inference
-    # in this environment had trouble matching.
-    roll_no: Optional[int] = None
-    name: Optional[str] = None
-    bangla_marks: Optional[int] = None
-    english_marks: Optional[int] = None
-    math_marks: Optional[int] = None
-    science_marks: Optional[int] = None
-    total_marks: Optional[int] = None
-    grade: Optional[str] = None
+# Optional chart libraries (plotly, pandas) are never imported here; see
+# charts.py, which only looks them up and imports plotly on first use.
+CHARTS_AVAILABLE = charts.available("plotly")
+PANDAS_AVAILABLE = charts.available("pandas")
+
+
+def calculate_grade(total_marks: int, marks=None) -> str:
+    """Calculates the grade based on total marks using the active grading policy.
+
+    Pass the subject marks as well so per-subject pass marks are applied.
+    """
+    return get_active_grader().grade(total_marks, marks)
+
+
+# How often a live-update watcher wakes without changes to check that its
+# client is still connected.
+WATCH_POLL_SECONDS = 30
+
+
+def _client_connected(token: str) -> bool:
+    """Whether the client with ``token`` still has a websocket to this worker."""
+    namespace = app.event_namespace
+    if namespace is None:
+        return True
+    try:
+        return token in namespace.token_to_sid
+    except Exception:
+        return True
+
+
+def _leaderboard_lines(rows) -> list:
+    return [f"#{idx+1} {s['name'] or ''} - {s['total_marks'] or 0} Marks" for idx, s in enumerate(rows)]
+
+
+CURRENT_EXAM_CHOICE = "Current results"
+
+
+def _exam_id_from_choice(choice: str):
+    """Parse the exam id out of an exam dropdown label ("12: Midterm ...")."""
+    if not choice or choice == CURRENT_EXAM_CHOICE:
+        return None
+    try:
+        return int(str(choice).split(":", 1)[0])
+    except ValueError:
+        return None
+
+
+# Long jobs run on a worker thread with their own sync session, started from
+# background events so the session's other events keep flowing meanwhile.
+def _run_regrade() -> dict:
+    from resultdashboard_reflex.grading import regrade_all
+
+    with db.session() as session:
+        return regrade_all(session)
+
+
+def _run_publish() -> dict:
+    from resultdashboard_reflex.publish import publish
+
+    with db.read_session() as session:
+        return publish(session)
+
+
+def _run_marksheets(fmt: str, progress) -> dict:
+    from resultdashboard_reflex.marksheets import build
+
+    with db.read_session() as session:
+        return build(session, fmt, progress=progress)
+
+
+def _run_import(path: str, update: bool = False) -> dict:
+    from resultdashboard_reflex.importer import import_records, iter_records
+
+    with db.session() as session:
+        if update:
+            from resultdashboard_reflex.corrections import correct_records
+
+            return correct_records(iter_records(path, required=("roll_no",)), session)
+        return import_records(iter_records(path), session)
+
+
+async def _student_percentiles(data: dict) -> list:
+    """``[subject, "NN%"]`` rows: the share of the class at or below each of the result's marks.
+
+    Read from the class statistics' per-subject mark counts, so a lookup
+    never loads the class itself.
+    """
+    try:
+        await queries.ensure_class_stats()
+    except Exception as e:
+        record_error(e)
+        return []
+    rows = []
+    for label, field in SUBJECTS:
+        try:
+            mark = int(data.get(field.split("_")[0]) or 0)
+        except (TypeError, ValueError):
+            continue
+        rank = class_stats.percentile_rank(label, mark)
+        if rank is not None:
+            rows.append([label, f"{rank:.0f}%"])
+    return rows
+
+
+async def _class_analytics():
+    """The class analytics snapshot of the current data version.
+
+    Loaded once per version and shared by every session; a write bumps the
+    version, so the next read reloads it.
+    """
+    async def load():
+        # Snapshots of older versions are never read again.
+        result_cache.invalidate_kind("analytics")
+        return await queries.load_class_analytics()
+
+    return await result_cache.aget_or_load(("analytics", result_cache.version), load)
+
 
 # --- App State ---
 class ResultState(rx.State):
@@ -55,19 +170,85 @@ class ResultState(rx.State):
     
     # Student Dashboard State
     student_roll_input: str = ""
+    # Exam to look the roll up in: the current results or a closed exam
+    selected_exam: str = CURRENT_EXAM_CHOICE
+    exam_choices: list[str] = [CURRENT_EXAM_CHOICE]
     student_result_data: dict = {}
-    # Currently selected subject filter (populated via UI). Declare as a
-    # state variable so `filter_subject` can set it at runtime.
-    _filtered_subject: Optional[str] = None
+    # Currently selected subject filter and that subject's toppers
+    filtered_subject: str = "All"
+    subject_options: list[str] = ["All", "Bangla", "English", "Math", "Science"]
+    subject_toppers: list[dict] = []
     
     # Data from DB
-    students: list[Student] = []
-    top_performers: list[Student] = []
-    # Timeline / calendar events added by teacher (visible to students)
-    # Store as simple display strings to simplify rendering and avoid Var-indexing issues.
-    timeline_events: list[str] = []  # each event: "YYYY-MM-DD - Title (type)"
+    # Only the visible page and the top 3 are kept per session, as small row
+    # dicts (see queries.ROW_VIEW_FIELDS); the shared result cache holds the rest.
+    students: list[dict] = []
+    top_performers: list[dict] = []
+    # Precomputed class statistics: (subject, average, min, max) and grade counts
+    subject_stats: list[tuple[str, int, int, int]] = []
+    grade_distribution: dict[str, int] = {}
+    # Class analytics tables (analytics.py), as formatted cells, and the
+    # data version they were computed for
+    analytics_summary: list[list[str]] = []
+    analytics_histogram: list[list[str]] = []
+    analytics_correlation: list[list[str]] = []
+    _analytics_version: int = -1
+    # (subject, percentile rank) cells shown with a student's result
+    student_percentiles: list[list[str]] = []
+    # Rolls and ranges typed for "Delete Selected" ("5, 7, 10-20")
+    delete_selection: str = ""
+    # Bulk import applies the file as corrections (upsert by roll number)
+    import_update: bool = False
+    # Bulk import outcome (summary line and the first per-row errors)
+    import_summary: str = ""
+    import_errors: list[str] = []
+    # Background job (import/regrade) in progress and its last status line
+    job_running: bool = False
+    job_status: str = ""
+    # Spooled upload waiting for the background import task
+    _pending_import: str = ""
+    # Download format for "Export Results": csv, csv.gz, parquet or arrow
+    export_format: str = "csv"
+    # Report card build format: "zip" (one PDF per student) or "pdf" (merged)
+    marksheet_format: str = "zip"
+    # Results table paging: keyset cursors of the pages before the current one
+    page_size: int = 50
+    page_number: int = 1
+    has_next_page: bool = False
+    sort_by: str = "roll_no"
+    sort_desc: bool = False
+    search_query: str = ""
+    _page_cursor: Optional[tuple] = None
+    _prev_cursors: list = []
+    # (page key, cache data version) of the rows currently in `students`
+    _loaded_page: Optional[tuple] = None
+    # Read-through cache counters shown on the teacher dashboard
+    cache_summary: str = ""
+    # Handler metrics for the teacher diagnostics page (see metrics.py)
+    diagnostics_rows: list[dict[str, str]] = []
+    diagnostics_errors: list[str] = []
+    # Timeline / calendar events (TimelineEvent table), upcoming first.
+    # One page is kept per session as display strings "YYYY-MM-DD - Title (type)".
+    timeline_events: list[str] = []
+    timeline_has_more: bool = False
+    timeline_page_size: int = 10
+    # Range filter inputs; the applied filter is (start, end, type), or None
+    # for upcoming events of every type.
+    timeline_from: str = ""
+    timeline_to: str = ""
+    timeline_type: str = "all"
+    _timeline_filter: Optional[tuple] = None
+    _timeline_cursor: Optional[tuple] = None
+    _timeline_next: Optional[tuple] = None
     # Leaderboard/top students cached list (display strings)
     leaderboard_top: list[str] = []
+    _leaderboard_rows: list = []
+    _leaderboard_size: int = 10
+
+    # Live updates: the view the change-feed watcher keeps current and its
+    # id; bumping the id stops the watcher (see watch_changes).
+    _watch_view: str = ""
+    _watch_id: int = 0
     # Temporary inputs for teacher to add timeline events
     _new_event_title: str = ""
     _new_event_date: str = ""
@@ -75,31 +256,11 @@ class ResultState(rx.State):
      
     @classmethod
     def get_subject_averages(cls):
-        """Calculate average marks for each subject and return as a list of (subject, average) pairs."""
-        # Access class-level students list defensively.
-        # Avoid using boolean operations on Reflex Vars (they cannot be used
-        # directly with `if`, `and`, `or`, `not`). If `students` isn't a
-        # plain Python list (e.g. a Var during compile time), return default
-        # averages so the page can compile. At runtime the stateful methods
-        # that populate `students` will update the UI.
-        students = getattr(cls, "students", [])
-        if not isinstance(students, list):
-            return [("Bangla", 0), ("English", 0), ("Math", 0), ("Science", 0)]
-        if len(students) == 0:
-            return [("Bangla", 0), ("English", 0), ("Math", 0), ("Science", 0)]
-
-        total_bangla = sum(getattr(s, "bangla_marks", 0) for s in students)
-        total_english = sum(getattr(s, "english_marks", 0) for s in students)
-        total_math = sum(getattr(s, "math_marks", 0) for s in students)
-        total_science = sum(getattr(s, "science_marks", 0) for s in students)
-        count = len(students)
-
-        return [
-            ("Bangla", total_bangla // count),
-            ("English", total_english // count),
-            ("Math", total_math // count),
-            ("Science", total_science // count),
-        ]
+        """Return (subject, average) pairs from the precomputed class statistics."""
+        # Reads the aggregates kept by `class_stats` instead of re-summing
+        # every student. Before they are loaded (e.g. while the page is
+        # compiled) this returns zero averages.
+        return class_stats.averages()
 
     @classmethod
     def get_subject_averages_dict(cls):
@@ -107,32 +268,42 @@ class ResultState(rx.State):
         return cls.get_subject_averages()
 
     @classmethod
-    def get_top_students(cls, n: int = 5):
+    async def get_top_students(cls, n: int = 5):
         """Return list of (name, average) tuples for top N students based on total_marks."""
-        students = getattr(cls, "students", [])
-        if not isinstance(students, list):
+        try:
+            rows = await result_cache.aget_or_load(("top", n), lambda: queries.load_top_students(n))
+        except Exception:
             return []
-        rows = sorted(students, key=lambda s: getattr(s, "total_marks", 0), reverse=True)
         result = []
-        for s in rows[:n]:
+        for s in rows:
             avg = 0
             try:
-                avg = int(getattr(s, "total_marks", 0) // 4)
+                avg = int((s["total_marks"] or 0) // 4)
             except Exception:
-                avg = getattr(s, "total_marks", 0)
-            result.append((getattr(s, "name", ""), avg))
+                avg = s["total_marks"] or 0
+            result.append((s["name"] or "", avg))
         return result
 
     @rx.event
-    def filter_subject(self, subject: str | None = None):
-        """Filter students by subject; currently a stub that could be extended."""
-        # Store the filter selection so the UI can react and only show
-        # relevant student rows.
-        self._filtered_subject = subject
+    @instrumented
+    async def filter_subject(self, subject: str | None = None):
+        """Show the top students of one subject (indexed query on the mark table)."""
+        self.filtered_subject = subject or "All"
+        if self.filtered_subject == "All":
+            self.subject_toppers = []
+            return None
+        name = self.filtered_subject
+        try:
+            rows = await result_cache.aget_or_load(("subject_top", name, 10), lambda: queries.load_subject_toppers(name, 10))
+        except Exception as e:
+            record_error(e)
+            rows = []
+        self.subject_toppers = list(rows)
         return None
 
     @rx.event
-    def add_timeline_event(self, ev=None):
+    @instrumented
+    async def add_timeline_event(self, ev=None):
         """Allow teacher to add an exam or homework reminder to timeline.
 
         This handler is designed to be called directly from a button click
@@ -140,22 +311,102 @@ class ResultState(rx.State):
         values from the temporary state fields rather than expecting typed
         parameters.
         """
+        from resultdashboard_reflex.timeline import add_event
+
+        if not self.teacher_logged_in:
+            return rx.window_alert("Please log in as a teacher first.")
         try:
             title = getattr(self, "_new_event_title", "")
             date = getattr(self, "_new_event_date", "")
             etype = getattr(self, "_new_event_type", "exam") or "exam"
-
-            disp = f"{date} - {title} ({etype})"
-            # prepend so newest appear first
-            existing = self.timeline_events if isinstance(self.timeline_events, list) else []
-            self.timeline_events = [disp] + existing
-            # Clear temporary inputs
-            self._new_event_title = ""
-            self._new_event_date = ""
-            self._new_event_type = "exam"
-            return rx.window_alert("Event added to timeline")
+            async with db.async_session() as session:
+                await session.run_sync(add_event, title, date, etype)
+                await session.commit()
+        except ValueError as e:
+            return rx.window_alert(str(e))
         except Exception as e:
+            record_error(e)
             return rx.window_alert(f"Failed to add event: {e}")
+        # Like the result writers: bump the version first so a page load
+        # already in flight does not store the old list again.
+        result_cache.bump_version()
+        result_cache.invalidate_kind("timeline")
+        # Clear temporary inputs
+        self._new_event_title = ""
+        self._new_event_date = ""
+        self._new_event_type = "exam"
+        self._timeline_cursor = None
+        await self._load_timeline_page()
+        return rx.window_alert("Event added to timeline")
+
+    @rx.event
+    @instrumented
+    async def load_timeline(self):
+        """Show the first page of upcoming events (today onwards)."""
+        self._timeline_filter = None
+        self._timeline_cursor = None
+        await self._load_timeline_page()
+
+    @rx.event
+    @instrumented
+    async def filter_timeline(self):
+        """Show events between `timeline_from` and `timeline_to` (either may be blank) of `timeline_type`."""
+        from resultdashboard_reflex.timeline import EVENT_TYPES, parse_date
+
+        try:
+            start = parse_date(self.timeline_from) if self.timeline_from.strip() else None
+            end = parse_date(self.timeline_to) if self.timeline_to.strip() else None
+        except ValueError as e:
+            return rx.window_alert(str(e))
+        if start and end and end < start:
+            return rx.window_alert("The end date is before the start date.")
+        event_type = self.timeline_type if self.timeline_type in EVENT_TYPES else None
+        self._timeline_filter = (start, end, event_type)
+        self._timeline_cursor = None
+        await self._load_timeline_page()
+
+    @rx.event
+    @instrumented
+    async def next_timeline_page(self):
+        if not self.timeline_has_more:
+            return
+        self._timeline_cursor = self._timeline_next
+        await self._load_timeline_page()
+
+    async def _load_timeline_page(self):
+        import datetime
+
+        from resultdashboard_reflex.timeline import format_event
+
+        if self._timeline_filter is None:
+            start, end, event_type = datetime.date.today().isoformat(), None, None
+        else:
+            start, end, event_type = self._timeline_filter
+        after, limit = self._timeline_cursor, self.timeline_page_size
+        try:
+            rows = await result_cache.aget_or_load(
+                ("timeline", start, end, event_type, after, limit),
+                lambda: queries.load_timeline(start, end, event_type, after, limit),
+            )
+        except Exception as e:
+            record_error(e)
+            rows = []
+        page = rows[:limit]
+        self.timeline_has_more = len(rows) > limit
+        self._timeline_next = (page[-1]["event_date"], page[-1]["id"]) if page else None
+        self.timeline_events = [format_event(event) for event in page]
+
+    @rx.event
+    def set_timeline_from(self, ev=None):
+        self.timeline_from = str(ev if ev is not None else self.timeline_from)
+
+    @rx.event
+    def set_timeline_to(self, ev=None):
+        self.timeline_to = str(ev if ev is not None else self.timeline_to)
+
+    @rx.event
+    def set_timeline_type(self, ev=None):
+        self.timeline_type = str(ev if ev is not None else self.timeline_type)
 
     @rx.event
     def set_new_event_title(self, ev=None):
@@ -179,52 +430,53 @@ class ResultState(rx.State):
             self._new_event_type = str(self._new_event_type)
 
     @rx.event
-    def compute_leaderboard(self, n: int = 10):
+    @instrumented
+    async def compute_leaderboard(self, n: int = 10):
         """Compute top N students and cache them to `leaderboard_top`."""
         try:
             # If we have DB access prefer to query, otherwise use state list
             try:
-                with rx.session() as session:
-                    rows = session.query(Student).all()
-            except Exception:
-                rows = self.students if isinstance(self.students, list) else []
-
-            rows = sorted(rows, key=lambda s: getattr(s, "total_marks", 0), reverse=True)
-            # Store as simple display strings to keep the state type stable
-            self.leaderboard_top = [f"#{idx+1} {getattr(s, 'name', '')} - {getattr(s, 'total_marks', 0)} Marks" for idx, s in enumerate(rows[:n])]
+                rows = await result_cache.aget_or_load(("top", n), lambda: queries.load_top_students(n))
+            except Exception as e:
+                record_error(e)
+                rows = []
+            # The rows are kept so change-feed deltas can be applied to them;
+            # the page shows simple display strings to keep the state type stable.
+            self._leaderboard_size = n
+            self._leaderboard_rows = list(rows[:n])
+            self.leaderboard_top = _leaderboard_lines(self._leaderboard_rows)
             return None
-        except Exception:
+        except Exception as e:
+            record_error(e)
             self.leaderboard_top = []
             return None
 
     @classmethod
-    def get_student_rank(cls, student_roll: int):
-        """Return the 1-based rank of a student in the current class, or None."""
-        students = getattr(cls, "students", [])
-        if not isinstance(students, list) or len(students) == 0:
+    async def get_student_rank(cls, student_roll: int):
+        """Return the 1-based rank of a student in the current class, or None.
+
+        Students with equal totals share a rank (1, 2, 2, 4, ...).
+        """
+        try:
+            async with db.async_read_session() as session:
+                total = (
+                    await session.execute(select(Student.total_marks).where(Student.roll_no == student_roll))
+                ).scalar()
+                if total is None:
+                    return None
+                higher = (
+                    await session.execute(select(func.count(Student.id)).where(Student.total_marks > total))
+                ).scalar()
+        except Exception:
             return None
-        rows = sorted(students, key=lambda s: getattr(s, "total_marks", 0), reverse=True)
-        for idx, s in enumerate(rows, 1):
-            if getattr(s, "roll_no", None) == student_roll:
-                return idx
-        return None
-        return None
+        return int(higher or 0) + 1
         
 
     
     # Logic for grades and totals
-    def calculate_grade(self, total_marks: int) -> str:
+    def calculate_grade(self, total_marks: int, marks=None) -> str:
         """Calculates the grade based on total marks."""
-        if total_marks >= 320:
-            return "A+"
-        elif total_marks >= 280:
-            return "A"
-        elif total_marks >= 240:
-            return "B"
-        elif total_marks >= 200:
-            return "C"
-        else:
-            return "Fail"
+        return calculate_grade(total_marks, marks)
 
     # Instance setters used by the UI. They accept an optional event
     # or direct value and update state defensively so static analysis
@@ -307,60 +559,152 @@ class ResultState(rx.State):
         except Exception:
             self.student_roll_input = str(self.student_roll_input)
     @rx.event
+    def set_export_format(self, ev=None):
+        try:
+            self.export_format = str(ev if ev is not None else self.export_format)
+        except Exception:
+            self.export_format = str(self.export_format)
+
+    @rx.event
+    def set_marksheet_format(self, ev=None):
+        try:
+            self.marksheet_format = str(ev if ev is not None else self.marksheet_format)
+        except Exception:
+            self.marksheet_format = str(self.marksheet_format)
+
+    @rx.event
+    def set_delete_selection(self, ev=None):
+        try:
+            self.delete_selection = str(ev if ev is not None else self.delete_selection)
+        except Exception:
+            self.delete_selection = str(self.delete_selection)
+
+    @rx.event
+    def set_import_update(self, ev=None):
+        self.import_update = bool(ev)
+
+    @rx.event
+    @instrumented
     def export_results(self):
-        """Export student results as CSV file."""
-        import csv
-        import io
-        import os
+        """Export student results in the selected format.
+
+        The file is streamed from the database by the `/api/export` route, so
+        each download is generated for its own request. A short-lived token
+        ties the download link to this (logged-in) session.
+        """
+        from resultdashboard_reflex.export import issue_token
 
-        # Build CSV in-memory then write to the .web/static directory so
-        # Reflex can serve it as a downloadable file. Reflex requires
-        # redirect/download URLs to start with '/'.
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(["Roll No", "Name", "Bangla", "English", "Math", "Science", "Total", "Grade"])
-        students = self.students if isinstance(self.students, list) else []
-        for s in students:
-            writer.writerow([
-                getattr(s, "roll_no", ""),
-                getattr(s, "name", ""),
-                getattr(s, "bangla_marks", ""),
-                getattr(s, "english_marks", ""),
-                getattr(s, "math_marks", ""),
-                getattr(s, "science_marks", ""),
-                getattr(s, "total_marks", ""),
-                getattr(s, "grade", ""),
-            ])
-        csv_data = output.getvalue()
-
-        # Ensure .web/static exists
-        web_static_dir = os.path.join(os.getcwd(), ".web", "static")
-        try:
-            os.makedirs(web_static_dir, exist_ok=True)
-            file_path = os.path.join(web_static_dir, "student_results.csv")
-            with open(file_path, "w", encoding="utf-8", newline="") as f:
-                f.write(csv_data)
-            # Return a redirect to the static file path (must start with '/').
-            return safe_redirect("/static/student_results.csv")
+        if not self.teacher_logged_in:
+            return rx.window_alert("Please log in as a teacher first.")
+        try:
+            api_url = rx.config.get_config().api_url.rstrip("/")
+            url = f"{api_url}/api/export?format={self.export_format}&token={issue_token()}"
+            return rx.redirect(url, is_external=True)
         except Exception as e:
-            return rx.window_alert(f"Failed to export CSV: {e}")
+            record_error(e)
+            return rx.window_alert(f"Failed to export results: {e}")
     
     @rx.event
-    def delete_student(self, roll: int):
+    @instrumented
+    async def delete_student(self, roll: int):
+        from resultdashboard_reflex.corrections import delete_students
+
+        if not self.teacher_logged_in:
+            return rx.window_alert("Please log in as a teacher first.")
         try:
-            with rx.session() as session:
-                student = session.query(Student).filter_by(roll_no=roll).first()
-                if student:
-                    session.delete(student)
-                    session.commit()
-                    return rx.window_alert("Student deleted successfully!")
+            async with db.async_session() as session:
+                removed = await session.run_sync(delete_students, [(roll, roll)])
+            if removed:
+                return rx.window_alert("Student deleted successfully!")
         except Exception as e:
+            record_error(e)
             return rx.window_alert(f"Error deleting student: {e}")
 
+    @rx.event
+    @instrumented
+    async def delete_selected(self):
+        """Delete the rolls and roll ranges typed in `delete_selection` ("5, 7, 10-20")."""
+        from resultdashboard_reflex.corrections import delete_students, parse_selection
+
+        if not self.teacher_logged_in:
+            return rx.window_alert("Please log in as a teacher first.")
+        try:
+            ranges = parse_selection(self.delete_selection)
+        except ValueError as e:
+            return rx.window_alert(f"{e}. Use roll numbers and ranges, e.g. 5, 7, 10-20.")
+        if not ranges:
+            return rx.window_alert("Enter the roll numbers to delete, e.g. 5, 7, 10-20.")
+        try:
+            async with db.async_session() as session:
+                removed = await session.run_sync(delete_students, ranges)
+        except Exception as e:
+            record_error(e)
+            return rx.window_alert(f"Error deleting students: {e}")
+        self.delete_selection = ""
+        return rx.window_alert(f"Deleted {len(removed)} student(s).")
+
+    @rx.event
+    @instrumented
+    async def edit_student(self, roll: int):
+        """Fill the student form with a stored row so it can be corrected."""
+        if not self.teacher_logged_in:
+            return rx.window_alert("Please log in as a teacher first.")
+        try:
+            student = await result_cache.aget_or_load(("roll", roll), lambda: queries.load_student(roll))
+        except Exception as e:
+            record_error(e)
+            student = None
+        if student is None:
+            return rx.window_alert("Roll number not found.")
+        self.student_name = student.name or ""
+        self.student_roll = str(student.roll_no)
+        self.marks_bangla = str(student.bangla_marks if student.bangla_marks is not None else "")
+        self.marks_english = str(student.english_marks if student.english_marks is not None else "")
+        self.marks_math = str(student.math_marks if student.math_marks is not None else "")
+        self.marks_science = str(student.science_marks if student.science_marks is not None else "")
+
+    @rx.event
+    @instrumented
+    async def update_student(self):
+        """Correct (or add) the student in the form by roll number.
 
+        Blank fields keep their stored values; the total and grade are
+        recomputed.
+        """
+        from resultdashboard_reflex.corrections import upsert_students, validate_correction
+
+        if not self.teacher_logged_in:
+            return rx.window_alert("Please log in as a teacher first.")
+        try:
+            row = validate_correction({
+                "roll_no": self.student_roll,
+                "name": self.student_name,
+                "bangla_marks": self.marks_bangla,
+                "english_marks": self.marks_english,
+                "math_marks": self.marks_math,
+                "science_marks": self.marks_science,
+            })
+        except ValueError as e:
+            return rx.window_alert(f"Please fix the form: {e}.")
+        try:
+            async with db.async_session() as session:
+                result = await session.run_sync(upsert_students, [row])
+        except Exception as e:
+            record_error(e)
+            return rx.window_alert(f"Error updating student: {e}")
+        if result["skipped"]:
+            return rx.window_alert(f"Roll number {row['roll_no']} is new: enter the name and all marks to add it.")
+        self.student_name = ""
+        self.student_roll = ""
+        self.marks_bangla = ""
+        self.marks_english = ""
+        self.marks_math = ""
+        self.marks_science = ""
+        return rx.window_alert("Student added successfully!" if result["inserted"] else "Student updated successfully!")
 
     # --- Teacher Functions ---
     @rx.event
+    @instrumented
     def teacher_login(self):
         """Authenticates the teacher login using the input fields compared to stored credentials."""
         # Compare the input values against the stored credentials.
@@ -375,8 +719,11 @@ class ResultState(rx.State):
         return rx.window_alert("Invalid credentials!")
 
     @rx.event
-    def add_student(self):
+    @instrumented
+    async def add_student(self):
         """Adds a new student record to the database."""
+        if not self.teacher_logged_in:
+            return rx.window_alert("Please log in as a teacher first.")
         try:
             bangla = int(self.marks_bangla)
             english = int(self.marks_english)
@@ -384,70 +731,51 @@ class ResultState(rx.State):
             science = int(self.marks_science)
             roll = int(self.student_roll)
 
-            total_marks = bangla + english + math + science
-            grade = self.calculate_grade(total_marks)
+            marks = {
+                "bangla_marks": bangla,
+                "english_marks": english,
+                "math_marks": math,
+                "science_marks": science,
+            }
+            grader = get_active_grader()
+            total_marks = grader.total(marks)
+            grade = grader.grade(total_marks, marks)
             
             try:
-                with rx.session() as session:
-                    # Create instance and set attributes to avoid constructor
-                    # kwarg signature checks in static analysis.
-                    new_student = Student()
-                    setattr(new_student, "roll_no", roll)
-                    setattr(new_student, "name", self.student_name)
-                    setattr(new_student, "bangla_marks", bangla)
-                    setattr(new_student, "english_marks", english)
-                    setattr(new_student, "math_marks", math)
-                    setattr(new_student, "science_marks", science)
-                    setattr(new_student, "total_marks", total_marks)
-                    setattr(new_student, "grade", grade)
-                    session.add(new_student)
-                    session.commit()
+                async with db.async_session() as session:
+                    student_id = await session.run_sync(queries.insert_student, roll, self.student_name, marks, total_marks, grade)
+                    await session.commit()
             except Exception as db_err:
+                # The unique roll index rejects duplicate roll numbers.
+                if isinstance(db_err, IntegrityError):
+                    return rx.window_alert(f"Roll number {roll} already exists; use Update Student to correct it.")
                 # If the table doesn't exist, attempt to create it on the same
-                # database that rx.session() is using, then retry once.
+                # database that db.async_session() is using, then retry once.
                 msg = str(db_err).lower()
                 if "no such table" in msg or isinstance(db_err, OperationalError):
                     try:
-                        # Try to get the engine/bind from a new session and create tables there.
-                        with rx.session() as session:
-                            try:
-                                bind = session.get_bind()
-                            except Exception:
-                                bind = getattr(session, "bind", None)
-
-                            if bind is None:
-                                # As a last resort, if we have SQLModel and create_engine, create a local file.
-                                if SQLModel is None or create_engine is None:
-                                    return rx.window_alert("Database schema missing and could not determine DB engine to create it.")
-                                engine = create_engine("sqlite:///resultdashboard.db")
-                                # Create tables only if SQLModel is available.
-                                if SQLModel is None:
-                                    return rx.window_alert("Database schema missing and sqlmodel is not available to create it.")
-                                SQLModel.metadata.create_all(engine)
-                            else:
-                                # Create tables on the same bind used by the app session.
-                                if SQLModel is None:
-                                    return rx.window_alert("Database schema missing and sqlmodel is not available to create it.")
-                                SQLModel.metadata.create_all(bind)
+                        # Create tables only if SQLModel is available.
+                        if SQLModel is None:
+                            return rx.window_alert("Database schema missing and sqlmodel is not available to create it.")
+                        async with db.get_async_engine().begin() as conn:
+                            await conn.run_sync(SQLModel.metadata.create_all)
 
                         # Retry the insertion once after schema creation
-                        with rx.session() as session:
-                            new_student = Student()
-                            setattr(new_student, "roll_no", roll)
-                            setattr(new_student, "name", self.student_name)
-                            setattr(new_student, "bangla_marks", bangla)
-                            setattr(new_student, "english_marks", english)
-                            setattr(new_student, "math_marks", math)
-                            setattr(new_student, "science_marks", science)
-                            setattr(new_student, "total_marks", total_marks)
-                            setattr(new_student, "grade", grade)
-                            session.add(new_student)
-                            session.commit()
+                        async with db.async_session() as session:
+                            student_id = await session.run_sync(queries.insert_student, roll, self.student_name, marks, total_marks, grade)
+                            await session.commit()
                     except Exception as create_err:
+                        record_error(create_err)
                         return rx.window_alert(f"Failed to create DB schema: {create_err}")
                 else:
                     raise
-            
+
+            invalidate_student(roll, total_marks)
+            retract()
+            class_stats.add(dict(marks, grade=grade))
+            feed.publish("upsert", {
+                "id": student_id, "roll_no": roll, "name": self.student_name, "total_marks": total_marks, "grade": grade,
+            })
             self.student_name = ""
             self.student_roll = ""
             self.marks_bangla = ""
@@ -459,39 +787,459 @@ class ResultState(rx.State):
         except ValueError:
             return rx.window_alert("Please enter valid numbers for marks and roll.")
         except Exception as e:
+            record_error(e)
             return rx.window_alert(f"An error occurred: {e}")
 
     @rx.event
-    def get_students(self):
-        """Retrieves all student records from the database."""
+    @instrumented
+    async def get_students(self):
+        """Loads the first page of student records from the database."""
+        self._page_cursor = None
+        self._prev_cursors = []
+        self.page_number = 1
+        await self._load_page()
+
+    async def _load_page(self):
+        """Fill `students` with the page starting after `_page_cursor`."""
+        search = self.search_query.strip()
+        key = ("page", self.sort_by, self.sort_desc, search, self._page_cursor, self.page_size)
+        loaded = (key, result_cache.version)
+        if loaded == self._loaded_page:
+            # Same page and no writes since: leave `students` untouched so
+            # no state delta is sent to the client.
+            return
         try:
-            with rx.session() as session:
-                self.students = session.query(Student).all()
-        except Exception:
-            # Keep an empty list if DB isn't available in this environment
-            self.students = []
+            rows = await result_cache.aget_or_load(
+                key,
+                lambda: queries.load_student_page(self.sort_by, self.sort_desc, search, self._page_cursor, self.page_size),
+            )
+        except Exception as e:
+            record_error(e)
+            # Keep an empty list if DB isn't available in this environment,
+            # and load again next time rather than treating it as current.
+            rows = []
+            loaded = None
+        self.has_next_page = len(rows) > self.page_size
+        self.students = list(rows[:self.page_size])
+        self._loaded_page = loaded
+        stats = result_cache.stats()
+        limits = lookup_limiter.stats()
+        self.cache_summary = (
+            f"Cache: {stats['hits']} hits / {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%} hit rate, {stats['entries']} entries, "
+            f"{stats['coalesced']} merged). Lookups: {limits['allowed']} served, {limits['shed']} shed"
+        )
             
     @rx.event
-    def get_top_performers(self):
-        """Retrieves the top 3 students based on total marks."""
+    @instrumented
+    async def next_page(self):
+        if not self.has_next_page or not self.students:
+            return
+        last = self.students[-1]
+        self._prev_cursors = self._prev_cursors + [self._page_cursor]
+        self._page_cursor = (last[self.sort_by], last["id"])
+        self.page_number += 1
+        await self._load_page()
+
+    @rx.event
+    @instrumented
+    async def prev_page(self):
+        if not self._prev_cursors:
+            return
+        self._page_cursor = self._prev_cursors[-1]
+        self._prev_cursors = self._prev_cursors[:-1]
+        self.page_number -= 1
+        await self._load_page()
+
+    @rx.event
+    @instrumented
+    def sort_students(self, column: str):
+        """Sort the table by `column`; clicking the same column flips the order."""
+        if column not in queries.SORTABLE_COLUMNS:
+            return
+        if column == self.sort_by:
+            self.sort_desc = not self.sort_desc
+        else:
+            self.sort_by = column
+            self.sort_desc = column == "total_marks"
+        return ResultState.get_students
+
+    @rx.event
+    def set_search_query(self, ev=None):
         try:
-            with rx.session() as session:
-                rows = session.query(Student).all()
-                # Sort in Python to avoid relying on SQL expression helpers
-                self.top_performers = sorted(rows, key=lambda s: getattr(s, "total_marks", 0), reverse=True)[:3]
+            self.search_query = str(ev if ev is not None else self.search_query)
         except Exception:
+            self.search_query = str(self.search_query)
+
+    @rx.event
+    @instrumented
+    async def get_top_performers(self):
+        """Retrieves the top 3 students based on total marks."""
+        try:
+            self.top_performers = list(await result_cache.aget_or_load(("top", 3), lambda: queries.load_top_students(3)))
+        except Exception as e:
+            record_error(e)
             self.top_performers = []
 
     def get_grade_distribution(self):
         """Generates a bar chart for grade distribution."""
-        # Build a simple distribution dict; if pandas/plotly are installed
-        # in the running environment they can be used to create a chart.
-        grades = [getattr(s, "grade", "Fail") for s in self.students]
-        dist = {"A+": 0, "A": 0, "B": 0, "C": 0, "Fail": 0}
-        for g in grades:
-            dist[g] = dist.get(g, 0) + 1
-        return {"type": "grade_distribution", "data": dist}
-        
+        # The histogram is maintained by `class_stats`; with plotly installed
+        # it is returned as a figure, otherwise as plain data.
+        histogram = class_stats.grade_histogram()
+        figure = charts.grade_distribution_figure(histogram)
+        if figure is not None:
+            return figure
+        return {"type": "grade_distribution", "data": histogram}
+
+    @rx.event(background=True)
+    @instrumented
+    async def regrade_all(self):
+        """Recompute totals and grades for every student with the active policy."""
+        from resultdashboard_reflex.grading import format_report
+
+        async with self:
+            if not self.teacher_logged_in:
+                return rx.window_alert("Please log in as a teacher first.")
+            if self.job_running:
+                return rx.window_alert(f"Please wait: {self.job_status}")
+            self.job_running = True
+            self.job_status = "Regrading all students..."
+        try:
+            message = format_report(await asyncio.to_thread(_run_regrade))
+        except Exception as e:
+            record_error(e)
+            message = f"Regrade failed: {e}"
+        async with self:
+            self.job_running = False
+            self.job_status = message
+        return rx.window_alert(message)
+
+    @rx.event(background=True)
+    @instrumented
+    async def publish_results(self):
+        """Write the static result snapshot students are served from."""
+        async with self:
+            if not self.teacher_logged_in:
+                return rx.window_alert("Please log in as a teacher first.")
+            if self.job_running:
+                return rx.window_alert(f"Please wait: {self.job_status}")
+            self.job_running = True
+            self.job_status = "Publishing results..."
+        try:
+            manifest = await asyncio.to_thread(_run_publish)
+            message = f"Published {manifest['count']} results ({manifest['published_at']})."
+        except Exception as e:
+            record_error(e)
+            message = f"Publish failed: {e}"
+        async with self:
+            self.job_running = False
+            self.job_status = message
+        return rx.window_alert(message)
+
+    @rx.event(background=True)
+    @instrumented
+    async def build_marksheets(self):
+        """Render every student's report card and download the result.
+
+        The build runs on a worker thread (which fans the pages out to a
+        process pool); the job status shows its progress while it runs.
+        """
+        from resultdashboard_reflex.export import issue_token
+        from resultdashboard_reflex.marksheets import FORMATS, format_report
+
+        async with self:
+            if not self.teacher_logged_in:
+                return rx.window_alert("Please log in as a teacher first.")
+            if self.job_running:
+                return rx.window_alert(f"Please wait: {self.job_status}")
+            fmt = self.marksheet_format if self.marksheet_format in FORMATS else "zip"
+            self.job_running = True
+            self.job_status = "Generating marksheets..."
+        done = [0, 0]
+
+        def progress(count, total):
+            done[:] = [count, total]
+
+        task = asyncio.ensure_future(asyncio.to_thread(_run_marksheets, fmt, progress))
+        while not task.done():
+            await asyncio.wait({task}, timeout=0.5)
+            if done[1] and not task.done():
+                async with self:
+                    self.job_status = f"Generating marksheets: {done[0]} of {done[1]}..."
+        try:
+            report = task.result()
+            message = format_report(report)
+            url = f"{rx.config.get_config().api_url.rstrip('/')}/api/marksheets?token={issue_token(report['path'])}"
+        except Exception as e:
+            record_error(e)
+            async with self:
+                self.job_running = False
+                self.job_status = f"Marksheets failed: {e}"
+            return rx.window_alert(f"Marksheets failed: {e}")
+        async with self:
+            self.job_running = False
+            self.job_status = message
+        return rx.redirect(url, is_external=True)
+
+    @rx.event
+    @instrumented
+    async def load_class_stats(self):
+        """Populate the dashboard cards from the precomputed class statistics."""
+        try:
+            stats = await queries.ensure_class_stats()
+        except Exception as e:
+            record_error(e)
+            stats = class_stats
+        self.subject_stats = stats.subject_summary()
+        self.grade_distribution = stats.grade_histogram()
+        self.subject_options = ["All"] + [item[0] for item in self.subject_stats]
+
+    @rx.event
+    @instrumented
+    async def load_analytics(self):
+        """Fill the analytics tables unless they already match the data version."""
+        from resultdashboard_reflex.analytics import correlation_rows, histogram_rows, summary_rows
+
+        version = result_cache.version
+        if version == self._analytics_version:
+            return
+        try:
+            snapshot = await _class_analytics()
+        except Exception as e:
+            record_error(e)
+            return
+        self.analytics_summary = summary_rows(snapshot)
+        self.analytics_histogram = histogram_rows(snapshot)
+        self.analytics_correlation = correlation_rows(snapshot)
+        self._analytics_version = version
+
+    @rx.event
+    @instrumented
+    async def rebuild_class_stats(self):
+        """Recompute the class statistics from scratch (recovery)."""
+        try:
+            await queries.ensure_class_stats(rebuild=True)
+        except Exception as e:
+            record_error(e)
+            return rx.window_alert(f"Failed to rebuild statistics: {e}")
+        self.subject_stats = class_stats.subject_summary()
+        self.grade_distribution = class_stats.grade_histogram()
+        return rx.window_alert("Statistics rebuilt.")
+
+    @rx.event
+    @instrumented
+    async def handle_import(self, files: list[rx.UploadFile]):
+        """Spool an uploaded CSV/XLSX file and start the bulk import."""
+        import os
+        import tempfile
+
+        if not self.teacher_logged_in:
+            return rx.window_alert("Please log in as a teacher first.")
+        if not files:
+            return rx.window_alert("Choose a CSV or XLSX file to import.")
+        if self.job_running:
+            return rx.window_alert(f"Please wait: {self.job_status}")
+        upload = files[0]
+        suffix = os.path.splitext(upload.filename or "")[1].lower() or ".csv"
+        # Spool the upload to disk in chunks so large files are parsed as a
+        # stream rather than held in memory.
+        fd, tmp_path = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = await upload.read(1 << 20)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+        except Exception as e:
+            record_error(e)
+            os.remove(tmp_path)
+            return rx.window_alert(f"Import failed: {e}")
+        self._pending_import = tmp_path
+        self.job_running = True
+        self.job_status = f"Importing {upload.filename or 'upload'}..."
+        return ResultState.run_import
+
+    @rx.event(background=True)
+    @instrumented
+    async def run_import(self):
+        """Import the spooled upload on a worker thread (background task).
+
+        With `import_update` set the file is applied as corrections instead:
+        rows are upserted by roll number and may leave columns out.
+        """
+        import os
+
+        from resultdashboard_reflex import corrections, importer
+
+        async with self:
+            tmp_path = self._pending_import
+            self._pending_import = ""
+            update = self.import_update
+        if not tmp_path:
+            return
+        format_report = corrections.format_report if update else importer.format_report
+        try:
+            report = await asyncio.to_thread(_run_import, tmp_path, update)
+        except Exception as e:
+            record_error(e)
+            async with self:
+                self.job_running = False
+                self.job_status = f"Import failed: {e}"
+            return rx.window_alert(f"Import failed: {e}")
+        finally:
+            os.remove(tmp_path)
+
+        async with self:
+            self.import_summary = format_report(report)
+            self.import_errors = [f"Line {line_no}: {message}" for line_no, message in report["errors"][:50]]
+            self.job_running = False
+            self.job_status = self.import_summary
+        return rx.clear_selected_files("marks_upload")
+
+    @rx.event
+    @instrumented
+    async def load_exam_choices(self):
+        """Fill the exam dropdown on the student page from the exam table."""
+        try:
+            exams = await result_cache.aget_or_load(("exams",), queries.load_exams)
+        except Exception as e:
+            record_error(e)
+            exams = []
+        self.exam_choices = [CURRENT_EXAM_CHOICE] + [
+            f"{exam['id']}: {exam['name']} ({exam['term']} {exam['year']})" for exam in exams
+        ]
+
+    @rx.event
+    def set_selected_exam(self, ev=None):
+        try:
+            self.selected_exam = str(ev if ev is not None else self.selected_exam)
+        except Exception:
+            self.selected_exam = str(self.selected_exam)
+
+    @rx.event
+    def load_diagnostics(self):
+        """Refresh the per-handler metrics shown on /diagnostics."""
+        from resultdashboard_reflex.metrics import handler_summary, recent_errors
+
+        if not self.teacher_logged_in:
+            return
+        self.diagnostics_rows = handler_summary()
+        self.diagnostics_errors = recent_errors()
+
+    @rx.event(background=True)
+    async def watch_changes(self, view: str = "student"):
+        """Keep this session's results live from the change feed (background task).
+
+        ``view`` is "teacher" (results page, top performers, averages) or
+        "student" (leaderboard). Deltas are applied in place; only a reset
+        or a gap in the feed reloads, through the shared result cache. The
+        task ends when the page unmounts, another watcher replaces it or the
+        client disconnects.
+        """
+        async with self:
+            self._watch_id += 1
+            watch_id = self._watch_id
+            self._watch_view = view
+            token = self.router.session.client_token
+            # Changes from here on are applied on top of whatever the page's
+            # on_mount loads; applying one twice is harmless.
+            seq = feed.seq
+        while True:
+            changes = await feed.wait(seq, WATCH_POLL_SECONDS)
+            if not _client_connected(token):
+                return
+            async with self:
+                if self._watch_id != watch_id:
+                    return
+                if not changes:
+                    if changes is None:
+                        # Fell behind the feed's window: reload instead.
+                        seq = feed.seq
+                        await self._reload_live_views()
+                    continue
+                seq = changes[-1]["seq"]
+                try:
+                    await self._apply_changes(changes)
+                except Exception as e:
+                    record_error(e)
+
+    @rx.event
+    def stop_watching(self):
+        """Stop this session's change-feed watcher (page on_unmount)."""
+        self._watch_id += 1
+
+    async def _apply_changes(self, changes: list):
+        """Patch the watched view with ``changes`` from the feed."""
+        if any(change["op"] == "reset" for change in changes):
+            await self._reload_live_views()
+            return
+        if self._watch_view == "teacher":
+            reload_page = self._loaded_page is None or bool(self.search_query.strip())
+            students, has_next = self.students, self.has_next_page
+            top, top_complete = self.top_performers, True
+            for change in changes:
+                if not reload_page:
+                    patched = apply_to_page(
+                        students, change, self.sort_by, self.sort_desc, self._page_cursor, self.page_size, has_next
+                    )
+                    if patched is None:
+                        reload_page = True
+                    else:
+                        students, has_next = patched
+                top, complete = apply_to_top(top, change, 3)
+                top_complete = top_complete and complete
+            if reload_page:
+                if self._loaded_page is not None:
+                    self._loaded_page = None
+                    await self._load_page()
+            elif students != self.students or has_next != self.has_next_page:
+                self.students = students
+                self.has_next_page = has_next
+                self._loaded_page = (self._loaded_page[0], result_cache.version)
+            if not top_complete:
+                await self.get_top_performers()
+            elif top != self.top_performers:
+                self.top_performers = top
+            self._refresh_class_stats()
+        else:
+            rows, complete = self._leaderboard_rows, True
+            for change in changes:
+                rows, ok = apply_to_top(rows, change, self._leaderboard_size)
+                complete = complete and ok
+            if not complete:
+                await self.compute_leaderboard(self._leaderboard_size)
+            elif rows != self._leaderboard_rows:
+                self._leaderboard_rows = rows
+                self.leaderboard_top = _leaderboard_lines(rows)
+
+    async def _reload_live_views(self):
+        """Reload the watched view after a reset (e.g. regrade or a large import)."""
+        if self._watch_view == "teacher":
+            if self._loaded_page is not None:
+                self._loaded_page = None
+                await self._load_page()
+            await self.get_top_performers()
+            try:
+                await queries.ensure_class_stats()
+            except Exception as e:
+                record_error(e)
+            self._refresh_class_stats()
+            await self.load_analytics()
+        else:
+            await self.compute_leaderboard(self._leaderboard_size)
+
+    def _refresh_class_stats(self):
+        """Copy the (incrementally maintained) class averages into state if they changed."""
+        if not class_stats.loaded:
+            return
+        summary = class_stats.subject_summary()
+        if summary != self.subject_stats:
+            self.subject_stats = summary
+        histogram = class_stats.grade_histogram()
+        if histogram != self.grade_distribution:
+            self.grade_distribution = histogram
+
     @rx.event
     def logout(self):
         self.teacher_logged_in = False
@@ -499,30 +1247,45 @@ class ResultState(rx.State):
 
     # --- Student Functions ---
     @rx.event
-    def search_student_result(self):
+    @instrumented
+    async def search_student_result(self):
         """Searches for a student's result by roll number."""
+        if not lookup_limiter.allow(self.router.session.client_token):
+            return rx.window_alert("Too many lookups. Please wait a few seconds and try again.")
         try:
             roll = int(self.student_roll_input)
-            # Avoid using SQLAlchemy column expressions in static analysis by
-            # fetching rows and filtering in Python.
-            try:
-                with rx.session() as session:
-                    rows = session.query(Student).all()
-            except Exception:
-                rows = []
-
-            student = next((s for s in rows if getattr(s, "roll_no", None) == roll), None)
-            if student:
-                self.student_result_data = {
-                    "name": getattr(student, "name", ""),
-                    "roll": getattr(student, "roll_no", ""),
-                    "bangla": getattr(student, "bangla_marks", ""),
-                    "english": getattr(student, "english_marks", ""),
-                    "math": getattr(student, "math_marks", ""),
-                    "science": getattr(student, "science_marks", ""),
-                    "total": getattr(student, "total_marks", ""),
-                    "grade": getattr(student, "grade", ""),
-                }
+            exam_id = _exam_id_from_choice(self.selected_exam)
+            published = exam_id is None and published_results.is_live()
+            if published:
+                # Results are published: answer from the static snapshot
+                # without touching the database.
+                data = published_results.lookup(roll)
+            else:
+                # Point lookup on the unique roll index instead of loading the
+                # whole table and scanning it in Python.
+                try:
+                    if exam_id is None:
+                        student = await result_cache.aget_or_load(("roll", roll), lambda: queries.load_student(roll))
+                    else:
+                        # Closed exams never change, so their lookups stay cached.
+                        student = await result_cache.aget_or_load(
+                            ("exam_roll", exam_id, roll), lambda: queries.load_exam_result(exam_id, roll)
+                        )
+                except Exception as e:
+                    record_error(e)
+                    student = None
+                # Current results were graded with the active policy; closed
+                # exams keep no record of theirs, so they get no grade point.
+                grader = get_active_grader() if exam_id is None else None
+                data = queries.result_data(student, grader) if student else None
+
+            if data:
+                self.student_result_data = data
+                # Percentile ranks compare with the current class, so closed
+                # exams are shown without them; published lookups skip them
+                # to stay off the database.
+                live = exam_id is None and not published
+                self.student_percentiles = await _student_percentiles(data) if live else []
                 return safe_redirect("/student_result")
             else:
                 self.student_result_data = {}
@@ -594,6 +1357,23 @@ BUTTON_PRIMARY_STYLE = {
 }
 
 # --- UI Components ---
+def timeline_controls():
+    """Upcoming/More buttons and the date range and type filter under a timeline list."""
+    return rx.vstack(
+        rx.hstack(
+            rx.button("Upcoming", on_click=ResultState.load_timeline, size="1", variant="outline"),
+            rx.button("More", on_click=ResultState.next_timeline_page, disabled=~ResultState.timeline_has_more, size="1", variant="outline"),
+        ),
+        rx.hstack(
+            rx.input(placeholder="From YYYY-MM-DD", on_change=ResultState.set_timeline_from, value=ResultState.timeline_from, size="1"),
+            rx.input(placeholder="To YYYY-MM-DD", on_change=ResultState.set_timeline_to, value=ResultState.timeline_to, size="1"),
+            rx.select(["all", "exam", "homework"], value=ResultState.timeline_type, on_change=ResultState.set_timeline_type, size="1"),
+            rx.button("Show", on_click=ResultState.filter_timeline, size="1", variant="outline"),
+        ),
+        spacing="2",
+    )
+
+
 def login_page():
     return rx.center(
         rx.box(
@@ -619,7 +1399,13 @@ def teacher_dashboard():
             rx.hstack(
                 rx.heading("Teacher Dashboard", size="8", color="#ffffff"),
                 rx.spacer(),
+                rx.button("Bulk Import", on_click=lambda: safe_redirect("/import"), style=BUTTON_PRIMARY_STYLE),
+                rx.button("Diagnostics", on_click=lambda: safe_redirect("/diagnostics"), variant="outline"),
+                rx.select(["csv", "csv.gz", "parquet", "arrow"], value=ResultState.export_format, on_change=ResultState.set_export_format),
                 rx.button("Export Results", on_click=ResultState.export_results, style=BUTTON_PRIMARY_STYLE),
+                rx.select(["zip", "pdf"], value=ResultState.marksheet_format, on_change=ResultState.set_marksheet_format),
+                rx.button("Report Cards", on_click=ResultState.build_marksheets, loading=ResultState.job_running,
+                          style=BUTTON_PRIMARY_STYLE),
                 rx.button("Logout", on_click=ResultState.logout, style={"background": "#d32f2f", "color": "white", "border_radius": "8px"}),
                 width="100%",
                 padding_bottom="20px",
@@ -627,17 +1413,30 @@ def teacher_dashboard():
 
             # Controls: subject filter + charts
             rx.hstack(
-                # Build a static default option list for compile-time. At
-                # runtime, the UI can be extended to show dynamic subjects
-                # after `ResultState.get_students` runs and populates
-                # `ResultState.students`.
+                # Options come from the subject table once the class
+                # statistics are loaded.
                 rx.select(
-                    ["All", "Bangla", "English", "Math", "Science"],
+                    ResultState.subject_options,
+                    value=ResultState.filtered_subject,
                     on_change=ResultState.filter_subject,
                     placeholder="Select Subject",
                 ),
                 rx.spacer(),
             ),
+            rx.cond(
+                ResultState.subject_toppers,
+                rx.box(
+                    rx.text("Top in ", ResultState.filtered_subject, font_weight="bold", font_size="20px"),
+                    rx.divider(),
+                    rx.foreach(
+                        ResultState.subject_toppers,
+                        lambda row: rx.text(row["roll_no"], ": ", row["name"], " - ", row["marks"], " Marks", font_size="16px"),
+                    ),
+                    style=CARD_STYLE,
+                    width="100%",
+                    margin_bottom="20px",
+                ),
+            ),
 
             # Two-column grid: Top performers and Subject Averages
             rx.grid(
@@ -646,7 +1445,7 @@ def teacher_dashboard():
                     rx.divider(),
                     rx.foreach(
                         ResultState.top_performers,
-                        lambda student: rx.text(f"{student.roll_no}: {student.name} - {student.total_marks} Marks", font_size="16px"),
+                        lambda student: rx.text(student["roll_no"], ": ", student["name"], " - ", student["total_marks"], " Marks", font_size="16px"),
                     ),
                     style=CARD_STYLE,
                 ),
@@ -655,14 +1454,30 @@ def teacher_dashboard():
                     rx.text("Subject-wise Averages", font_weight="bold", font_size="20px"),
                     rx.divider(),
                     # Show subject averages as progress bars (works without extra libs)
-                    rx.vstack(*[
-                        rx.box(
-                            rx.text(f"{sub}: {avg} Marks"),
-                            rx.progress(value=avg, max=100, color="green"),
-                            style={"margin_bottom": "10px"}
-                        )
-                        for sub, avg in ResultState.get_subject_averages_dict()
-                    ]),
+                    rx.vstack(
+                        rx.foreach(
+                            ResultState.subject_stats,
+                            lambda item: rx.box(
+                                rx.text(item[0], ": ", item[1], " Marks (min ", item[2], " / max ", item[3], ")"),
+                                rx.progress(value=item[1], max=100, color="green"),
+                                style={"margin_bottom": "10px"}
+                            ),
+                        ),
+                    ),
+                    rx.hstack(
+                        rx.foreach(
+                            ResultState.grade_distribution,
+                            lambda kv: rx.text(kv[0], ": ", kv[1], font_size="14px"),
+                        ),
+                        spacing="3",
+                    ),
+                    rx.hstack(
+                        rx.button("Rebuild statistics", on_click=ResultState.rebuild_class_stats, size="1"),
+                        rx.button("Regrade all", on_click=ResultState.regrade_all, loading=ResultState.job_running, size="1"),
+                        rx.button("Publish results", on_click=ResultState.publish_results, loading=ResultState.job_running, size="1"),
+                        margin_top="10px",
+                    ),
+                    rx.text(ResultState.job_status, font_size="14px", color="#b8bfd6"),
                     style=CARD_STYLE,
                 ),
 
@@ -680,6 +1495,7 @@ def teacher_dashboard():
                                 ),
                         )
                     ),
+                    timeline_controls(),
                     # Form to add an event quickly (binds to state inputs)
                     rx.vstack(
                         rx.input(placeholder="Event title", on_change=ResultState.set_new_event_title, value=ResultState._new_event_title, style=INPUT_STYLE),
@@ -695,12 +1511,42 @@ def teacher_dashboard():
                 columns="2",
                 spacing="3",
                 width="100%",
-                on_mount=ResultState.get_top_performers,
+                on_mount=[ResultState.watch_changes("teacher"), ResultState.get_top_performers, ResultState.load_class_stats,
+                          ResultState.load_timeline, ResultState.load_analytics],
+                on_unmount=ResultState.stop_watching,
+            ),
+
+            # Class analytics: distribution, histograms and correlations
+            rx.box(
+                rx.hstack(
+                    rx.text("Class Analytics", font_weight="bold", font_size="20px"),
+                    rx.spacer(),
+                    rx.button("Refresh", on_click=ResultState.load_analytics, size="1", variant="outline"),
+                    width="100%",
+                ),
+                rx.divider(),
+                _analytics_table(["Subject", "Mean", "Median", "Std dev", "P25", "P75", "P90"], ResultState.analytics_summary),
+                rx.grid(
+                    rx.box(
+                        rx.text("Marks histogram (students per range)", font_size="14px", color="#b8bfd6"),
+                        _analytics_table(["Marks"] + [label for label, _ in SUBJECTS], ResultState.analytics_histogram),
+                    ),
+                    rx.box(
+                        rx.text("Correlation between subjects", font_size="14px", color="#b8bfd6"),
+                        _analytics_table([""] + [label for label, _ in SUBJECTS], ResultState.analytics_correlation),
+                    ),
+                    columns="2",
+                    spacing="3",
+                    margin_top="10px",
+                ),
+                style=CARD_STYLE,
+                width="100%",
+                margin_top="20px",
             ),
 
             # Student Data Input Form
             rx.box(
-                rx.heading("Add New Student", size="6", margin_top="30px", margin_bottom="20px"),
+                rx.heading("Add or Correct a Student", size="6", margin_top="30px", margin_bottom="20px"),
                 rx.form(
                     rx.vstack(
                         rx.input(placeholder="Student Name", on_change=ResultState.set_student_name, value=ResultState.student_name, style=INPUT_STYLE),
@@ -713,7 +1559,12 @@ def teacher_dashboard():
                             width="100%",
                             spacing="2",
                         ),
-                        rx.button("Add Student", on_click=ResultState.add_student, style=BUTTON_PRIMARY_STYLE),
+                        rx.hstack(
+                            rx.button("Add Student", on_click=ResultState.add_student, style=BUTTON_PRIMARY_STYLE),
+                            rx.button("Update Student", on_click=ResultState.update_student, style=BUTTON_PRIMARY_STYLE),
+                            spacing="2",
+                        ),
+                        rx.text("Update keeps any blank field as stored and recomputes the total and grade.", color="#b8bfd6", font_size="12px"),
                         spacing="2",
                         width="100%",
                     )
@@ -725,13 +1576,29 @@ def teacher_dashboard():
             # All Students Table
             rx.box(
                 rx.heading("All Student Results", size="6", margin_top="30px", margin_bottom="20px"),
+                rx.text(ResultState.cache_summary, color="#b8bfd6", font_size="12px"),
+                rx.hstack(
+                    rx.input(placeholder="Search roll, name or grade", on_change=ResultState.set_search_query, value=ResultState.search_query, style=INPUT_STYLE),
+                    rx.button("Search", on_click=ResultState.get_students, style=BUTTON_PRIMARY_STYLE),
+                    width="100%",
+                    margin_bottom="10px",
+                ),
+                rx.hstack(
+                    rx.input(placeholder="Rolls to delete, e.g. 5, 7, 10-20", on_change=ResultState.set_delete_selection, value=ResultState.delete_selection, style=INPUT_STYLE),
+                    rx.button("Delete Selected", on_click=ResultState.delete_selected, style={"background": "red", "color": "white", "border_radius": "8px"}),
+                    width="100%",
+                    margin_bottom="10px",
+                ),
+                # Only the current page is held in state and rendered; the
+                # scroll area keeps the table height fixed.
+                rx.scroll_area(
                 rx.table.root(
                     rx.table.header(
                         rx.table.row(
-                            rx.table.column_header_cell("Roll No."),
-                            rx.table.column_header_cell("Name"),
-                            rx.table.column_header_cell("Total Marks"),
-                            rx.table.column_header_cell("Grade"),
+                            rx.table.column_header_cell(rx.button("Roll No.", variant="ghost", on_click=ResultState.sort_students("roll_no"))),
+                            rx.table.column_header_cell(rx.button("Name", variant="ghost", on_click=ResultState.sort_students("name"))),
+                            rx.table.column_header_cell(rx.button("Total Marks", variant="ghost", on_click=ResultState.sort_students("total_marks"))),
+                            rx.table.column_header_cell(rx.button("Grade", variant="ghost", on_click=ResultState.sort_students("grade"))),
                             rx.table.column_header_cell("Actions"),
                         )
                     ),
@@ -740,16 +1607,35 @@ def teacher_dashboard():
                         rx.foreach(
                             ResultState.students,
                             lambda student: rx.table.row(
-                                rx.table.cell(student.roll_no),
-                                rx.table.cell(student.name),
-                                rx.table.cell(student.total_marks),
-                                rx.table.cell(student.grade),
-                                rx.table.cell(rx.button("Delete", on_click=lambda ev, s=student: ResultState.delete_student(s.roll_no), style={"background": "red", "color": "white", "border_radius": "5px"})),
+                                rx.table.cell(student["roll_no"]),
+                                rx.table.cell(student["name"]),
+                                rx.table.cell(student["total_marks"]),
+                                rx.table.cell(student["grade"]),
+                                rx.table.cell(
+                                    rx.hstack(
+                                        rx.button("Edit", on_click=lambda ev, s=student: ResultState.edit_student(s["roll_no"]), style={"background": "gray", "color": "white", "border_radius": "5px"}),
+                                        rx.button("Delete", on_click=lambda ev, s=student: ResultState.delete_student(s["roll_no"]), style={"background": "red", "color": "white", "border_radius": "5px"}),
+                                        spacing="2",
+                                    )
+                                ),
                             ),
                         ),
                     ),
                     on_mount=ResultState.get_students,
                 ),
+                type="auto",
+                scrollbars="vertical",
+                style={"max_height": "600px"},
+                ),
+                rx.hstack(
+                    rx.button("Previous", on_click=ResultState.prev_page, disabled=ResultState.page_number <= 1),
+                    rx.text("Page ", ResultState.page_number),
+                    rx.button("Next", on_click=ResultState.next_page, disabled=~ResultState.has_next_page),
+                    justify="center",
+                    align="center",
+                    margin_top="10px",
+                    width="100%",
+                ),
                 style=CARD_STYLE,
                 width="100%",
             ),
@@ -762,6 +1648,130 @@ def teacher_dashboard():
         style=STYLE_CONFIG,
     )
 
+def import_page():
+    return rx.center(
+        rx.cond(
+            ResultState.teacher_logged_in,
+            rx.box(
+                rx.heading("Bulk Import Marks", size="7", margin_bottom="10px"),
+                rx.text(
+                    "Upload a CSV or XLSX file with the columns roll, name, bangla, english, math and science.",
+                    color="#b8bfd6",
+                    margin_bottom="10px",
+                ),
+                rx.hstack(
+                    rx.switch(checked=ResultState.import_update, on_change=ResultState.set_import_update),
+                    rx.text("Update existing roll numbers (only roll is required; blank cells keep their stored value)", color="#b8bfd6"),
+                    align="center",
+                    margin_bottom="20px",
+                ),
+                rx.upload(
+                    rx.vstack(
+                        rx.text("Drag a file here or click to select"),
+                        rx.foreach(rx.selected_files("marks_upload"), rx.text),
+                    ),
+                    id="marks_upload",
+                    accept={
+                        "text/csv": [".csv"],
+                        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": [".xlsx"],
+                    },
+                    max_files=1,
+                    border="1px dashed rgba(255,255,255,0.3)",
+                    padding="30px",
+                    border_radius="12px",
+                ),
+                rx.hstack(
+                    rx.button(
+                        "Import",
+                        on_click=ResultState.handle_import(rx.upload_files(upload_id="marks_upload")),
+                        loading=ResultState.job_running,
+                        style=BUTTON_PRIMARY_STYLE,
+                    ),
+                    rx.button("Back to Dashboard", on_click=lambda: safe_redirect("/teacher_dashboard"), style={"background": "gray", "color": "white", "border_radius": "8px"}),
+                    margin_top="20px",
+                ),
+                rx.cond(
+                    ResultState.job_running,
+                    rx.text(ResultState.job_status, margin_top="20px", color="#b8bfd6"),
+                    rx.text(ResultState.import_summary, margin_top="20px", font_weight="bold"),
+                ),
+                rx.vstack(
+                    rx.foreach(ResultState.import_errors, lambda err: rx.text(err, color="#ff8a80", font_size="14px")),
+                ),
+                style=CARD_STYLE,
+                width="700px",
+            ),
+            rx.text("Please log in as a teacher first.", color="red", font_size="20px"),
+        ),
+        height="100vh",
+        style=STYLE_CONFIG,
+    )
+
+def _analytics_table(headers: list, rows) -> rx.Component:
+    """A table of preformatted rows (one cell per header)."""
+    return rx.table.root(
+        rx.table.header(rx.table.row(*[rx.table.column_header_cell(header) for header in headers])),
+        rx.table.body(
+            rx.foreach(rows, lambda row: rx.table.row(*[rx.table.cell(row[i]) for i in range(len(headers))])),
+        ),
+        size="1",
+    )
+
+
+DIAGNOSTICS_COLUMNS = (
+    ("Handler", "handler"),
+    ("Calls", "calls"),
+    ("Errors", "errors"),
+    ("Avg ms", "avg_ms"),
+    ("p95 ms", "p95_ms"),
+    ("Queries/call", "queries"),
+    ("DB ms/call", "query_ms"),
+    ("Delta bytes/call", "delta_bytes"),
+)
+
+
+def diagnostics_page():
+    return rx.center(
+        rx.cond(
+            ResultState.teacher_logged_in,
+            rx.box(
+                rx.hstack(
+                    rx.heading("Diagnostics", size="7"),
+                    rx.spacer(),
+                    rx.button("Refresh", on_click=ResultState.load_diagnostics, style=BUTTON_PRIMARY_STYLE),
+                    rx.button("Back to Dashboard", on_click=lambda: safe_redirect("/teacher_dashboard"), style={"background": "gray", "color": "white", "border_radius": "8px"}),
+                    width="100%",
+                    margin_bottom="20px",
+                ),
+                rx.text("Per-handler latency, database and state-delta metrics for this server process. "
+                        "The same data is exported for Prometheus at /metrics.", color="#b8bfd6"),
+                rx.text(ResultState.cache_summary, font_size="14px", color="#b8bfd6", margin_bottom="10px"),
+                rx.table.root(
+                    rx.table.header(
+                        rx.table.row(*[rx.table.column_header_cell(label) for label, _ in DIAGNOSTICS_COLUMNS]),
+                    ),
+                    rx.table.body(
+                        rx.foreach(
+                            ResultState.diagnostics_rows,
+                            lambda row: rx.table.row(*[rx.table.cell(row[key]) for _, key in DIAGNOSTICS_COLUMNS]),
+                        ),
+                    ),
+                ),
+                rx.heading("Recent errors", size="5", margin_top="20px"),
+                rx.vstack(
+                    rx.foreach(ResultState.diagnostics_errors, lambda err: rx.text(err, color="#ff8a80", font_size="14px")),
+                ),
+                style=CARD_STYLE,
+                width="1000px",
+                on_mount=ResultState.load_diagnostics,
+            ),
+            rx.text("Please log in as a teacher first.", color="red", font_size="20px"),
+        ),
+        min_height="100vh",
+        style=STYLE_CONFIG,
+    )
+
+
 def student_page():
     return rx.center(
         # Left: quick check box
@@ -769,6 +1779,7 @@ def student_page():
             rx.heading("Check Your Result", size="7", margin_bottom="20px"),
             rx.vstack(
                 rx.input(placeholder="Enter Roll Number", type="number", on_change=ResultState.set_student_roll_input, style=INPUT_STYLE),
+                rx.select(ResultState.exam_choices, value=ResultState.selected_exam, on_change=ResultState.set_selected_exam, width="100%"),
                 rx.button("Check Result", on_click=ResultState.search_student_result, style=BUTTON_PRIMARY_STYLE),
                 rx.button("Go to Home", on_click=lambda: safe_redirect("/"), style={"background": "gray", "color": "white", "border_radius": "8px"}),
                 spacing="2",
@@ -787,6 +1798,7 @@ def student_page():
                         lambda ev: rx.text(ev),
                     )
                 ),
+                timeline_controls(),
                 style=CARD_STYLE,
                 width="400px",
             ),
@@ -804,7 +1816,8 @@ def student_page():
         ),
 
         # Populate data on mount
-        on_mount=[ResultState.get_students, ResultState.compute_leaderboard],
+        on_mount=[ResultState.watch_changes("student"), ResultState.compute_leaderboard, ResultState.load_exam_choices, ResultState.load_timeline],
+        on_unmount=ResultState.stop_watching,
         height="100vh",
         style=STYLE_CONFIG,
     )
@@ -820,6 +1833,10 @@ def student_result_page():
                     rx.card(rx.text(f"Roll: {ResultState.student_result_data['roll']}"), style=CARD_STYLE),
                     rx.card(rx.text(f"Total Marks: {ResultState.student_result_data['total']}"), style=CARD_STYLE),
                     rx.card(rx.text(f"Grade: {ResultState.student_result_data['grade']}"), style=CARD_STYLE),
+                    rx.cond(
+                        ResultState.student_result_data["grade_point"] != "",
+                        rx.card(rx.text(f"Grade Point: {ResultState.student_result_data['grade_point']}"), style=CARD_STYLE),
+                    ),
                     rx.card(rx.text(f"Bangla: {ResultState.student_result_data['bangla']}"), style=CARD_STYLE),
                     rx.card(rx.text(f"English: {ResultState.student_result_data['english']}"), style=CARD_STYLE),
                     rx.card(rx.text(f"Math: {ResultState.student_result_data['math']}"), style=CARD_STYLE),
@@ -828,6 +1845,20 @@ def student_result_page():
                     spacing="2",
                     width="100%"
                 ),
+                rx.cond(
+                    ResultState.student_percentiles,
+                    rx.box(
+                        rx.text("Share of the class at or below your marks", font_weight="bold", margin_top="20px"),
+                        rx.hstack(
+                            rx.foreach(
+                                ResultState.student_percentiles,
+                                lambda item: rx.card(rx.text(item[0], ": ", item[1]), style=CARD_STYLE),
+                            ),
+                            spacing="2",
+                            wrap="wrap",
+                        ),
+                    ),
+                ),
                 rx.button("Check Another Result", on_click=lambda: safe_redirect("/student"), margin_top="20px", style=BUTTON_PRIMARY_STYLE),
                 style=CARD_STYLE,
                 width="800px"
@@ -852,16 +1883,34 @@ def index():
     )
 
 # --- App Setup ---
+from resultdashboard_reflex.api import api
+
 app = rx.App(
     theme=rx.theme(
         accent_color="violet",
         gray_color="slate",
         appearance="dark",
-    )
+    ),
+    api_transformer=api,
 )
 
+# Scheduled snapshots of the SQLite database, and picking up restores
+# made from the command line (see backup.py).
+from resultdashboard_reflex.backup import restore_watcher
+from resultdashboard_reflex.backup import scheduler as backup_scheduler
+
+app.register_lifespan_task(backup_scheduler)
+app.register_lifespan_task(restore_watcher)
+
+# Policy changes made with the grading CLI (see grading.py).
+from resultdashboard_reflex.grading import refresher as grader_refresher
+
+app.register_lifespan_task(grader_refresher)
+
 app.add_page(index, route="/")
 app.add_page(login_page, route="/login")
 app.add_page(teacher_dashboard, route="/teacher_dashboard")
+app.add_page(import_page, route="/import")
+app.add_page(diagnostics_page, route="/diagnostics")
 app.add_page(student_page, route="/student")
 app.add_page(student_result_page, route="/student_result")
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""Ranked, typo-tolerant student name search.
+
+On SQLite, names are indexed twice, both kept in step with every insert,
+delete and name change by SQLite itself, whichever code path writes the row:
+
+* ``ix_student_name_nocase``, a case-insensitive B-tree that answers
+  ``LIKE 'query%'`` as a range scan;
+* ``student_name_fts``, an FTS5 table with the trigram tokenizer that holds
+  no copy of the data (``content='student'``), maintained by triggers.
+
+A search collects candidates in up to three indexed steps, stopping once it
+has ``limit`` of them:
+
+1. names starting with the query, in name order (the B-tree);
+2. names containing it, e.g. ``rahm`` -> "Abdur Rahman";
+3. names containing either half of it, which finds any name within one typo
+   of the query (the typo can only be in one half), e.g. ``rahmna``.
+
+No step asks FTS5 to rank, so each stops after ``CANDIDATES`` rows rather
+than scoring every match. The candidates are ordered here: name starts with
+the query, a word in it does, it contains the query (each by name), then
+fuzzy matches by trigram similarity (weak ones are dropped). Queries shorter than three
+characters cannot use trigrams and only get step 1, as do databases without
+the index (other backends, or a SQLite file made before it existed:
+``alembic upgrade head`` or :func:`ensure_index`).
+"""
+import re
+
+from sqlalchemy import DDL, event, text
+
+FTS_TABLE = "student_name_fts"
+# Rows fetched per step and re-ranked in Python.
+CANDIDATES = 200
+# Fuzzy matches below this trigram similarity (0..1) are dropped.
+MIN_SIMILARITY = 0.5
+
+CREATE_STATEMENTS = (
+    "CREATE INDEX IF NOT EXISTS ix_student_name_nocase ON student (name COLLATE NOCASE)",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    f"USING fts5(name, content='student', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON student BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, name) VALUES (new.id, new.name); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON student BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name) VALUES ('delete', old.id, old.name); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name ON student BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name) VALUES ('delete', old.id, old.name); "
+    f"INSERT INTO {FTS_TABLE}(rowid, name) VALUES (new.id, new.name); END",
+)
+REBUILD_STATEMENT = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+_MATCH_SQL = text(
+    f"SELECT student.id, student.roll_no, student.name, student.total_marks, student.grade "
+    f"FROM {FTS_TABLE} JOIN student ON student.id = {FTS_TABLE}.rowid "
+    f"WHERE {FTS_TABLE} MATCH :match LIMIT :limit"
+)
+# SQLite's LIKE is already case-insensitive, and with the NOCASE index both
+# the filter and the order are an index range scan.
+_PREFIX_SQL = {
+    "sqlite": text(
+        "SELECT id, roll_no, name, total_marks, grade FROM student "
+        "WHERE name LIKE :pattern ESCAPE '\\' ORDER BY name COLLATE NOCASE, id LIMIT :limit"
+    ),
+    "default": text(
+        "SELECT id, roll_no, name, total_marks, grade FROM student "
+        "WHERE name ILIKE :pattern ESCAPE '\\' ORDER BY lower(name), id LIMIT :limit"
+    ),
+}
+_INDEX_EXISTS_SQL = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name")
+
+
+def install(table) -> None:
+    """Create the index and triggers whenever ``table`` is created on SQLite."""
+    for statement in CREATE_STATEMENTS:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+
+def ensure_index(connection) -> bool:
+    """Create and fill the index on an existing SQLite database; True if it was missing."""
+    if connection.execute(_INDEX_EXISTS_SQL, {"name": FTS_TABLE}).first() is not None:
+        return False
+    for statement in CREATE_STATEMENTS:
+        connection.execute(text(statement))
+    connection.execute(text(REBUILD_STATEMENT))
+    return True
+
+
+def normalize(query: str) -> str:
+    return " ".join(str(query or "").lower().split())
+
+
+def trigrams(value: str) -> set:
+    """Trigrams of ``value`` padded like pg_trgm, so word starts weigh more."""
+    grams = set()
+    for word in re.findall(r"\w+", normalize(value)):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(query: str, name: str) -> float:
+    """Share of the trigrams of ``query`` found in ``name`` (0..1).
+
+    Like pg_trgm's word similarity, the other words of a longer name do not
+    count against it.
+    """
+    wanted = trigrams(query)
+    if not wanted:
+        return 0.0
+    return len(wanted & trigrams(name)) / len(wanted)
+
+
+def _phrase(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def like_prefix(value: str) -> str:
+    """LIKE pattern (escape character ``\\``) matching values starting with ``value``."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def fuzzy_expression(query: str) -> str:
+    """FTS5 MATCH for names containing either half of ``query``.
+
+    A name within one typo of the query still contains one half unchanged.
+    Halves are at least three characters (the trigram minimum), so for
+    queries under six characters they overlap.
+    """
+    middle = max(3, len(query) // 2)
+    halves = {query[:middle], query[-max(3, len(query) - middle):]}
+    return " OR ".join(_phrase(half) for half in sorted(halves))
+
+
+def rank(rows, query: str) -> list:
+    """Order candidate rows (dicts with ``name``) best match first, dropping weak fuzzy ones."""
+    ranked = []
+    for row in rows:
+        name = normalize(row.get("name"))
+        if name.startswith(query):
+            ranked.append((0, 0, name, row["id"], row))
+        elif any(word.startswith(query) for word in name.split()) or f" {query}" in name:
+            ranked.append((1, 0, name, row["id"], row))
+        elif query in name:
+            ranked.append((2, 0, name, row["id"], row))
+        else:
+            score = similarity(query, name)
+            if score >= MIN_SIMILARITY:
+                ranked.append((3, -score, name, row["id"], row))
+    ranked.sort(key=lambda item: item[:4])
+    return [item[-1] for item in ranked]
+
+
+async def index_available(session) -> bool:
+    """Whether the database behind the async ``session`` has the name index."""
+    if session.bind.dialect.name != "sqlite":
+        return False
+    return (await session.execute(_INDEX_EXISTS_SQL, {"name": FTS_TABLE})).first() is not None
+
+
+async def search_names(session, query: str, limit: int, indexed: bool = True) -> list:
+    """Up to ``limit`` students (row-view dicts) whose name best matches ``query``.
+
+    ``session`` is an async session; pass ``indexed=False`` when
+    :func:`index_available` says the index is missing.
+    """
+    query = normalize(query)
+    if not query:
+        return []
+    rows = {}
+
+    async def collect(statement, limit=CANDIDATES, **params):
+        result = await session.execute(statement, {**params, "limit": limit})
+        for row in result:
+            rows.setdefault(row.id, dict(row._mapping))
+
+    # Names starting with the query rank first, in name order, so the first
+    # ``limit`` of them are final.
+    dialect = session.bind.dialect.name
+    await collect(_PREFIX_SQL.get(dialect, _PREFIX_SQL["default"]), limit, pattern=like_prefix(query))
+    if indexed and len(query) >= 3:
+        if len(rows) < limit:
+            await collect(_MATCH_SQL, match=_phrase(query))
+        if len(rows) < limit:
+            await collect(_MATCH_SQL, match=fuzzy_expression(query))
+    return rank(rows.values(), query)[:limit]
@@ -0,0 +1,136 @@
+"""Incrementally maintained class statistics.
+
+The dashboard cards used to re-sum every subject column over the whole class
+on each render. ``ClassStats`` keeps the aggregates instead: per-subject
+sums, a per-subject frequency table of marks (so min/max survive deletes
+without a rescan) and a grade histogram. ``add``/``remove`` are O(1) in the
+class size; ``rebuild`` replaces everything with the result of two GROUP BY
+queries when the process starts or the numbers need recovering.
+"""
+import threading
+from collections import Counter
+from typing import Optional
+
+# (display label, Student column) for every subject on the marksheet.
+SUBJECTS = (
+    ("Bangla", "bangla_marks"),
+    ("English", "english_marks"),
+    ("Math", "math_marks"),
+    ("Science", "science_marks"),
+)
+
+GRADES = ("A+", "A", "B", "C", "Fail")
+
+
+def _value(row, field):
+    if isinstance(row, dict):
+        return row.get(field)
+    return getattr(row, field, None)
+
+
+def row_values(row) -> dict:
+    """Copy the fields the aggregates need, e.g. before a row is deleted."""
+    values = {field: _value(row, field) for _, field in SUBJECTS}
+    values["grade"] = _value(row, "grade")
+    return values
+
+
+class ClassStats:
+    """Aggregates over the student table, updated as rows come and go."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.loaded = False
+            self.count = 0
+            self.sums = {label: 0 for label, _ in SUBJECTS}
+            self.frequencies = {label: Counter() for label, _ in SUBJECTS}
+            self.grades = Counter()
+
+    def _apply(self, row, sign: int) -> None:
+        with self._lock:
+            if not self.loaded:
+                # Nothing to maintain yet; the next rebuild will include it.
+                return
+            self.count += sign
+            for label, field in SUBJECTS:
+                mark = _value(row, field) or 0
+                self.sums[label] += sign * mark
+                freq = self.frequencies[label]
+                freq[mark] += sign
+                if freq[mark] <= 0:
+                    del freq[mark]
+            grade = _value(row, "grade") or "Fail"
+            self.grades[grade] += sign
+            if self.grades[grade] <= 0:
+                del self.grades[grade]
+
+    def add(self, row) -> None:
+        """Account for a newly inserted student (object or dict)."""
+        self._apply(row, 1)
+
+    def remove(self, row) -> None:
+        """Account for a deleted student (object or dict)."""
+        self._apply(row, -1)
+
+    def rebuild(self, frequencies: dict, grade_counts) -> None:
+        """Replace every aggregate.
+
+        ``frequencies`` maps subject name to a Counter of mark -> students
+        (see ``subjects.mark_frequencies``); ``grade_counts`` yields
+        ``(grade, students)`` pairs. Only the subjects in ``SUBJECTS`` are
+        written today (see subjects.py), so the names match its labels.
+        """
+        with self._lock:
+            merged = {label: Counter() for label, _ in SUBJECTS}
+            for label, freq in frequencies.items():
+                merged[label] = Counter(freq)
+            self.frequencies = merged
+            self.sums = {label: sum(m * n for m, n in freq.items()) for label, freq in merged.items()}
+            self.grades = Counter()
+            for grade, n in grade_counts:
+                self.grades[grade or "Fail"] += n
+            self.count = sum(self.grades.values())
+            self.loaded = True
+
+    def averages(self) -> list:
+        """Return ``(subject, floored average)`` pairs."""
+        with self._lock:
+            result = []
+            for label, freq in self.frequencies.items():
+                students = sum(freq.values())
+                result.append((label, self.sums.get(label, 0) // students if students > 0 else 0))
+            return result
+
+    def subject_summary(self) -> list:
+        """Return ``(subject, average, min, max)`` tuples."""
+        with self._lock:
+            summary = []
+            for label, average in self.averages():
+                freq = self.frequencies[label]
+                low = min(freq) if freq else 0
+                high = max(freq) if freq else 0
+                summary.append((label, average, low, high))
+            return summary
+
+    def percentile_rank(self, label: str, mark) -> Optional[float]:
+        """Share (0-100) of the class scoring at or below ``mark`` in a subject; None if empty."""
+        with self._lock:
+            freq = self.frequencies.get(label)
+            students = sum(freq.values()) if freq else 0
+            if not students:
+                return None
+            at_or_below = sum(n for m, n in freq.items() if m <= (mark or 0))
+            return 100.0 * at_or_below / students
+
+    def grade_histogram(self) -> dict:
+        with self._lock:
+            dist = {grade: 0 for grade in GRADES}
+            dist.update(self.grades)
+            return dist
+
+
+class_stats = ClassStats()
@@ -0,0 +1,152 @@
+"""Normalized subject/mark storage and per-subject queries.
+
+Marks live in the ``mark`` table, one row per (student, subject), so any
+number of subjects can be stored and per-subject questions become indexed
+GROUP BY / ORDER BY queries over ``ix_mark_subject_marks`` instead of loops
+over Student attributes. The four legacy Student columns are still written
+alongside (dual write) so existing readers keep working.
+
+The tables can hold any number of subjects, but this step only mirrors the
+four legacy columns: :func:`subject_ids` creates and returns just the
+subjects in ``stats.SUBJECTS``, and every writer (add, import, corrections)
+as well as ``ClassStats`` is keyed on those columns. A fifth subject needs a
+Student column and a ``SUBJECTS`` entry until the writers are driven from
+the subject table.
+"""
+import threading
+from collections import Counter
+
+from sqlalchemy import delete, event, func, literal, select
+
+from resultdashboard_reflex.models import Mark, Student, Subject
+from resultdashboard_reflex.stats import SUBJECTS
+
+_subject_ids: dict = {}
+_subject_ids_lock = threading.Lock()
+
+
+def _remember_subject_ids(session) -> None:
+    ids = session.info.pop("subject_ids", None)
+    if ids:
+        with _subject_ids_lock:
+            _subject_ids.update(ids)
+
+
+def _forget_subject_ids(session) -> None:
+    session.info.pop("subject_ids", None)
+
+
+def subject_ids(session) -> dict:
+    """Return ``{legacy column: subject id}``, creating missing subjects.
+
+    The ids are only cached once ``session`` commits: a subject created (or
+    read) inside a transaction that rolls back may never exist.
+    """
+    with _subject_ids_lock:
+        if len(_subject_ids) == len(SUBJECTS):
+            return dict(_subject_ids)
+        existing = {s.legacy_column: s.id for s in session.query(Subject).all() if s.legacy_column}
+        for position, (label, field) in enumerate(SUBJECTS):
+            if field not in existing:
+                subject = Subject()
+                subject.name = label
+                subject.position = position
+                subject.legacy_column = field
+                session.add(subject)
+                session.flush()
+                existing[field] = subject.id
+    ids = {field: existing[field] for _, field in SUBJECTS}
+    session.info["subject_ids"] = ids
+    if not event.contains(session, "after_commit", _remember_subject_ids):
+        event.listen(session, "after_commit", _remember_subject_ids)
+        event.listen(session, "after_rollback", _forget_subject_ids)
+    return dict(ids)
+
+
+def write_marks(session, student_id: int, marks: dict) -> None:
+    """Insert the mark rows for one student (``marks`` keyed by legacy column)."""
+    ids = subject_ids(session)
+    session.execute(
+        Mark.__table__.insert(),
+        [{"student_id": student_id, "subject_id": ids[field], "marks": marks.get(field)} for field in ids],
+    )
+
+
+def write_marks_for_rolls(session, rolls) -> None:
+    """Insert mark rows for freshly inserted students, one INSERT ... SELECT per subject."""
+    if not rolls:
+        return
+    student = Student.__table__
+    for field, subject_id in subject_ids(session).items():
+        session.execute(
+            Mark.__table__.insert().from_select(
+                ["student_id", "subject_id", "marks"],
+                select(student.c.id, literal(subject_id), student.c[field]).where(student.c.roll_no.in_(rolls)),
+            )
+        )
+
+
+def delete_marks(session, student_ids) -> None:
+    if student_ids:
+        session.execute(delete(Mark.__table__).where(Mark.__table__.c.student_id.in_(list(student_ids))))
+
+
+def backfill_marks(session) -> int:
+    """Create mark rows for students that have none yet; return rows added."""
+    student = Student.__table__
+    mark = Mark.__table__
+    added = 0
+    for field, subject_id in subject_ids(session).items():
+        missing = select(student.c.id, literal(subject_id), student.c[field]).where(
+            ~select(mark.c.id)
+            .where(mark.c.student_id == student.c.id, mark.c.subject_id == subject_id)
+            .exists()
+        )
+        result = session.execute(mark.insert().from_select(["student_id", "subject_id", "marks"], missing))
+        added += result.rowcount or 0
+    session.commit()
+    return added
+
+
+def subject_names(session) -> list:
+    return [name for (name,) in session.query(Subject.name).order_by(Subject.position, Subject.id).all()]
+
+
+def mark_frequencies(session) -> dict:
+    """Return ``{subject name: Counter(mark -> students)}`` in one GROUP BY."""
+    rows = session.execute(
+        select(Subject.name, Mark.marks, func.count())
+        .select_from(Mark)
+        .join(Subject, Subject.id == Mark.subject_id)
+        .group_by(Subject.id, Subject.name, Subject.position, Mark.marks)
+        .order_by(Subject.position, Subject.id)
+    ).all()
+    frequencies = {}
+    for name, marks, count in rows:
+        frequencies.setdefault(name, Counter())[marks or 0] += count
+    return frequencies
+
+
+def subject_averages(session) -> list:
+    """Return ``(subject, average, min, max, students)`` per subject."""
+    rows = session.execute(
+        select(Subject.name, func.avg(Mark.marks), func.min(Mark.marks), func.max(Mark.marks), func.count(Mark.id))
+        .select_from(Mark)
+        .join(Subject, Subject.id == Mark.subject_id)
+        .group_by(Subject.id)
+        .order_by(Subject.position, Subject.id)
+    ).all()
+    return [(name, int(avg or 0), low or 0, high or 0, count) for name, avg, low, high, count in rows]
+
+
+def subject_toppers(session, subject_name: str, n: int = 10) -> list:
+    """Return the top ``n`` students in one subject as row dicts."""
+    rows = session.execute(
+        select(Student.roll_no, Student.name, Mark.marks)
+        .join(Mark, Mark.student_id == Student.id)
+        .join(Subject, Subject.id == Mark.subject_id)
+        .where(Subject.name == subject_name)
+        .order_by(Mark.marks.desc())
+        .limit(n)
+    ).all()
+    return [{"roll_no": roll, "name": name, "marks": marks} for roll, name, marks in rows]
@@ -0,0 +1,134 @@
+"""Synthetic class generator for benchmarks and load tests.
+
+Fills the ``student`` and ``mark`` tables with realistic rows: names drawn
+from common Bangladeshi given names and surnames, and marks that correlate
+across subjects (each student has an overall ability plus per-subject
+noise), clipped to 0-100 and graded with the active grading policy.
+Output is deterministic for a given ``seed``.
+
+Run from the project root:
+
+    python -m resultdashboard_reflex.synthetic --rows 100000 [--replace] [--seed 0]
+"""
+import argparse
+import random
+import sys
+import time
+
+from sqlalchemy import delete, func, select
+
+from resultdashboard_reflex.grading import get_active_grader
+from resultdashboard_reflex.models import Mark, Student
+from resultdashboard_reflex.queries import insert_students
+from resultdashboard_reflex.subjects import write_marks_for_rolls
+
+GIVEN_NAMES = (
+    "Abdullah", "Afsana", "Anika", "Arif", "Ayesha", "Farhan", "Fatema", "Habib", "Imran", "Jannat",
+    "Kamrul", "Lamia", "Mahmud", "Maliha", "Mehedi", "Nabila", "Nafis", "Nusrat", "Rafi", "Rahim",
+    "Riya", "Sabbir", "Sadia", "Shakib", "Sumaiya", "Tahmid", "Tanvir", "Tasnim", "Zarin", "Zubair",
+)
+SURNAMES = (
+    "Ahmed", "Akter", "Alam", "Begum", "Chowdhury", "Das", "Haque", "Hasan", "Hossain", "Islam",
+    "Kabir", "Karim", "Khan", "Mahmud", "Miah", "Rahman", "Roy", "Saha", "Sarker", "Uddin",
+)
+# Per-subject mean shift, so subjects differ in difficulty.
+SUBJECT_OFFSETS = {"bangla_marks": 4, "english_marks": -3, "math_marks": -6, "science_marks": 0}
+MEAN_MARK = 62
+SPREAD = 16
+
+
+def iter_students(n: int, start_roll: int = 1, seed: int = 0):
+    """Yield ``n`` ungraded student row dicts with consecutive roll numbers."""
+    rnd = random.Random(seed)
+    for roll in range(start_roll, start_roll + n):
+        ability = rnd.gauss(0, 1)
+        row = {"roll_no": roll, "name": f"{rnd.choice(GIVEN_NAMES)} {rnd.choice(SURNAMES)}"}
+        for field, offset in SUBJECT_OFFSETS.items():
+            score = MEAN_MARK + offset + SPREAD * (0.75 * ability + 0.66 * rnd.gauss(0, 1))
+            row[field] = min(100, max(0, int(round(score))))
+        yield row
+
+
+def generate(session, n: int, seed: int = 0, replace: bool = False, chunk_size: int = 5000, progress=None) -> dict:
+    """Insert ``n`` synthetic students (and their marks); return a report."""
+    from resultdashboard_reflex.cache import result_cache
+    from resultdashboard_reflex.changefeed import feed
+    from resultdashboard_reflex.publish import retract
+    from resultdashboard_reflex.stats import class_stats
+
+    start = time.perf_counter()
+    if replace:
+        session.execute(delete(Mark.__table__))
+        session.execute(delete(Student.__table__))
+        session.commit()
+        start_roll = 1
+    else:
+        start_roll = (session.execute(select(func.max(Student.roll_no))).scalar() or 0) + 1
+
+    grader = get_active_grader()
+    fields = grader.fields
+    inserted = 0
+    chunk = []
+
+    def flush():
+        graded = grader.grade_many([[row[field] for field in fields] for row in chunk])
+        for row, (total, grade) in zip(chunk, graded):
+            row["total_marks"] = total
+            row["grade"] = grade
+        insert_students(session, chunk)
+        write_marks_for_rolls(session, [row["roll_no"] for row in chunk])
+        session.commit()
+
+    try:
+        for row in iter_students(n, start_roll, seed):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                flush()
+                inserted += len(chunk)
+                chunk = []
+                if progress is not None:
+                    progress(inserted)
+        if chunk:
+            flush()
+            inserted += len(chunk)
+    finally:
+        result_cache.clear()
+        class_stats.reset()
+        retract()
+        feed.publish("reset")
+
+    elapsed = time.perf_counter() - start
+    return {
+        "inserted": inserted,
+        "first_roll": start_roll,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(inserted / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv=None) -> int:
+    from resultdashboard_reflex import db
+
+    parser = argparse.ArgumentParser(description="Fill the database with a synthetic class.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replace", action="store_true", help="delete existing students first")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    with db.session() as session:
+        report = generate(
+            session,
+            args.rows,
+            seed=args.seed,
+            replace=args.replace,
+            chunk_size=args.chunk_size,
+            progress=lambda n: print(f"  {n} rows", file=sys.stderr),
+        )
+    print(f"Inserted {report['inserted']} students from roll {report['first_roll']} in "
+          f"{report['seconds']}s ({report['rows_per_sec']} rows/sec).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
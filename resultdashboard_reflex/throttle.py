@@ -0,0 +1,111 @@
+"""Load shedding and request coalescing for the result lookup path.
+
+:class:`SingleFlight` merges concurrent calls for the same key into one: the
+first caller runs the load, the others await its result. The result cache
+uses it on misses, so a burst of lookups for one roll costs a single query.
+
+:class:`TokenBucketLimiter` keeps one token bucket per client. Each lookup
+takes a token; buckets refill at ``rate`` tokens per second up to ``burst``.
+A client with an empty bucket is turned away before any work is done.
+
+Both keep counters (merged / shed) that the teacher dashboard shows.
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class SingleFlight:
+    """Coalesces concurrent async loads of the same key (one event loop)."""
+
+    def __init__(self):
+        self._calls: dict = {}
+        self.leaders = 0
+        self.merged = 0
+
+    async def do(self, key, fn):
+        """Return ``await fn()``, sharing one call among concurrent callers of ``key``.
+
+        If the caller running the load is cancelled, the others are not: they
+        retry, and one of them runs the load instead.
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            self.merged += 1
+            while future is not None:
+                try:
+                    # shield: a cancelled follower must not cancel the shared call.
+                    return await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    if not future.cancelled():
+                        raise  # this follower itself was cancelled
+                future = self._calls.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.leaders += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+class TokenBucketLimiter:
+    """Per-client token buckets, bounded to ``max_clients`` (LRU)."""
+
+    def __init__(self, rate: float = 1.0, burst: float = 5.0, max_clients: int = 100_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[object, tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.shed = 0
+
+    def allow(self, client, cost: float = 1.0) -> bool:
+        """Take ``cost`` tokens from ``client``'s bucket; False if it is empty."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+                self.allowed += 1
+            else:
+                self.shed += 1
+            self._buckets[client] = (tokens, now)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+            return allowed
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.allowed + self.shed
+            return {
+                "clients": len(self._buckets),
+                "allowed": self.allowed,
+                "shed": self.shed,
+                "shed_rate": round(self.shed / total, 4) if total else 0.0,
+            }
+
+
+lookup_limiter = TokenBucketLimiter(
+    rate=float(os.environ.get("RESULT_LOOKUP_RATE", "1")),
+    burst=float(os.environ.get("RESULT_LOOKUP_BURST", "5")),
+)
@@ -0,0 +1,75 @@
+"""Timeline events (exams, homework) shared by teachers and students.
+
+Events live in the ``timelineevent`` table with ``event_date`` stored as an
+ISO ``YYYY-MM-DD`` string, so date order is string order and ranged queries
+use ``ix_timelineevent_date``. Lists are paged with a keyset cursor on
+``(event_date, id)``; adding an event is a single-row insert.
+
+Reads go through the shared result cache under ``("timeline", ...)`` keys,
+so every student session asking for the upcoming events is served by one
+query until an event is added. The dashboards show upcoming events by
+default and can filter to a date range and an event type.
+"""
+import datetime
+
+from sqlalchemy import and_, or_, select
+
+from resultdashboard_reflex.models import TimelineEvent
+
+EVENT_TYPES = ("exam", "homework")
+PAGE_SIZE = 10
+
+
+def parse_date(value) -> str:
+    """Return ``value`` as an ISO date string; raise ValueError if it is not one."""
+    try:
+        return datetime.date.fromisoformat(str(value).strip()).isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid date {value!r}; use YYYY-MM-DD.")
+
+
+def add_event(session, title: str, event_date, event_type: str = "exam") -> TimelineEvent:
+    """Validate and insert one event (the caller commits)."""
+    title = str(title or "").strip()
+    if not title:
+        raise ValueError("Event title is empty.")
+    if event_type not in EVENT_TYPES:
+        raise ValueError(f"Unknown event type {event_type!r}.")
+    event = TimelineEvent()
+    event.title = title
+    event.event_date = parse_date(event_date)
+    event.event_type = event_type
+    event.created_at = datetime.datetime.now().isoformat(timespec="seconds")
+    session.add(event)
+    session.flush()
+    return event
+
+
+def events_query(start=None, end=None, event_type=None, after=None, limit: int = PAGE_SIZE):
+    """SELECT for events in ``[start, end]`` ordered by date, ``limit + 1`` rows.
+
+    ``after`` is the ``(event_date, id)`` of the last event on the previous
+    page. The extra row tells the caller whether another page follows.
+    """
+    query = select(TimelineEvent.id, TimelineEvent.title, TimelineEvent.event_date, TimelineEvent.event_type)
+    if start is not None:
+        query = query.where(TimelineEvent.event_date >= start)
+    if end is not None:
+        query = query.where(TimelineEvent.event_date <= end)
+    if event_type:
+        query = query.where(TimelineEvent.event_type == event_type)
+    if after is not None:
+        last_date, last_id = after
+        query = query.where(
+            or_(TimelineEvent.event_date > last_date, and_(TimelineEvent.event_date == last_date, TimelineEvent.id > last_id))
+        )
+    return query.order_by(TimelineEvent.event_date, TimelineEvent.id).limit(limit + 1)
+
+
+def list_events(session, start=None, end=None, event_type=None, after=None, limit: int = PAGE_SIZE) -> list:
+    """Return one page of events as dicts (``limit + 1`` rows, see events_query)."""
+    return [dict(row._mapping) for row in session.execute(events_query(start, end, event_type, after, limit))]
+
+
+def format_event(event: dict) -> str:
+    return f"{event['event_date']} - {event['title']} ({event['event_type']})"
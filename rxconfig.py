@@ -1,9 +1,13 @@
+import os
+
 import reflex as rx
 
 config = rx.Config(
     app_name="resultdashboard_reflex",
+    # Same database the app's data layer uses (resultdashboard_reflex/db.py).
+    db_url=os.environ.get("RESULTDB_URL", "sqlite:///resultdashboard.db"),
     plugins=[
         rx.plugins.SitemapPlugin(),
         rx.plugins.TailwindV4Plugin(),
     ]
-)
\ No newline at end of file
+)
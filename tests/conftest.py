@@ -0,0 +1,78 @@
+"""Shared fixtures for the test suite.
+
+The app's modules read their directories and database URL from the
+environment when imported, so those point into a scratch directory before
+anything is imported. Each test that touches the database gets a fresh
+SQLite file (the ``database`` fixture), and the process-wide caches are
+emptied around every test.
+
+Run from the project root:
+
+    python -m pytest tests
+"""
+import asyncio
+import os
+import shutil
+import tempfile
+
+import pytest
+
+_SCRATCH = tempfile.mkdtemp(prefix="resultdashboard_tests_")
+os.environ["RESULTDB_URL"] = f"sqlite:///{os.path.join(_SCRATCH, 'unused.db')}"
+os.environ["RESULT_PUBLISH_DIR"] = os.path.join(_SCRATCH, "published")
+os.environ["RESULT_BACKUP_DIR"] = os.path.join(_SCRATCH, "backups")
+os.environ["RESULT_MARKSHEET_DIR"] = os.path.join(_SCRATCH, "marksheets")
+
+# Import the models (and so reflex) before sqlmodel, as reflex patches it.
+from resultdashboard_reflex import db, grading, subjects  # noqa: E402
+from resultdashboard_reflex.cache import result_cache  # noqa: E402
+from resultdashboard_reflex.models import Student  # noqa: E402,F401
+from resultdashboard_reflex.stats import class_stats  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+
+def _drop_engines() -> None:
+    for name, engine in list(db._engines.items()):
+        if name.startswith("async"):
+            asyncio.run(engine.dispose())
+        else:
+            engine.dispose()
+    db._engines.clear()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_process_state():
+    result_cache.clear()
+    class_stats.reset()
+    subjects._subject_ids.clear()
+    grading._active = None
+    yield
+    result_cache.clear()
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """A new, empty results database; yields its URL."""
+    url = f"sqlite:///{tmp_path / 'results.db'}"
+    monkeypatch.setattr(db, "DB_URL", url)
+    _drop_engines()
+    SQLModel.metadata.create_all(db.get_engine())
+    yield url
+    _drop_engines()
+
+
+MARKS = ("bangla_marks", "english_marks", "math_marks", "science_marks")
+
+
+def add_students(rows) -> None:
+    """Insert ``(roll, name, marks, total, grade)`` rows, ``marks`` one value for every subject."""
+    from resultdashboard_reflex.queries import insert_student
+
+    with db.session() as session:
+        for roll, name, mark, total, grade in rows:
+            insert_student(session, roll, name, {field: mark for field in MARKS}, total, grade)
+        session.commit()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_SCRATCH, ignore_errors=True)
@@ -0,0 +1,51 @@
+import asyncio
+import os
+
+import pytest
+
+from resultdashboard_reflex import backup, db
+from resultdashboard_reflex.models import Student
+
+from tests.conftest import add_students
+
+
+def test_scheduled_snapshot_skips_while_another_process_holds_the_lock(tmp_path, monkeypatch):
+    directory = str(tmp_path / "backups")
+    monkeypatch.setattr(backup, "create_snapshot", lambda *args, **kwargs: pytest.fail("snapshot taken while locked"))
+    with backup._directory_lock(directory) as locked:
+        assert locked
+        # flock is per open file, so a second open() conflicts like another process would.
+        assert backup._scheduled_snapshot(3600, directory) == 60
+    assert [entry for entry in os.listdir(directory) if entry != backup.LOCK_FILE] == []
+
+
+def test_restore_brings_back_the_snapshot_and_writes_the_marker(database, tmp_path):
+    directory = str(tmp_path / "backups")
+    add_students([(1, "Ayesha", 90, 360, "A+")])
+    snapshot = backup.create_snapshot(directory, url=database)["path"]
+    add_students([(2, "Babul", 50, 200, "C")])
+    marker = backup.restore_marker(database)
+    assert backup._read_marker(marker) == ""
+
+    report = backup.restore(snapshot, url=database, directory=directory)
+    assert report["pre_restore"] and os.path.exists(report["pre_restore"])
+    assert backup._read_marker(marker) != ""
+    with db.session() as session:
+        assert [roll for (roll,) in session.query(Student.roll_no)] == [1]
+
+
+def test_restore_watcher_reacts_to_a_new_marker(tmp_path, monkeypatch):
+    marker = str(tmp_path / "results.db-restored")
+    calls = []
+    monkeypatch.setattr(backup, "restore_marker", lambda: marker)
+    monkeypatch.setattr(backup, "_restored", lambda: calls.append(1))
+
+    async def main():
+        watcher = asyncio.create_task(backup.restore_watcher(0.01))
+        await asyncio.sleep(0.05)
+        backup._write_marker(marker)
+        await asyncio.sleep(0.05)
+        watcher.cancel()
+
+    asyncio.run(main())
+    assert calls == [1]
@@ -0,0 +1,53 @@
+import asyncio
+
+from resultdashboard_reflex.cache import ResultCache, invalidate_student
+
+
+def test_load_is_not_stored_when_a_write_lands_meanwhile():
+    cache = ResultCache()
+
+    async def stale_load():
+        cache.bump_version()  # a writer commits while the query runs
+        return "old row"
+
+    async def fresh_load():
+        return "new row"
+
+    assert asyncio.run(cache.aget_or_load(("roll", 1), stale_load)) == "old row"
+    assert cache.get(("roll", 1)) is None
+    assert asyncio.run(cache.aget_or_load(("roll", 1), fresh_load)) == "new row"
+    assert cache.get(("roll", 1)) == "new row"
+
+
+def test_clear_bumps_the_version():
+    cache = ResultCache()
+    cache.put(("roll", 1), "row")
+    version = cache.version
+    cache.clear()
+    assert cache.version == version + 1
+    assert cache.get(("roll", 1)) is None
+
+
+def test_invalidate_student_only_drops_affected_top_lists():
+    cache = ResultCache()
+    top = [{"roll_no": 1, "total_marks": 300}, {"roll_no": 2, "total_marks": 250}]
+    cache.put(("top", 2), top)
+    cache.put(("top", 3), top)
+    cache.put(("page", "total_marks", True), [])
+    cache.put(("roll", 9), "row")
+    version = cache.version
+
+    invalidate_student(9, 100, cache)
+    assert cache.version == version + 1
+    assert cache.get(("roll", 9)) is None
+    assert cache.get(("page", "total_marks", True)) is None
+    assert cache.get(("top", 2)) == top  # full, and 100 is below its last place
+    assert cache.get(("top", 3)) is None  # not yet full
+
+    cache.put(("top", 2), top)
+    invalidate_student(9, 250, cache)
+    assert cache.get(("top", 2)) is None
+
+    cache.put(("top", 2), top)
+    invalidate_student(2, 0, cache)
+    assert cache.get(("top", 2)) is None
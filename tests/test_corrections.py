@@ -0,0 +1,95 @@
+import pytest
+from sqlalchemy.dialects import mysql
+
+from resultdashboard_reflex import corrections, db
+from resultdashboard_reflex.models import Mark, Student
+from resultdashboard_reflex.subjects import subject_ids
+
+from tests.conftest import add_students
+
+
+def _students():
+    with db.session() as session:
+        return {s.roll_no: (s.name, s.math_marks, s.total_marks, s.grade) for s in session.query(Student)}
+
+
+def _math_marks(roll):
+    with db.session() as session:
+        student = session.query(Student).filter(Student.roll_no == roll).one()
+        subject = subject_ids(session)["math_marks"]
+        return session.query(Mark.marks).filter(Mark.student_id == student.id, Mark.subject_id == subject).scalar()
+
+
+def test_upsert_updates_inserts_and_skips(database):
+    add_students([(1, "Ayesha", 50, 200, "C"), (2, "Babul", 70, 280, "A")])
+    rows = [
+        {"roll_no": 1, "math_marks": 90},
+        {"roll_no": 2, "name": "Babul Mia"},
+        {"roll_no": 3, "name": "Chitra", "bangla_marks": 80, "english_marks": 80, "math_marks": 80, "science_marks": 80},
+        {"roll_no": 4, "name": "Dipu", "math_marks": 60},
+    ]
+    with db.session() as session:
+        result = corrections.upsert_students(session, rows)
+    assert (result["inserted"], result["updated"], result["skipped"]) == (1, 2, [4])
+    assert _students() == {
+        1: ("Ayesha", 90, 240, "B"),
+        2: ("Babul Mia", 70, 280, "A"),
+        3: ("Chitra", 80, 320, "A+"),
+    }
+    assert _math_marks(1) == 90
+    assert _math_marks(3) == 80
+    assert {row["roll_no"] for row in result["rows"]} == {1, 2, 3}
+
+
+def test_upsert_without_returning(database, monkeypatch):
+    add_students([(1, "Ayesha", 50, 200, "C")])
+    with db.session() as session:
+        monkeypatch.setattr(session.get_bind().dialect, "insert_returning", False)
+        result = corrections.upsert_students(session, [
+            {"roll_no": 1, "math_marks": 100},
+            {"roll_no": 2, "name": "Babul", "bangla_marks": 1, "english_marks": 1, "math_marks": 1, "science_marks": 1},
+        ])
+    assert {row["roll_no"]: row["id"] for row in result["rows"]} == {1: 1, 2: 2}
+    assert _math_marks(2) == 1
+
+
+def test_delete_students_removes_ranges_and_their_marks(database):
+    add_students([(roll, f"Student {roll}", 50, 200, "C") for roll in range(1, 11)])
+    with db.session() as session:
+        removed = corrections.delete_students(session, corrections.parse_selection("2, 5-7, 6-8"))
+        assert sorted(row["roll_no"] for row in removed) == [2, 5, 6, 7, 8]
+        assert sorted(roll for (roll,) in session.query(Student.roll_no)) == [1, 3, 4, 9, 10]
+        assert session.query(Mark).count() == 5 * 4
+
+
+def test_parse_selection_merges_ranges():
+    assert corrections.parse_selection("10-20; 5, 7, 6, 15-25") == [(5, 7), (10, 25)]
+    for bad in ("0", "5-3", "a-b", "-4"):
+        with pytest.raises(ValueError):
+            corrections.parse_selection(bad)
+
+
+def test_validate_correction_keeps_only_given_fields():
+    assert corrections.validate_correction({"roll_no": "3", "name": "", "math_marks": "85"}) == {
+        "roll_no": 3, "math_marks": 85,
+    }
+    for mark in ("inf", "1e400", "85.5", "101"):
+        with pytest.raises(ValueError):
+            corrections.validate_correction({"roll_no": "3", "math_marks": mark})
+
+
+def test_mysql_upsert_compiles():
+    stmt = corrections._upsert(mysql.insert, Student.__table__, ("roll_no",), ("math_marks", "grade"))
+    sql = str(stmt.compile(dialect=mysql.dialect()))
+    assert "ON DUPLICATE KEY UPDATE math_marks = VALUES(math_marks), grade = VALUES(grade)" in sql
+
+
+def test_unsupported_databases_are_refused():
+    class Session:
+        def get_bind(self):
+            from sqlalchemy.dialects import mssql
+
+            return type("Bind", (), {"dialect": mssql.dialect()})()
+
+    with pytest.raises(ValueError, match="mssql"):
+        corrections._dialect_insert(Session())
@@ -0,0 +1,45 @@
+import asyncio
+
+from resultdashboard_reflex import db, grading
+
+
+def test_grade_point_of_fail_and_unknown_grades():
+    grader = grading.Grader()
+    assert grader.grade_point("A+") == 5.0
+    assert grader.grade_point("Fail") == 0.0
+    assert grader.grade_point("O") is None
+
+
+def test_grade_many_matches_grade():
+    grader = grading.Grader({"pass_marks": {"math_marks": 33}})
+    rows = [[90, 90, 90, 90], [80, 80, 80, 32], [80, 80, 32, 80], [None, 50, 50, 50]]
+    expected = []
+    for values in rows:
+        marks = dict(zip(grader.fields, values))
+        total = grader.total(marks)
+        expected.append((total, grader.grade(total, marks)))
+    assert grader.grade_many(rows) == expected
+
+
+def test_the_fallback_grader_is_kept(monkeypatch):
+    calls = []
+
+    def no_database():
+        calls.append(1)
+        raise RuntimeError("no database")
+
+    monkeypatch.setattr(db, "read_session", no_database)
+    first = grading.get_active_grader()
+    assert grading.get_active_grader() is first
+    assert first.name == "default" and len(calls) == 1
+
+
+def test_refresh_picks_up_a_policy_stored_elsewhere(database):
+    assert grading.get_active_grader().name == "default"
+    with db.session() as session:
+        grading.set_active_policy(session, "strict", {"scale": [[350, "A+", 5.0]]})
+    grading.reset_active_grader()
+    grading._active = grading.Grader()  # as in another process that loaded earlier
+    grader = asyncio.run(grading.refresh_active_grader())
+    assert grader.name == "strict"
+    assert grading.get_active_grader() is grader
@@ -0,0 +1,57 @@
+import pytest
+
+from resultdashboard_reflex import db
+from resultdashboard_reflex.importer import MAX_MARK, import_records, iter_csv_text, parse_mark, validate_record
+from resultdashboard_reflex.models import Mark, Student
+
+HEADER = "Roll,Name,Bangla,English,Math,Science\n"
+
+
+@pytest.mark.parametrize("raw, mark", [("85", 85), (" 85.0 ", 85), ("0", 0), (str(MAX_MARK), MAX_MARK)])
+def test_parse_mark_accepts_whole_numbers_in_range(raw, mark):
+    assert parse_mark(raw, "Math") == mark
+
+
+@pytest.mark.parametrize("raw", ["85.5", "-1", "101", "inf", "1e400", "nan", "", "abc"])
+def test_parse_mark_rejects_everything_else(raw):
+    with pytest.raises(ValueError):
+        parse_mark(raw, "Math")
+
+
+def test_validate_record_grades_the_row():
+    row = validate_record({
+        "roll_no": " 7 ", "name": " Ayesha ",
+        "bangla_marks": "90", "english_marks": "80", "math_marks": "85", "science_marks": "75",
+    })
+    assert row["roll_no"] == 7 and row["name"] == "Ayesha"
+    assert row["total_marks"] == 330 and row["grade"] == "A+"
+
+
+@pytest.mark.parametrize("change", [{"roll_no": "0"}, {"roll_no": "x"}, {"name": " "}, {"math_marks": "85.5"}])
+def test_validate_record_rejects_bad_rows(change):
+    record = {
+        "roll_no": "7", "name": "Ayesha",
+        "bangla_marks": "90", "english_marks": "80", "math_marks": "85", "science_marks": "75",
+    }
+    with pytest.raises(ValueError):
+        validate_record(dict(record, **change))
+
+
+def test_import_reports_bad_duplicate_and_existing_rolls(database):
+    text = HEADER + "1,Ayesha,90,90,90,90\n2,Babul,50,50,50,50\n2,Again,60,60,60,60\n3,Chitra,50,50,101,50\n"
+    with db.session() as session:
+        first = import_records(iter_csv_text(text), session, batch_size=2)
+    assert first["inserted"] == 2
+    assert [line for line, _ in first["errors"]] == [4, 5]
+
+    with db.session() as session:
+        second = import_records(iter_csv_text(HEADER + "1,Ayesha,90,90,90,90\n4,Dipu,70,70,70,70\n"), session)
+        assert second["inserted"] == 1
+        assert second["errors"] == [(2, "roll number 1 already exists")]
+        assert session.query(Student).count() == 3
+        assert session.query(Mark).count() == 3 * 4
+
+
+def test_missing_columns_are_reported():
+    with pytest.raises(ValueError, match="science_marks"):
+        list(iter_csv_text("Roll,Name,Bangla,English,Math\n1,A,1,2,3\n"))
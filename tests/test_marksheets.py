@@ -0,0 +1,23 @@
+from resultdashboard_reflex import export, marksheets
+
+
+def test_unfinished_builds_are_ignored(tmp_path):
+    directory = str(tmp_path)
+    assert marksheets.latest(str(tmp_path / "missing")) is None
+    for name in ("marksheets-1.zip", "marksheets-2.pdf", "marksheets-3.zip.tmp", "other.zip"):
+        (tmp_path / name).write_bytes(b"")
+    assert marksheets._builds(directory) == ["marksheets-1.zip", "marksheets-2.pdf"]
+    assert marksheets.latest(directory) == str(tmp_path / "marksheets-2.pdf")
+
+
+def test_tokens_are_single_use_and_bound_to_their_file():
+    token = export.issue_token("marksheets/marksheets-1.zip")
+    assert export.consume_token(token) == "marksheets/marksheets-1.zip"
+    assert export.consume_token(token) is None
+    assert export.consume_token("forged") is None
+    assert export.consume_token(None) is None
+
+
+def test_expired_tokens_are_refused(monkeypatch):
+    monkeypatch.setattr(export, "TOKEN_TTL", -1.0)
+    assert export.consume_token(export.issue_token()) is None
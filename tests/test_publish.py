@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from resultdashboard_reflex import db, publish, queries
+
+from tests.conftest import add_students
+
+
+def test_publish_then_lookup(database, tmp_path):
+    add_students([(1, "Ayesha", 90, 360, "A+"), (1500, "Babul", 50, 200, "C")])
+    directory = str(tmp_path / "published")
+    with db.session() as session:
+        manifest = publish.publish(session, directory, shard_size=1000)
+    assert (manifest["count"], manifest["shards"]) == (2, 2)
+    results = publish.PublishedResults(directory)
+    assert results.lookup(1)["name"] == "Ayesha"
+    assert results.lookup(1500)["grade_point"] == 3.0
+    assert results.lookup(2) is None
+
+
+def test_retract_bumps_the_generation(database, tmp_path):
+    add_students([(1, "Ayesha", 90, 360, "A+")])
+    directory = str(tmp_path / "published")
+    with db.session() as session:
+        publish.publish(session, directory)
+    generation = publish._generation(directory)
+    assert publish.retract(directory) is True
+    assert publish._generation(directory) != generation
+    assert not os.path.exists(os.path.join(directory, publish.MANIFEST))
+    assert publish.PublishedResults(directory).lookup(1) is None
+    assert publish.retract(directory) is False
+
+
+def test_a_write_during_publish_aborts_it(database, tmp_path, monkeypatch):
+    add_students([(1, "Ayesha", 90, 360, "A+"), (2, "Babul", 50, 200, "C")])
+    directory = str(tmp_path / "published")
+    with db.session() as session:
+        publish.publish(session, directory)
+    build = publish.PublishedResults(directory).manifest()["build"]
+    result_data = queries.result_data
+
+    def write_meanwhile(row, grader=None):
+        publish.retract(directory)
+        return result_data(row, grader)
+
+    monkeypatch.setattr(queries, "result_data", write_meanwhile)
+    with db.session() as session, pytest.raises(publish.PublishAborted):
+        publish.publish(session, directory)
+    assert publish.PublishedResults(directory).manifest() is None
+    assert sorted(entry for entry in os.listdir(directory) if entry.startswith("b")) == [build]
+
+    monkeypatch.setattr(queries, "result_data", result_data)
+    with db.session() as session:
+        assert publish.publish(session, directory)["count"] == 2
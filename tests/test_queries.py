@@ -0,0 +1,65 @@
+import asyncio
+
+from resultdashboard_reflex import queries
+from resultdashboard_reflex.grading import Grader
+
+from tests.conftest import add_students
+
+# Totals and grades with NULLs and ties, so keyset pages cross both.
+ROWS = [
+    (1, "Ayesha", 90, 360, "A+"),
+    (2, "Babul", 80, None, None),
+    (3, "Chitra", 70, 280, "A"),
+    (4, "Dipu", 90, 360, "A+"),
+    (5, "Emon", 60, None, None),
+    (6, "Farhana", 50, 200, "B"),
+    (7, "Gazi", 70, 280, "A"),
+    (8, "Hasan", 40, None, None),
+]
+
+
+def _all_pages(sort_by, descending, limit):
+    rows, after = [], None
+    while True:
+        page = asyncio.run(queries.load_student_page(sort_by, descending, "", after, limit))
+        rows.extend(page[:limit])
+        if len(page) <= limit:
+            return rows
+        last = page[limit - 1]
+        after = (last[sort_by], last["id"])
+
+
+def test_keyset_pages_cross_null_sort_keys(database):
+    add_students(ROWS)
+    for sort_by in ("total_marks", "grade"):
+        for descending in (False, True):
+            everything = asyncio.run(queries.load_student_page(sort_by, descending, "", None, 100))
+            assert len(everything) == len(ROWS)
+            for limit in (1, 2, 3):
+                paged = _all_pages(sort_by, descending, limit)
+                assert [row["id"] for row in paged] == [row["id"] for row in everything]
+
+
+def test_nulls_sort_first_ascending_and_last_descending(database):
+    add_students(ROWS)
+    ascending = asyncio.run(queries.load_student_page("total_marks", False, "", None, 100))
+    descending = asyncio.run(queries.load_student_page("total_marks", True, "", None, 100))
+    assert [row["total_marks"] for row in ascending[:3]] == [None, None, None]
+    assert [row["total_marks"] for row in descending[-3:]] == [None, None, None]
+
+
+def test_top_students_break_ties_like_the_results_table(database):
+    add_students(ROWS)
+    top = asyncio.run(queries.load_top_students(4))
+    first_page = asyncio.run(queries.load_student_page("total_marks", True, "", None, 4))
+    assert [row["roll_no"] for row in top] == [4, 1, 7, 3]
+    assert top == first_page[:4]
+
+
+def test_result_data_grade_point_needs_a_grader():
+    class Row:
+        name, roll_no, grade = "Ayesha", 1, "A+"
+
+    grader = Grader()
+    assert queries.result_data(Row(), grader)["grade_point"] == grader.grade_point("A+")
+    assert queries.result_data(Row())["grade_point"] == ""
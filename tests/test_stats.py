@@ -0,0 +1,34 @@
+from collections import Counter
+
+from resultdashboard_reflex.stats import ClassStats
+
+
+def _loaded():
+    stats = ClassStats()
+    stats.rebuild({"Math": Counter({40: 1, 60: 2, 90: 1})}, [("A", 2), (None, 2)])
+    return stats
+
+
+def test_percentile_rank_counts_marks_at_or_below():
+    stats = _loaded()
+    assert stats.percentile_rank("Math", 60) == 75.0
+    assert stats.percentile_rank("Math", 39) == 0.0
+    assert stats.percentile_rank("Math", 100) == 100.0
+    assert stats.percentile_rank("Bangla", 60) is None
+
+
+def test_add_and_remove_keep_the_aggregates_current():
+    stats = _loaded()
+    row = {"bangla_marks": 0, "english_marks": 0, "math_marks": 100, "science_marks": 0, "grade": "A"}
+    stats.add(row)
+    assert stats.count == 5
+    assert stats.percentile_rank("Math", 90) == 80.0
+    stats.remove(row)
+    assert stats.frequencies["Math"] == Counter({40: 1, 60: 2, 90: 1})
+    assert stats.grade_histogram()["Fail"] == 2
+
+
+def test_nothing_is_tracked_before_the_first_rebuild():
+    stats = ClassStats()
+    stats.add({"math_marks": 50, "grade": "C"})
+    assert stats.count == 0 and not stats.loaded
@@ -0,0 +1,66 @@
+from sqlalchemy import func, select
+
+from resultdashboard_reflex import db, subjects
+from resultdashboard_reflex.models import Mark, Subject
+from resultdashboard_reflex.stats import SUBJECTS
+
+
+def test_subject_ids_are_cached_only_after_commit(database):
+    with db.session() as session:
+        subjects.subject_ids(session)
+        session.rollback()
+    assert subjects._subject_ids == {}
+    with db.session() as session:
+        assert session.query(Subject).count() == 0
+
+    with db.session() as session:
+        ids = subjects.subject_ids(session)
+        session.commit()
+    assert subjects._subject_ids == ids
+    assert list(ids) == [field for _, field in SUBJECTS]
+
+
+def test_cached_ids_survive_a_later_rollback(database):
+    with db.session() as session:
+        ids = subjects.subject_ids(session)
+        session.commit()
+    with db.session() as session:
+        assert subjects.subject_ids(session) == ids
+        session.rollback()
+    assert subjects._subject_ids == ids
+
+
+class _CapturingSession:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return self
+
+    def all(self):
+        return []
+
+
+def test_mark_frequencies_groups_by_every_selected_and_ordered_column():
+    # PostgreSQL rejects columns in SELECT or ORDER BY that are neither
+    # grouped nor aggregated; SQLite would not catch it.
+    session = _CapturingSession()
+    assert subjects.mark_frequencies(session) == {}
+    (statement,) = session.statements
+    grouped = {str(column) for column in statement._group_by_clauses}
+    selected = [column for column in statement.selected_columns if not isinstance(column, type(func.count()))]
+    ordered = list(statement._order_by_clauses)
+    assert {str(column) for column in selected + ordered} <= grouped
+
+
+def test_mark_frequencies_counts_marks_per_subject(database):
+    from tests.conftest import add_students
+
+    add_students([(1, "Ayesha", 90, 360, "A+"), (2, "Babul", 90, 360, "A+"), (3, "Chitra", 70, 280, "A")])
+    with db.session() as session:
+        frequencies = subjects.mark_frequencies(session)
+        rows = session.execute(select(func.count()).select_from(Mark)).scalar()
+    assert rows == 3 * len(SUBJECTS)
+    assert list(frequencies) == [label for label, _ in SUBJECTS]
+    assert all(counts == {90: 2, 70: 1} for counts in frequencies.values())
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from resultdashboard_reflex.throttle import SingleFlight, TokenBucketLimiter
+
+
+def test_concurrent_calls_share_one_load():
+    flights = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "row"
+
+    async def main():
+        return await asyncio.gather(*(flights.do("k", load) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["row"] * 5
+    assert len(calls) == 1
+    assert flights.merged == 4
+    assert flights.in_flight() == 0
+
+
+def test_followers_retry_when_the_leader_is_cancelled():
+    flights = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        leader = asyncio.create_task(flights.do("k", load))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flights.do("k", load)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    # One follower takes over the load; the others share its result.
+    assert asyncio.run(main()) == [2, 2, 2]
+    assert len(calls) == 2
+
+
+def test_cancelled_follower_leaves_the_leader_running():
+    flights = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.03)
+        return "row"
+
+    async def main():
+        leader = asyncio.create_task(flights.do("k", load))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("k", load))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        return await leader
+
+    assert asyncio.run(main()) == "row"
+
+
+def test_leader_errors_reach_the_followers():
+    flights = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(*(flights.do("k", load) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in asyncio.run(main()))
+
+
+def test_token_bucket_sheds_past_the_burst():
+    limiter = TokenBucketLimiter(rate=0.0, burst=2)
+    assert [limiter.allow("a") for _ in range(3)] == [True, True, False]
+    assert limiter.allow("b")
+    assert limiter.stats()["shed"] == 1